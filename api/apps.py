@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+        from core.metrics import install_query_counter
+
+        # Count queries on connections opened from now on, and on any
+        # connection object that already exists
+        connection_created.connect(install_query_counter)
+        for connection in connections.all(initialized_only=True):
+            install_query_counter(connection=connection)
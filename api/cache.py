@@ -0,0 +1,314 @@
+"""
+Two-tier cache backend: a bounded in-process LRU in front of a shared cache.
+
+Reads are answered from local memory when possible and otherwise from the
+shared tier, whose value is then kept locally for at most LOCAL_TIMEOUT
+seconds. Writes and deletes go to both tiers, so the writing process sees
+them at once and other processes within LOCAL_TIMEOUT. Keys that must be
+coherent across processes immediately, such as generation counters,
+should use the `shared` tier directly.
+
+get_or_compute() and the read_through() helper add stampede protection:
+concurrent misses in a process share one computation (singleflight), a
+lock in the shared tier lets only one process recompute a key, and
+entries are refreshed early with probability rising towards expiry
+(probabilistic early expiration, "XFetch").
+"""
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+
+_MISSING = object()
+
+# Backend instances are per thread, so their state is shared by LOCATION like LocMemCache's
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class LocalStore:
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.flights = {}
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ('local_hits', 'shared_hits', 'misses', 'computes', 'early_computes', 'coalesced'), 0
+        )
+
+
+class Flight:
+    """One in-progress computation that other threads can wait on"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = _MISSING
+
+
+class TwoTierCache(BaseCache):
+    """
+    Cache backend combining a local LRU with the cache alias in OPTIONS['SHARED'].
+
+    OPTIONS:
+    - SHARED: alias of the shared cache (default 'shared')
+    - MAX_ENTRIES: most entries held locally (default 300, as for LocMem)
+    - LOCAL_TIMEOUT: longest a value is served from local memory (default 5)
+    - LOCK_TIMEOUT: longest one process may hold a recompute lock (default 10)
+
+    Local values are shared between callers rather than copied, so they
+    must not be mutated.
+    """
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.lock_timeout = options.get('LOCK_TIMEOUT', 10)
+        with _stores_lock:
+            store = _stores.setdefault(location, LocalStore())
+        self._local = store.entries
+        self._flights = store.flights
+        self._lock = store.lock
+        self.counters = store.counters
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def resolve_timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    # Local tier
+
+    def local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return value
+
+    def local_set(self, key, value, timeout=None):
+        timeout = self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+        with self._lock:
+            if timeout <= 0:
+                self._local.pop(key, None)
+                return
+            self._local[key] = (time.monotonic() + timeout, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self._max_entries:
+                self._local.popitem(last=False)
+
+    def local_delete(self, key):
+        with self._lock:
+            return self._local.pop(key, _MISSING) is not _MISSING
+
+    # Cache API
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        value = self.local_get(local_key)
+        if value is not _MISSING:
+            self.count('local_hits')
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.count('misses')
+            return default
+        self.count('shared_hits')
+        self.local_set(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = []
+        for key in keys:
+            value = self.local_get(self.make_and_validate_key(key, version=version))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        fetched = self.shared.get_many(remote, version=version) if remote else {}
+        for key, value in fetched.items():
+            self.local_set(self.make_key(key, version=version), value)
+        with self._lock:
+            self.counters['local_hits'] += len(found)
+            self.counters['shared_hits'] += len(fetched)
+            self.counters['misses'] += len(remote) - len(fetched)
+        found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.resolve_timeout(timeout)
+        self.shared.set(key, value, timeout, version=version)
+        self.local_set(self.make_and_validate_key(key, version=version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.resolve_timeout(timeout)
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.local_set(self.make_and_validate_key(key, version=version), value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self.resolve_timeout(timeout)
+        if not self.shared.add(key, value, timeout, version=version):
+            return False
+        self.local_set(self.make_and_validate_key(key, version=version), value, timeout)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, self.resolve_timeout(timeout), version=version)
+
+    def delete(self, key, version=None):
+        self.local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.local_delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        return self.local_get(local_key) is not _MISSING or self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local_delete(self.make_and_validate_key(key, version=version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    # Read-through with stampede protection
+
+    def get_or_compute(self, key, compute, timeout=DEFAULT_TIMEOUT, version=None, beta=1.0):
+        """
+        Return the cached value for `key`, calling `compute()` to fill it.
+
+        Entries are stored as (value, compute_seconds, expires_at), so keys
+        written here must only be read through get_or_compute(). A hit is
+        recomputed early when now - compute_seconds * beta * log(rand)
+        passes expires_at; meanwhile every other caller keeps getting the
+        current value.
+        """
+        entry = self.get(key, version=version)
+        if entry is not None:
+            value, delta, expires_at = entry
+            if expires_at is None or time.time() - delta * beta * math.log(1 - random.random()) < expires_at:
+                return value
+        return self.compute(key, compute, self.resolve_timeout(timeout), version, entry)
+
+    def compute(self, key, compute, timeout, version, stale):
+        local_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            flight = self._flights.get(local_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[local_key] = Flight()
+        if not leader:
+            self.count('coalesced')
+            if stale is not None:
+                return stale[0]
+            flight.done.wait(self.lock_timeout)
+            # If the leader failed, compute without the cache's help
+            return compute() if flight.value is _MISSING else flight.value
+
+        try:
+            lock_key = f'{key}:compute-lock'
+            locked = self.shared.add(lock_key, 1, self.lock_timeout, version=version)
+            if not locked:
+                # Another process is computing: serve the stale value or wait for its result
+                if stale is not None:
+                    return stale[0]
+                entry = self.wait_for(key, version)
+                if entry is not None:
+                    flight.value = entry[0]
+                    return entry[0]
+            try:
+                start = time.time()
+                value = compute()
+                now = time.time()
+                expires_at = None if timeout is None else now + timeout
+                self.set(key, (value, now - start, expires_at), timeout, version=version)
+            finally:
+                if locked:
+                    self.shared.delete(lock_key, version=version)
+            self.count('early_computes' if stale is not None else 'computes')
+            flight.value = value
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(local_key, None)
+            flight.done.set()
+
+    def wait_for(self, key, version):
+        """Poll the shared tier until another process stores `key` or its lock expires"""
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.005
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            entry = self.shared.get(key, version=version)
+            if entry is not None:
+                return entry
+            delay = min(delay * 2, 0.1)
+        return None
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, local_entries=len(self._local))
+
+
+class FileCache(FileBasedCache):
+    """
+    FileBasedCache that lists its directory to cull at most once every
+    OPTIONS['CULL_INTERVAL'] seconds (default 1) per backend instance,
+    instead of on every write. The directory can overshoot MAX_ENTRIES by
+    the writes made in between.
+    """
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self.cull_interval = params.get('OPTIONS', {}).get('CULL_INTERVAL', 1)
+        self._culled_at = None
+
+    def _cull(self):
+        now = time.monotonic()
+        if self._culled_at is not None and now - self._culled_at < self.cull_interval:
+            return
+        self._culled_at = now
+        super()._cull()
+
+
+def read_through(key, compute, timeout=DEFAULT_TIMEOUT, alias='default'):
+    """
+    Return the value cached under `key` in cache `alias`, computing and
+    storing it on a miss. TwoTierCache adds stampede protection; other
+    backends get a plain get/set.
+    """
+    backend = caches[alias]
+    if isinstance(backend, TwoTierCache):
+        return backend.get_or_compute(key, compute, timeout)
+    value = backend.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        backend.set(key, value, timeout)
+    return value
+
+
+def cache_stats(alias='default'):
+    """Hit/miss counters of cache `alias`, or None if it keeps none"""
+    backend = caches[alias]
+    return backend.stats() if isinstance(backend, TwoTierCache) else None
@@ -0,0 +1,189 @@
+import random
+import time
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+from core.metrics import finish_request, registry, start_request
+
+
+class MetricsMiddleware:
+    """
+    Records per-endpoint histograms for a sample of requests.
+
+    METRICS_SAMPLE_RATE (0 to 1) sets the fraction of requests that are
+    measured; unsampled requests only pay for one random() call.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        rate = getattr(settings, 'METRICS_SAMPLE_RATE', 0.1)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        token = start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = finish_request(token)
+        self.record(request, response, elapsed, stats)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        token = start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = finish_request(token)
+        self.record(request, response, elapsed, stats)
+        return response
+
+    def record(self, request, response, elapsed, stats):
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match else '<unresolved>'
+        size = None if response.streaming else len(response.content)
+        registry.observe(endpoint, dict(stats, request_seconds=elapsed, response_bytes=size))
+
+
+def adapt(is_async, method, method_is_async=None):
+    """Wrap `method` to run in sync or async mode, as BaseHandler.adapt_method_mode does"""
+    if method_is_async is None:
+        method_is_async = iscoroutinefunction(method)
+    if is_async and not method_is_async:
+        return sync_to_async(method, thread_sensitive=True)
+    if not is_async and method_is_async:
+        return async_to_sync(method)
+    return method
+
+
+class MiddlewareChain:
+    """A middleware list built around get_response, with its view-level hooks"""
+    def __init__(self, paths, get_response, is_async):
+        self.view_hooks = []
+        self.template_response_hooks = []
+        self.exception_hooks = []
+
+        # Mirrors BaseHandler.load_middleware
+        handler = get_response
+        handler_is_async = is_async
+        for path in reversed(paths):
+            middleware = import_string(path)
+            can_sync = getattr(middleware, 'sync_capable', True)
+            can_async = getattr(middleware, 'async_capable', False)
+            middleware_is_async = can_async if handler_is_async or not can_sync else False
+            adapted = adapt(middleware_is_async, handler, handler_is_async)
+            try:
+                instance = middleware(adapted)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(instance, 'process_view'):
+                self.view_hooks.insert(0, adapt(is_async, instance.process_view))
+            if hasattr(instance, 'process_template_response'):
+                self.template_response_hooks.append(adapt(is_async, instance.process_template_response))
+            if hasattr(instance, 'process_exception'):
+                # Django always runs exception hooks synchronously
+                self.exception_hooks.append(adapt(False, instance.process_exception))
+
+            handler = convert_exception_to_response(instance)
+            handler_is_async = middleware_is_async
+        self.handler = adapt(is_async, handler, handler_is_async)
+
+
+class PathDispatchMiddleware:
+    """
+    Runs a different middleware chain depending on the request path.
+
+    PATH_MIDDLEWARE maps path prefixes to middleware lists that run where
+    this middleware sits in MIDDLEWARE; the longest prefix of
+    request.path_info wins and unmatched paths run no extra middleware.
+    This lets JWT-only API routes skip the session, CSRF, auth and
+    messages middleware the admin needs. Chains are built once at startup
+    and their process_view, process_template_response and
+    process_exception hooks run for the requests they serve.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        is_async = iscoroutinefunction(get_response)
+        self.chains = sorted(
+            (
+                (prefix, MiddlewareChain(paths, get_response, is_async))
+                for prefix, paths in getattr(settings, 'PATH_MIDDLEWARE', {}).items()
+            ),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+        if is_async:
+            markcoroutinefunction(self)
+            # Django awaits async hooks directly instead of hopping to a thread
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def chain_for(self, request):
+        path = request.path_info
+        for prefix, chain in self.chains:
+            if path.startswith(prefix):
+                return chain
+        return None
+
+    def __call__(self, request):
+        chain = self.chain_for(request)
+        return chain.handler(request) if chain else self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        chain = self.chain_for(request)
+        for hook in chain.view_hooks if chain else ():
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        chain = self.chain_for(request)
+        for hook in chain.view_hooks if chain else ():
+            response = await hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        chain = self.chain_for(request)
+        for hook in chain.template_response_hooks if chain else ():
+            response = hook(request, response)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        chain = self.chain_for(request)
+        for hook in chain.template_response_hooks if chain else ():
+            response = await hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        chain = self.chain_for(request)
+        for hook in chain.exception_hooks if chain else ():
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,54 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from core.metrics import render_prometheus
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Renders a metrics registry snapshot in the Prometheus text format.
+    Select it with ?format=prometheus or `Accept: text/plain`.
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and 'endpoints' in data:
+            return render_prometheus(data['endpoints'])
+        # Errors such as a 403 are rendered as plain text
+        return ''.join(f'# {key}: {value}\n' for key, value in (data or {}).items())
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    The output is byte-for-byte what JSONRenderer produces for API data:
+    datetimes and other non-JSON types go through DRF's encoder, and U+2028
+    and U+2029 are escaped. Indented output (e.g. for the browsable API),
+    and anything orjson refuses such as integers wider than 64 bits, is
+    rendered by JSONRenderer itself.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, in UTF-8
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
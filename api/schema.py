@@ -0,0 +1,111 @@
+"""
+Precomputed OpenAPI document for the docs views.
+
+drf_yasg introspects every view and serializer to build the schema, so each
+process generates the document once, on first use, and serves it from
+memory afterwards. Nothing is loaded from disk: a document left behind by
+an earlier deploy may describe a different API, and no cheap fingerprint
+covers everything drf_yasg reads (docstrings, pagination and filter
+classes, get_serializer_class() and more). `python manage.py
+generate_openapi` writes the document to OPENAPI_SCHEMA_DIR for publishing,
+and its --check option compares that copy with the current API.
+"""
+import hashlib
+import json
+import os
+import threading
+from django.utils.functional import cached_property
+from django.utils.http import quote_etag
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+FORMATS = {
+    'json': ('openapi.json', 'application/json'),
+    'yaml': ('openapi.yaml', 'application/yaml'),
+}
+
+
+def generate_documents(generator_class, info):
+    """
+    Introspect the whole API and encode the result. Without a request the
+    document has no host, so clients resolve it against the URL they
+    fetched it from.
+    """
+    schema = generator_class(info).get_schema(request=None, public=True)
+    return {
+        'json': OpenAPICodecJson([]).encode(schema),
+        'yaml': OpenAPICodecYaml([]).encode(schema),
+    }
+
+
+class SchemaDocument:
+    def __init__(self, body, media_type):
+        self.body = body
+        self.media_type = media_type
+        self.etag = quote_etag(hashlib.sha256(body).hexdigest())
+
+    @cached_property
+    def swagger(self):
+        """
+        A Swagger object holding only this JSON document's title and
+        version, which is all drf_yasg's UI renderers read. The page loads
+        the full document from the spec URL.
+        """
+        info = json.loads(self.body)['info']
+        return openapi.Swagger(info=openapi.Info(info['title'], info['version']), _prefix='/', paths=openapi.Paths({}))
+
+
+class SchemaStore:
+    """
+    The OpenAPI document in each format, generated once per process.
+    `directory` is where generate_openapi writes a copy of it.
+    """
+    def __init__(self, generator_class, info, directory):
+        self.generator_class = generator_class
+        self.info = info
+        self.directory = directory
+        self._documents = None
+        self._lock = threading.Lock()
+
+    def get(self, format):
+        if self._documents is None:
+            with self._lock:
+                if self._documents is None:
+                    self._documents = self.generate()
+        return self._documents[format]
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def generate(self):
+        bodies = generate_documents(self.generator_class, self.info)
+        return {
+            format: SchemaDocument(bodies[format], media_type)
+            for format, (_, media_type) in FORMATS.items()
+        }
+
+    def refresh(self):
+        """Regenerate the documents now"""
+        with self._lock:
+            self._documents = self.generate()
+        return self._documents
+
+    def write(self):
+        """Write the documents served by this process to `directory`"""
+        os.makedirs(self.directory, exist_ok=True)
+        for format, (name, _) in FORMATS.items():
+            tmp = self.path(f'.{name}.{os.getpid()}.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(self.get(format).body)
+            os.replace(tmp, self.path(name))
+
+    def is_current(self):
+        """Whether the copy in `directory` is byte for byte the document generated now"""
+        for format, (name, _) in FORMATS.items():
+            try:
+                with open(self.path(name), 'rb') as f:
+                    if f.read() != self.get(format).body:
+                        return False
+            except OSError:
+                return False
+        return True
@@ -1,3 +1,496 @@
-from django.test import TestCase
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from api.cache import FileCache, TwoTierCache, read_through
+from core.metrics import registry
+from api.middleware import PathDispatchMiddleware
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.schema import SchemaStore, generate_documents
+from api.views import api_info, schema_view
+from apps.users.models import Employer
+from apps.users.serializers import EmployerSerializer, UserDetailSerializer
+from apps.users.views import EmployerListCreateView
 
-# Create your tests here.
+User = get_user_model()
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class MetricsTests(TestCase):
+    """Tests for the metrics middleware and endpoint"""
+
+    def setUp(self):
+        registry.reset()
+        self.client = APIClient()
+        self.metrics_url = reverse('metrics')
+        self.staff = User.objects.create_superuser(
+            email='admin@example.com',
+            name='Admin',
+            password='TestPassword123!'
+        )
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        Employer.objects.create(
+            user=self.user,
+            company_name='Test Company',
+            contact_person_name='Test Contact',
+            email='company@example.com',
+            phone_number='1234567890',
+            address='123 Test Street, Test City'
+        )
+
+    def test_records_endpoint_histograms(self):
+        """Test that a sampled request records every metric under its URL name"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('employer-list-create'))
+
+        metrics = registry.snapshot()['employer-list-create']
+        self.assertEqual(metrics['request_seconds']['count'], 1)
+        self.assertGreaterEqual(metrics['db_queries']['sum'], 1)
+        self.assertEqual(metrics['serializer_seconds']['count'], 1)
+        self.assertEqual(metrics['response_bytes']['sum'], len(response.content))
+
+    def test_sampling_disabled(self):
+        """Test that nothing is recorded with a zero sample rate"""
+        self.client.force_authenticate(user=self.user)
+        with self.settings(METRICS_SAMPLE_RATE=0):
+            self.client.get(reverse('employer-list-create'))
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_json_endpoint(self):
+        """Test that staff can read the metrics as JSON"""
+        self.client.force_authenticate(user=self.staff)
+        self.client.get(reverse('profile'))
+        response = self.client.get(self.metrics_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('profile', response.data['endpoints'])
+        self.assertIn('hashes_saved', response.data['login_throttle'])
+        self.assertIn('queue_depth', response.data['hashing_pool'])
+        self.assertIn('local_hits', response.data['cache'])
+
+    def test_prometheus_endpoint(self):
+        """Test the Prometheus text exposition output"""
+        self.client.force_authenticate(user=self.staff)
+        self.client.get(reverse('profile'))
+        response = self.client.get(self.metrics_url, {'format': 'prometheus'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('# TYPE ems_request_seconds histogram', body)
+        self.assertIn('ems_request_seconds_count{endpoint="profile"} 1', body)
+
+    def test_staff_only(self):
+        """Test that regular users cannot read the metrics"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """Tests that FastJSONRenderer output is identical to JSONRenderer's"""
+
+    def assertRendersLikeDRF(self, data, accepted_media_type=None):
+        expected = JSONRenderer().render(data, accepted_media_type)
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+        with mock.patch('api.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+
+    def test_employer_list(self):
+        """Test a serialized employer list, including timestamps and non-ASCII text"""
+        now = timezone.now()
+        employers = [
+            Employer(
+                id=i,
+                company_name=f'Société {i} \u2028 ✓',
+                contact_person_name='Zoë',
+                email=f'company{i}@example.com',
+                phone_number='1234567890',
+                address='Line one\u2029Line two "quoted"',
+                created_at=now - timedelta(microseconds=i * 1001),
+            )
+            for i in range(1, 4)
+        ]
+        self.assertRendersLikeDRF(EmployerSerializer(employers, many=True).data)
+
+    def test_user_detail(self):
+        """Test a serialized user profile"""
+        user = User(id=1, email='test@example.com', name='Test User', date_joined=timezone.now())
+        self.assertRendersLikeDRF(UserDetailSerializer(user).data)
+
+    def test_non_json_types(self):
+        """Test that types outside JSON are encoded the way DRF's encoder does"""
+        self.assertRendersLikeDRF({
+            'aware': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'naive': datetime(2024, 1, 2, 3, 4, 5),
+            'date': date(2024, 1, 2),
+            'decimal': Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'lazy': gettext_lazy('Not found.'),
+            1: 'integer key',
+        })
+
+    def test_indent_and_wide_integers(self):
+        """Test the cases handed to JSONRenderer"""
+        self.assertRendersLikeDRF({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertRendersLikeDRF({'big': 2 ** 70})
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(SimpleTestCase):
+    """Tests for FastJSONParser"""
+
+    def test_parses_like_drf(self):
+        """Test that documents parse to the same data as with JSONParser"""
+        body = '{"name": "Zoë", "n": [1, 2.5, null, true], "nested": {"a": "\\u2028"}}'.encode()
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        with mock.patch('api.parsers.orjson', None):
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_invalid_documents(self):
+        """Test that malformed JSON and NaN are parse errors"""
+        for body in (b'{"a": ', b'{"a": NaN}', b'\xff'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(io.BytesIO(body))
+
+    @skipIf(orjson is None, 'orjson is not installed')
+    def test_uses_orjson(self):
+        """Test that orjson does the work when it is installed"""
+        with mock.patch('api.parsers.orjson.loads', wraps=orjson.loads) as loads:
+            FastJSONParser().parse(io.BytesIO(b'{}'))
+        loads.assert_called_once()
+
+
+class TwoTierCacheTests(SimpleTestCase):
+    """Tests for the local + shared two-tier cache backend"""
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.cache = self.make_cache()
+
+    def make_cache(self, location=None, **options):
+        options = {'SHARED': 'shared', 'MAX_ENTRIES': 100, 'LOCAL_TIMEOUT': 60, 'LOCK_TIMEOUT': 1, **options}
+        return TwoTierCache(location or f'test-{uuid.uuid4()}', {'OPTIONS': options})
+
+    def test_writes_reach_both_tiers(self):
+        """Test that a set is visible in the shared tier and then served locally"""
+        self.cache.set('key', 'value')
+        self.assertEqual(caches['shared'].get('key'), 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.stats()['local_hits'], 1)
+
+        self.cache.delete('key')
+        self.assertIsNone(caches['shared'].get('key'))
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_shared_value_is_kept_locally(self):
+        """Test that a value read from the shared tier is then served from memory"""
+        caches['shared'].set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        caches['shared'].set('key', 'changed')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.stats()['shared_hits'], 1)
+        self.assertEqual(self.cache.stats()['local_hits'], 1)
+
+    def test_local_timeout_bounds_staleness(self):
+        """Test that local copies expire after LOCAL_TIMEOUT"""
+        cache = self.make_cache(LOCAL_TIMEOUT=0.05)
+        cache.set('key', 'value')
+        caches['shared'].set('key', 'changed')
+        time.sleep(0.06)
+        self.assertEqual(cache.get('key'), 'changed')
+
+    def test_local_tier_is_bounded(self):
+        """Test that the least recently used local entry is evicted past MAX_ENTRIES"""
+        cache = self.make_cache(MAX_ENTRIES=2)
+        cache.set_many({'a': 1, 'b': 2})
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.stats()['local_entries'], 2)
+
+        caches['shared'].delete('b')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get_many(['a', 'c']), {'a': 1, 'c': 3})
+
+    def test_state_is_shared_between_threads(self):
+        """Test that backend instances with the same LOCATION, one per thread, share the local tier"""
+        cache = self.make_cache('test-shared-location')
+        cache.set('key', 'value')
+        caches['shared'].delete('key')
+        self.assertEqual(self.make_cache('test-shared-location').get('key'), 'value')
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent misses in a process share one computation"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_compute('key', compute, 60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ['value'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.stats()['coalesced'], 4)
+
+    def test_locked_key_serves_stale_value(self):
+        """Test that while another process recomputes, the current value is served"""
+        self.cache.set('key', ('old', 1.0, time.time()))
+        caches['shared'].add('key:compute-lock', 1)
+        self.assertEqual(self.cache.get_or_compute('key', lambda: 'new', 60), 'old')
+
+    def test_locked_key_waits_for_other_process(self):
+        """Test that a miss on a key being computed elsewhere waits for that result"""
+        caches['shared'].add('key:compute-lock', 1)
+        threading.Timer(0.05, lambda: caches['shared'].set('key', ('theirs', 0.01, None))).start()
+        self.assertEqual(self.cache.get_or_compute('key', lambda: 'ours', 60), 'theirs')
+
+    def test_early_expiration(self):
+        """Test that an entry close to expiry is recomputed early, and a fresh one is not"""
+        self.cache.set('key', ('old', 1.0, time.time() + 2))
+        with mock.patch('api.cache.random.random', return_value=0.99):
+            # -1.0 * log(0.01) is about 4.6s, past the expiry 2s away
+            self.assertEqual(self.cache.get_or_compute('key', lambda: 'new', 60), 'new')
+        self.assertEqual(self.cache.stats()['early_computes'], 1)
+
+        with mock.patch('api.cache.random.random', return_value=0.99):
+            self.assertEqual(self.cache.get_or_compute('key', lambda: 'newer', 60), 'new')
+
+    def test_read_through_other_backends(self):
+        """Test that read_through works as a plain get/set on other backends"""
+        calls = []
+        compute = lambda: calls.append(1) or 'value'
+        self.assertEqual(read_through('key', compute, 60, alias='shared'), 'value')
+        self.assertEqual(read_through('key', compute, 60, alias='shared'), 'value')
+        self.assertEqual(len(calls), 1)
+
+
+
+class FileCacheTests(SimpleTestCase):
+    """Tests for the file cache used as the default shared tier"""
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.cache = FileCache(location, {'OPTIONS': {'MAX_ENTRIES': 2, 'CULL_FREQUENCY': 2, 'CULL_INTERVAL': 60}})
+
+    def test_culls_at_most_once_per_interval(self):
+        """Test that the directory is listed on the first write and then not until CULL_INTERVAL has passed"""
+        with mock.patch.object(self.cache, '_list_cache_files', wraps=self.cache._list_cache_files) as listing:
+            for i in range(5):
+                self.cache.set(f'key{i}', i)
+            self.assertEqual(listing.call_count, 1)
+
+            with mock.patch('api.cache.time.monotonic', return_value=time.monotonic() + 61):
+                self.cache.set('key5', 5)
+            self.assertEqual(listing.call_count, 2)
+        # Half of the entries over MAX_ENTRIES were culled before the last write
+        self.assertEqual(len(self.cache._list_cache_files()), 4)
+
+
+class SchemaStoreTests(SimpleTestCase):
+    """Tests for the precomputed OpenAPI document"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_store(self):
+        return SchemaStore(schema_view.generator_class, api_info, self.directory)
+
+    def test_generates_json_and_yaml_once(self):
+        """Test that the document is generated on first use and then served from memory"""
+        store = self.make_store()
+        with mock.patch('api.schema.generate_documents', wraps=generate_documents) as generate:
+            document = store.get('json')
+            self.assertIn(b'"/employers/"', document.body)
+            self.assertTrue(document.etag.startswith('"'))
+            self.assertIn(b'/employers/:', store.get('yaml').body)
+            store.get('json')
+        generate.assert_called_once()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_ignores_document_on_disk(self):
+        """Test that a process never serves a document left by an earlier deploy"""
+        self.make_store().write()
+        with open(os.path.join(self.directory, 'openapi.json'), 'wb') as f:
+            f.write(b'{"stale": true}')
+        self.assertIn(b'"/employers/"', self.make_store().get('json').body)
+
+    def test_write_and_check(self):
+        """Test that the written copy is current until it differs from the generated document"""
+        store = self.make_store()
+        self.assertFalse(store.is_current())
+        store.write()
+        self.assertTrue(store.is_current())
+        with open(os.path.join(self.directory, 'openapi.json'), 'ab') as f:
+            f.write(b' ')
+        self.assertFalse(store.is_current())
+
+    def test_tracks_view_changes(self):
+        """Test that changes no route or serializer reveals, such as a docstring, reach a new process"""
+        before = self.make_store().get('json').body
+        with mock.patch.object(EmployerListCreateView, '__doc__', 'Changed description'), \
+                mock.patch.object(EmployerListCreateView, 'pagination_class', None):
+            after = self.make_store().get('json').body
+        self.assertNotEqual(before, after)
+        self.assertIn(b'Changed description', after)
+
+
+class CachedSchemaViewTests(TestCase):
+    """Tests for serving the precomputed OpenAPI document"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = SchemaStore(schema_view.generator_class, api_info, self.directory)
+        patcher = mock.patch('api.views.schema_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_strong_etag_and_not_modified(self):
+        """Test that the document carries a strong ETag and revalidates with a 304"""
+        response = self.client.get(reverse('openapi-schema', kwargs={'format': '.json'}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        response = self.client.get(reverse('openapi-schema', kwargs={'format': '.json'}), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_yaml(self):
+        """Test that the YAML document is served from the store"""
+        response = self.client.get(reverse('openapi-schema', kwargs={'format': '.yaml'}))
+        self.assertEqual(response.content, self.store.get('yaml').body)
+        self.assertEqual(response['ETag'], self.store.get('yaml').etag)
+
+    def test_ui_spec_generated_once(self):
+        """Test that the Swagger and ReDoc pages share one generated document"""
+        with mock.patch('api.schema.generate_documents', wraps=generate_documents) as generate:
+            for url in ('/api/docs/', '/api/redoc/'):
+                response = self.client.get(url, {'format': 'openapi'})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, self.store.get('json').body)
+            self.assertEqual(self.client.get('/api/docs/').status_code, status.HTTP_200_OK)
+        generate.assert_called_once()
+
+    def test_ui_pages_do_not_introspect(self):
+        """Test that the Swagger and ReDoc pages render without generating a schema"""
+        self.store.get('json')
+        with mock.patch.object(schema_view.generator_class, 'get_schema') as get_schema:
+            for url in ('/api/docs/', '/api/redoc/', '/api/docs/'):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertContains(response, api_info.title)
+        get_schema.assert_not_called()
+
+
+SESSION_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+]
+
+
+class PathDispatchMiddlewareTests(TestCase):
+    """Tests for per-path middleware chains"""
+
+    def test_api_skips_session_middleware(self):
+        """Test that API requests run without sessions or CSRF checks"""
+        client = Client(enforce_csrf_checks=True)
+        response = client.post(reverse('login'), {'email': 'nobody@example.com', 'password': 'x'}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertNotIn('sessionid', response.cookies)
+
+    def test_admin_keeps_full_stack(self):
+        """Test that the admin still gets sessions, users and CSRF checks"""
+        response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+        response = Client(enforce_csrf_checks=True).post('/admin/login/', {'username': 'a', 'password': 'b'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PATH_MIDDLEWARE={'/': SESSION_MIDDLEWARE, '/api/': [], '/api/admin/': SESSION_MIDDLEWARE})
+    def test_longest_prefix_wins(self):
+        """Test that the most specific prefix picks the chain"""
+        middleware = PathDispatchMiddleware(lambda request: HttpResponse())
+        factory = RequestFactory()
+        for path, has_session in (('/admin/', True), ('/api/employers/', False), ('/api/admin/', True)):
+            request = factory.get(path)
+            middleware(request)
+            self.assertEqual(hasattr(request, 'session'), has_session, path)
+
+    @override_settings(PATH_MIDDLEWARE={'/admin/': SESSION_MIDDLEWARE})
+    def test_unmatched_path_runs_no_extra_middleware(self):
+        """Test that a path outside every prefix goes straight to the next middleware"""
+        middleware = PathDispatchMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().post('/other/')
+        middleware(request)
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertIsNone(middleware.process_view(request, lambda request: None, (), {}))
+
+    @override_settings(PATH_MIDDLEWARE={'/admin/': SESSION_MIDDLEWARE})
+    async def test_async_chain(self):
+        """Test that under ASGI the chain and its hooks run natively async"""
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = PathDispatchMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertTrue(iscoroutinefunction(middleware.process_view))
+
+        request = AsyncRequestFactory().post('/admin/login/')
+        await middleware(request)
+        self.assertTrue(hasattr(request, 'session'))
+        response = await middleware.process_view(request, get_response, (), {})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_cors_preflight_answered_early(self):
+        """Test that preflights get a long Access-Control-Max-Age without reaching the view"""
+        with mock.patch('apps.users.views.EmployerListCreateView.dispatch') as dispatch:
+            response = self.client.options(
+                reverse('employer-list-create'),
+                HTTP_ORIGIN='http://localhost:3000',
+                HTTP_ACCESS_CONTROL_REQUEST_METHOD='POST',
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Access-Control-Max-Age'], '86400')
+        dispatch.assert_not_called()
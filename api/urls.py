@@ -1,11 +1,15 @@
-from django.urls import path
+from django.urls import path, re_path
 from apps.users.views import SignUpView, LoginView, LogoutView, ProfileView
-from apps.users.views import EmployerListCreateView, EmployerDetailView
+from apps.users.views import AsyncSignUpView, AsyncLoginView, AsyncProfileView
+from apps.users.views import AsyncEmployerListCreateView, AsyncEmployerDetailView
+from apps.users.views import EmployerListCreateView, EmployerDetailView, EmployerExportView, EmployerBulkView
 from . import views
 
 urlpatterns = [
-    path('docs/', views.schema_view.with_ui('swagger', cache_timeout=0)),
-    path('redoc/', views.schema_view.with_ui('redoc', cache_timeout=0)),
+    path('docs/', views.CachedSchemaView.with_ui('swagger')),
+    path('redoc/', views.CachedSchemaView.with_ui('redoc')),
+    re_path(r'^openapi(?P<format>\.json|\.yaml)$', views.CachedSchemaView.without_ui(), name='openapi-schema'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     
     # Authentication endpoints
     path('auth/signup/', SignUpView.as_view(), name='signup'),
@@ -13,7 +17,18 @@ urlpatterns = [
     path('auth/logout/', LogoutView.as_view(), name='logout'),
     path('auth/profile/', ProfileView.as_view(), name='profile'),
     
+    # Async authentication endpoints (password hashing runs in a process pool)
+    path('async/auth/signup/', AsyncSignUpView.as_view(), name='async-signup'),
+    path('async/auth/login/', AsyncLoginView.as_view(), name='async-login'),
+    path('async/auth/profile/', AsyncProfileView.as_view(), name='async-profile'),
+    
     # Employer endpoints
     path('employers/', EmployerListCreateView.as_view(), name='employer-list-create'),
+    path('employers/bulk/', EmployerBulkView.as_view(), name='employer-bulk'),
+    path('employers/export/', EmployerExportView.as_view(), name='employer-export'),
     path('employers/<int:pk>/', EmployerDetailView.as_view(), name='employer-detail'),
+    
+    # Async employer endpoints (served natively under ASGI)
+    path('async/employers/', AsyncEmployerListCreateView.as_view(), name='async-employer-list-create'),
+    path('async/employers/<int:pk>/', AsyncEmployerDetailView.as_view(), name='async-employer-detail'),
 ]
\ No newline at end of file
@@ -1,23 +1,65 @@
+import os
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
+from rest_framework.renderers import JSONRenderer
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from drf_yasg.renderers import _SpecRenderer
+from api.cache import cache_stats
+from core.metrics import registry
+from api.renderers import PrometheusRenderer
+from api.schema import SchemaStore
+from apps.users.hashing import hashing_pool
+from apps.users.last_login import last_login_tracker
+from apps.users.throttling import login_limiter
+from apps.users.tokens import token_store
+
+api_info = openapi.Info(
+   title="Employee Management System",
+   default_version='v1',
+   description="API Documentation for Employee Management System. For protected endpoints, use JWT token authentication by adding the 'Bearer' prefix before your token in the 'Authorization' header (Example: 'Bearer your_access_token_here').",
+   terms_of_service="https://www.google.com/policies/terms/",
+   contact=openapi.Contact(email="contact@ems.local"),
+   license=openapi.License(name="BSD License"),
+)
 
 # Schema view for Swagger documentation
 schema_view = get_schema_view(
-   openapi.Info(
-      title="Employee Management System",
-      default_version='v1',
-      description="API Documentation for Employee Management System. For protected endpoints, use JWT token authentication by adding the 'Bearer' prefix before your token in the 'Authorization' header (Example: 'Bearer your_access_token_here').",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@ems.local"),
-      license=openapi.License(name="BSD License"),
-   ),
+   api_info,
    public=True,
    permission_classes=(permissions.AllowAny,),
 )
 
+schema_store = SchemaStore(
+   schema_view.generator_class, api_info, getattr(settings, 'OPENAPI_SCHEMA_DIR', os.path.join(settings.BASE_DIR, 'openapi'))
+)
+
+
+class CachedSchemaView(schema_view):
+    """
+    Schema view that serves the spec from `schema_store` instead of
+    introspecting the API on every request. The Swagger and ReDoc pages
+    are rendered by drf_yasg from the stored document's title and version,
+    and the document they load comes from here too.
+    """
+    def get(self, request, version='', format=None):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, _SpecRenderer):
+            return Response(schema_store.get('json').swagger)
+
+        document = schema_store.get('yaml' if 'yaml' in renderer.media_type else 'json')
+        response = get_conditional_response(request, etag=document.etag)
+        if response is None:
+            response = HttpResponse(document.body, content_type=renderer.media_type)
+        response['ETag'] = document.etag
+        # Revalidate every time; unchanged documents cost a 304
+        response['Cache-Control'] = 'no-cache'
+        return response
+
 
 class DemoAPIView(APIView):
     def get(self, request):
@@ -30,4 +72,24 @@ class DemoAPIView(APIView):
                 {"id": 3, "name": "Employee 3"},
             ]
         }
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+
+class MetricsView(APIView):
+    """
+    Per-endpoint request histograms collected by MetricsMiddleware
+    Endpoint: GET /api/metrics/ (JSON) or /api/metrics/?format=prometheus
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [JSONRenderer, PrometheusRenderer]
+
+    def get(self, request):
+        return Response({
+            "sample_rate": getattr(settings, 'METRICS_SAMPLE_RATE', 0.1),
+            "endpoints": registry.snapshot(),
+            "login_throttle": login_limiter.stats(),
+            "last_login": last_login_tracker.stats(),
+            "token_store": token_store.stats(),
+            "hashing_pool": hashing_pool.stats(),
+            "cache": cache_stats(),
+        })
@@ -1,19 +1,72 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from apps.users.cache import invalidate_employer_cache
 from apps.users.models import User, Employer
+from apps.users.search import search_employer_substrings, search_users
 
-class UserAdmin(BaseUserAdmin):
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the row count of an unfiltered changelist from the
+    planner's statistics instead of running COUNT(*) over the whole table.
+
+    Estimates are only used above `estimate_threshold` rows; smaller tables,
+    filtered lists and databases without statistics are counted exactly.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = self.estimate(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            # reltuples is -1 until the table is first vacuumed or analyzed
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+        elif connection.vendor == 'sqlite':
+            # Row count from ANALYZE, the first number of any stat for the table
+            sql = "SELECT CAST(stat AS INTEGER) FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+        else:
+            return None
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [table])
+                row = cursor.fetchone()
+        except DatabaseError:
+            # sqlite_stat1 does not exist until ANALYZE first runs
+            return None
+        return row[0] if row and row[0] >= 0 else None
+
+
+class ScalableAdminMixin:
+    """Changelist settings that keep page loads cheap on large tables"""
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) behind "N results (M total)"
+    show_full_result_count = False
+
+
+class UserAdmin(ScalableAdminMixin, BaseUserAdmin):
     list_display = ('email', 'name', 'is_staff', 'is_active', 'date_joined')
     search_fields = ('email', 'name')
     ordering = ('email',)
-    
+
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal info', {'fields': ('name',)}),
         ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
         ('Important dates', {'fields': ('last_login', 'date_joined')}),
     )
-    
+
     add_fieldsets = (
         (None, {
             'classes': ('wide',),
@@ -21,11 +74,41 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
-class EmployerAdmin(admin.ModelAdmin):
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match every word anywhere in the email or name, case-insensitively,
+        through the trigram index rather than a full-table icontains. Also
+        used by the employer form's user autocomplete.
+        """
+        return search_users(queryset, search_term), False
+
+
+class EmployerAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('company_name', 'contact_person_name', 'email', 'phone_number', 'user', 'created_at')
     list_filter = ('created_at',)
+    list_select_related = ('user',)
     search_fields = ('company_name', 'contact_person_name', 'email')
     readonly_fields = ('created_at',)
+    # Search users over AJAX instead of rendering every user in a <select>
+    autocomplete_fields = ('user',)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Match every word anywhere in the company, contact or email,
+        case-insensitively, through the trigram index
+        """
+        return search_employer_substrings(queryset, search_term), False
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        # Deleting an employer sends no signal the cache listens to
+        invalidate_employer_cache(obj.user_id)
+
+    def delete_queryset(self, request, queryset):
+        owners = set(queryset.values_list('user_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for user_id in owners:
+            invalidate_employer_cache(user_id)
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Employer, EmployerAdmin)
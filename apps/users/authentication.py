@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserSnapshotCache:
+    """
+    Thread-safe in-process LRU of user rows, keyed by the token's user id.
+
+    Entries expire after `ttl` seconds and the least recently used entry
+    is evicted once `max_size` is reached.
+    """
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def set(self, user_id, snapshot):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+user_cache = UserSnapshotCache(
+    max_size=getattr(settings, 'AUTH_USER_CACHE_MAX_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds request.user from a cached snapshot of
+    the user row instead of running a SELECT on every request.
+
+    Snapshots are dropped when the user is saved or deleted (see
+    apps.users.signals) and otherwise expire after AUTH_USER_CACHE_TTL.
+    """
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        snapshot = user_cache.get(user_id)
+        if snapshot is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, self.take_snapshot(user))
+            return user
+
+        db, field_names, values = snapshot
+        return self.check_user(self.user_model.from_db(db, field_names, values), validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views: token validation needs no database,
+        and the user is loaded with the async ORM on a cache miss
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        snapshot = user_cache.get(user_id)
+        if snapshot is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user = self.check_user(user, validated_token)
+            user_cache.set(user_id, self.take_snapshot(user))
+            return user
+
+        db, field_names, values = snapshot
+        return self.check_user(self.user_model.from_db(db, field_names, values), validated_token)
+
+    def check_user(self, user, validated_token):
+        """Apply JWTAuthentication's active and revocation checks"""
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def take_snapshot(self, user):
+        field_names = tuple(field.attname for field in user._meta.concrete_fields)
+        return user._state.db, field_names, tuple(getattr(user, name) for name in field_names)
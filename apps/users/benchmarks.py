@@ -0,0 +1,135 @@
+"""
+Helpers shared by the benchmark management commands (bench_*).
+"""
+import math
+import statistics
+import time
+from contextlib import contextmanager
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from apps.users.models import Employer, User
+
+BENCHMARK_PASSWORD = 'BenchmarkPassword123!'
+
+
+def percentile(samples, q):
+    """Return the q-th percentile (0-100) of samples by nearest rank"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = math.ceil(q / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def summarize(samples):
+    """Summarize latency samples given in seconds as milliseconds"""
+    total = sum(samples)
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else None,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3) if samples else None,
+        'p95_ms': round(percentile(samples, 95) * 1000, 3) if samples else None,
+        'p99_ms': round(percentile(samples, 99) * 1000, 3) if samples else None,
+        'per_second': round(len(samples) / total, 1) if total else None,
+    }
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Run the enclosed block against a throwaway test database, the same way
+    the test runner does, so benchmarks never touch the real data.
+    """
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def seed(users, employers_per_user, password=BENCHMARK_PASSWORD):
+    """
+    Bulk-create `users` users with `employers_per_user` employers each.
+
+    The password is hashed once and shared by every user, so seeding cost
+    does not depend on the hasher.
+    """
+    encoded = make_password(password)
+    created = User.objects.bulk_create([
+        User(email=f'bench{i}@example.com', name=f'Bench User {i}', password=encoded)
+        for i in range(users)
+    ])
+    for offset in range(0, len(created), 100):
+        Employer.objects.bulk_create([
+            Employer(
+                user=user,
+                company_name=f'Company {user.pk}-{j}',
+                contact_person_name=f'Contact {j}',
+                email=f'company{j}@example.com',
+                phone_number='1234567890',
+                address=f'{j} Benchmark Street, Benchmark City'
+            )
+            for user in created[offset:offset + 100]
+            for j in range(employers_per_user)
+        ], batch_size=1000)
+    return created
+
+
+class EndpointRecorder:
+    """
+    Collects latency, status and query count samples per endpoint.
+
+    Queries are counted with an execute wrapper on every connection, including
+    connections opened later on other threads or async contexts (as the ASGI
+    handler does), so the counts do not depend on how a request is served.
+    Requests must be recorded one at a time.
+    """
+    def __init__(self):
+        self.samples = {}
+        self._queries = 0
+        self._install(connection=connection)
+        connection_created.connect(self._install)
+
+    def _install(self, sender=None, connection=None, **kwargs):
+        if self._count not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self._count)
+
+    def _count(self, execute, sql, params, many, context):
+        self._queries += 1
+        return execute(sql, params, many, context)
+
+    def close(self):
+        connection_created.disconnect(self._install)
+
+    @contextmanager
+    def record(self, name):
+        sample = {}
+        self._queries = 0
+        start = time.perf_counter()
+        yield sample
+        elapsed = time.perf_counter() - start
+        entry = self.samples.setdefault(name, {'latencies': [], 'queries': [], 'statuses': {}})
+        entry['latencies'].append(elapsed)
+        entry['queries'].append(self._queries)
+        status = str(sample.get('status'))
+        entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+
+    def results(self):
+        return {
+            name: dict(
+                summarize(entry['latencies']),
+                queries_mean=round(statistics.fmean(entry['queries']), 2),
+                queries_max=max(entry['queries']),
+                statuses=entry['statuses'],
+            )
+            for name, entry in self.samples.items()
+        }
@@ -0,0 +1,119 @@
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from api.cache import read_through
+
+EMPLOYER_CACHE_TIMEOUT = getattr(settings, 'EMPLOYER_CACHE_TIMEOUT', 300)
+
+
+def _version_key(user_id):
+    return f'employers:{user_id}:version'
+
+
+def _version_cache():
+    """
+    The tier every process reads directly, so a bumped generation is seen
+    at once rather than after the local tier's timeout
+    """
+    return getattr(cache, 'shared', cache)
+
+
+def get_employer_cache_version(user_id):
+    """
+    Return the current cache generation for a user's employers.
+
+    Generations are random rather than counters so that an evicted version
+    key can never bring back entries written under an older generation.
+    """
+    key = _version_key(user_id)
+    version_cache = _version_cache()
+    version = version_cache.get(key)
+    if version is None:
+        version_cache.add(key, uuid.uuid4().hex, None)
+        version = version_cache.get(key)
+    return version
+
+
+def invalidate_employer_cache(user_id):
+    """
+    Start a new cache generation for a user's employers.
+
+    The generation is bumped immediately and again once the surrounding
+    transaction commits, so a read racing the write cannot re-cache rows
+    that are about to change.
+    """
+    def bump():
+        _version_cache().set(_version_key(user_id), uuid.uuid4().hex, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def employer_cache_key(user_id, name):
+    return f'employers:{user_id}:{get_employer_cache_version(user_id)}:{name}'
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+class NotModified(Exception):
+    """Carries a 304 response out of a cache fill"""
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalCacheMixin:
+    """
+    Serve GET responses from a per-user cache of serialized payloads, with
+    ETag / Last-Modified validators so unchanged polls get a 304.
+
+    Views provide get_validators(), which returns (etag, last_modified) as
+    cheaply as possible, and get_payload(), which does the full work.
+    """
+    def get_cache_key(self, request):
+        return employer_cache_key(request.user.pk, request.get_full_path())
+
+    def cached_response(self, request):
+        try:
+            etag, last_modified, data = read_through(
+                self.get_cache_key(request), lambda: self.build_entry(request), EMPLOYER_CACHE_TIMEOUT
+            )
+        except NotModified as exc:
+            return exc.response
+
+        not_modified = self.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return self.add_validators(Response(data), etag, last_modified)
+
+    def build_entry(self, request):
+        """
+        Compute (etag, last_modified, payload) for the cache. On a miss, a
+        conditional request is answered from the validators alone, without
+        building the payload.
+        """
+        etag, last_modified = self.get_validators()
+        not_modified = self.not_modified(request, etag, last_modified)
+        if not_modified is not None:
+            raise NotModified(not_modified)
+        return etag, last_modified, self.get_payload()
+
+    def not_modified(self, request, etag, last_modified):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            self.add_validators(response, etag, last_modified)
+        return response
+
+    def add_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        response['Cache-Control'] = 'private, no-cache'
+        return response
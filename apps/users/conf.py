@@ -0,0 +1,28 @@
+from django.conf import settings
+
+
+class Setting:
+    """
+    Attribute of a process-wide helper that reads `name` from Django
+    settings on every access, so override_settings applies to it. A value
+    assigned on the instance takes precedence.
+    """
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return getattr(settings, self.name, self.default)
+
+
+# Default of constructor arguments that are left to settings
+UNSET = object()
+
+
+def configure(instance, **values):
+    """Set the explicitly passed values on `instance`, leaving UNSET ones to settings"""
+    for name, value in values.items():
+        if value is not UNSET:
+            setattr(instance, name, value)
@@ -0,0 +1,16 @@
+from rest_framework.filters import BaseFilterBackend
+from apps.users.search import search_employers
+
+
+class EmployerSearchFilter(BaseFilterBackend):
+    """
+    Ranked search over employers with ?search=.
+
+    Matching and ranking are done against the database search index, see
+    apps.users.search.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        return search_employers(queryset, query)
@@ -0,0 +1,80 @@
+import atexit
+import os
+import threading
+from django.db import DatabaseError, connections
+
+
+class BackgroundFlusher:
+    """
+    Daemon thread that calls `buffer.flush()` every `interval` seconds (by
+    default the buffer's current flush_interval), so queued writes reach
+    the database even in a process that serves no further requests, plus
+    a final flush when the interpreter exits.
+
+    The thread is started on first use rather than at import, and again
+    in a forked child, whose copy of the parent's thread is not running.
+    Failed flushes are left to the buffer to requeue and retried on the
+    next tick.
+    """
+    def __init__(self, buffer, interval=None):
+        self.buffer = buffer
+        self._interval = interval
+        self._pid = None
+        self._thread = None
+        self._registered = False
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            if not self._registered:
+                atexit.register(self.flush_at_exit)
+                self._registered = True
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self.run, name=f'{type(self.buffer).__name__}-flusher', daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def interval(self):
+        """`interval`, or else the buffer's flush_interval as it is now"""
+        interval = self.buffer.flush_interval if self._interval is None else self._interval
+        # A buffer switched to synchronous writes has nothing left to flush
+        return interval if interval > 0 else 1
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        try:
+            self.buffer.flush()
+        except DatabaseError:
+            pass
+        finally:
+            # Connections are per thread; don't hold one open between ticks
+            for connection in connections.all(initialized_only=True):
+                connection.close()
+
+    def stop(self):
+        """Stop the thread, waiting for a flush in progress to finish"""
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._pid = None
+
+    def flush_at_exit(self):
+        if self._pid != os.getpid():
+            return
+        self._stopped.set()
+        try:
+            self.buffer.flush()
+        except DatabaseError:
+            pass
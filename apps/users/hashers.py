@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunableHasherMixin:
+    """
+    Reads the hasher's cost parameters from the matching entry of
+    settings.PASSWORD_HASHER_PROFILES.
+
+    Hashes made with different parameters still verify, and must_update()
+    reports them as outdated, so they are upgraded on the next login.
+    """
+    profile = None
+
+    def __init__(self):
+        params = settings.PASSWORD_HASHER_PROFILES.get(self.profile, {}).get('params', {})
+        for name, value in params.items():
+            setattr(self, name, value)
+
+
+class TunablePBKDF2PasswordHasher(TunableHasherMixin, PBKDF2PasswordHasher):
+    profile = 'pbkdf2'
+
+
+class TunableArgon2PasswordHasher(TunableHasherMixin, Argon2PasswordHasher):
+    profile = 'argon2'
+
+
+class TunableScryptPasswordHasher(TunableHasherMixin, ScryptPasswordHasher):
+    profile = 'scrypt'
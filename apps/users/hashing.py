@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing pool already has max_pending jobs in flight."""
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+class HashingPool:
+    """
+    Bounded process pool for password hashing.
+
+    Hashing is pure CPU work, so running it in separate processes keeps it
+    from holding the GIL on the event loop or on web worker threads. At most
+    `max_pending` jobs may be queued or running at once; further calls fail
+    fast with HashingPoolBusy instead of growing an unbounded queue.
+    """
+    def __init__(self, max_workers=2, max_pending=64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),),
+                    )
+        return self._executor
+
+    def start(self):
+        """Spawn the worker processes ahead of the first request"""
+        for future in [self.executor.submit(os.getpid) for _ in range(self.max_workers)]:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self.queue_depth >= self.max_pending:
+                self.rejected += 1
+                raise HashingPoolBusy()
+            self.queue_depth += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        except BaseException:
+            with self._lock:
+                self.queue_depth -= 1
+                self.failed += 1
+            raise
+        with self._lock:
+            self.queue_depth -= 1
+            self.completed += 1
+        return result
+
+    def stats(self):
+        return {
+            'workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'queue_depth': self.queue_depth,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+        }
+
+
+hashing_pool = HashingPool(
+    max_workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 2),
+    max_pending=getattr(settings, 'PASSWORD_HASHING_MAX_PENDING', 64),
+)
+
+
+def verify_password(password, encoded):
+    """
+    Verify a password and, if its hash is outdated, compute the upgraded hash.
+
+    Returns (is_correct, upgraded_hash_or_None).
+    """
+    upgraded = []
+    is_correct = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return is_correct, (upgraded[0] if upgraded else None)
+
+
+async def averify_password(password, encoded):
+    """Run verify_password() in the hashing pool"""
+    return await hashing_pool.run(verify_password, password, encoded)
+
+
+async def amake_password(password):
+    """Hash a password in the hashing pool"""
+    return await hashing_pool.run(make_password, password)
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.utils import timezone
+from apps.users.authentication import user_cache
+from apps.users.conf import UNSET, Setting, configure
+from apps.users.flushing import BackgroundFlusher
+
+
+class LastLoginTracker:
+    """
+    Write-behind tracker of User.last_login for every login path.
+
+    A login within `resolution` seconds of the stored (or pending) value is
+    not written at all. Other logins are queued, several logins of one user
+    collapse into one write, and the queue is written with bulk_update in
+    batches of `batch_size` once the oldest entry is `flush_interval`
+    seconds old. That is checked on request_finished (see
+    apps.users.signals) and by a BackgroundFlusher thread every
+    flush_interval seconds, so an idle process still writes its queue, and
+    whatever is left is flushed at interpreter exit. With
+    flush_interval <= 0 every write is immediate and no thread is started.
+
+    Queued timestamps live in process memory: a process that is killed
+    without running its exit handlers loses at most `flush_interval`
+    seconds of last_login updates.
+
+    Options not passed in are read from the LAST_LOGIN_* settings on use.
+    """
+    resolution = Setting('LAST_LOGIN_RESOLUTION', 60)
+    flush_interval = Setting('LAST_LOGIN_FLUSH_INTERVAL', 5)
+    batch_size = Setting('LAST_LOGIN_BATCH_SIZE', 500)
+
+    def __init__(self, resolution=UNSET, flush_interval=UNSET, batch_size=UNSET):
+        configure(self, resolution=resolution, flush_interval=flush_interval, batch_size=batch_size)
+        self.flusher = BackgroundFlusher(self)
+        self._pending = {}
+        self._pending_since = None
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(('logins', 'skipped', 'coalesced', 'written', 'flushes'), 0)
+
+    def record(self, user, now=None):
+        """Note that `user` logged in at `now`, writing it later if needed"""
+        now = now or timezone.now()
+        with self._lock:
+            self.counters['logins'] += 1
+            previous = self._pending.get(user.pk) or user.last_login
+            if previous is not None and now - previous < timedelta(seconds=self.resolution):
+                self.counters['skipped'] += 1
+                return
+            if user.pk in self._pending:
+                self.counters['coalesced'] += 1
+            elif not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending[user.pk] = now
+        user.last_login = now
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self.flusher.ensure_started()
+
+    def due(self):
+        since = self._pending_since
+        return since is not None and time.monotonic() - since >= self.flush_interval
+
+    def flush_if_due(self):
+        """Flush if the oldest pending login has waited flush_interval; errors are retried next time"""
+        if self.due():
+            try:
+                self.flush()
+            except DatabaseError:
+                pass
+
+    def flush(self):
+        """Write every pending last_login now; returns the number of users written"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._pending_since = None
+        if not pending:
+            return 0
+
+        User = get_user_model()
+        try:
+            User.objects.bulk_update(
+                [User(pk=pk, last_login=last_login) for pk, last_login in pending.items()],
+                ['last_login'],
+                batch_size=self.batch_size,
+            )
+        except DatabaseError:
+            self.requeue(pending)
+            raise
+
+        # bulk_update sends no post_save, so drop the snapshots here
+        for pk in pending:
+            user_cache.invalidate(pk)
+        with self._lock:
+            self.counters['written'] += len(pending)
+            self.counters['flushes'] += 1
+        return len(pending)
+
+    def requeue(self, pending):
+        with self._lock:
+            for pk, last_login in pending.items():
+                if pk not in self._pending or self._pending[pk] < last_login:
+                    self._pending[pk] = last_login
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self.counters,
+                writes_avoided=self.counters['skipped'] + self.counters['coalesced'],
+                pending=len(self._pending),
+            )
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._pending_since = None
+            for name in self.counters:
+                self.counters[name] = 0
+
+
+last_login_tracker = LastLoginTracker()
@@ -0,0 +1,219 @@
+import json
+import platform
+import subprocess
+from itertools import cycle
+import django
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+from apps.users.benchmarks import BENCHMARK_PASSWORD, EndpointRecorder, benchmark_database, seed
+from apps.users.models import Employer
+
+# URL names of the async variants of the profile and employer views
+ASYNC_URL_NAMES = {
+    'profile': 'async-profile',
+    'employer-list-create': 'async-employer-list-create',
+    'employer-detail': 'async-employer-detail',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the auth and employer APIs in-process against a throwaway "
+        "database, reporting requests/sec, p50/p95/p99 latency and SQL query "
+        "counts per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Number of seeded users.')
+        parser.add_argument('--employers', type=int, default=100, help='Employers seeded per user.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint.')
+        parser.add_argument(
+            '--auth-requests', type=int, default=10,
+            help='Requests for signup and login, which are dominated by password hashing.'
+        )
+        parser.add_argument(
+            '--client', choices=('wsgi', 'asgi'), default='wsgi',
+            help='Drive the API through the WSGI test client or the in-process ASGI client.'
+        )
+        parser.add_argument(
+            '--views', choices=('sync', 'async'), default='sync',
+            help='Exercise the DRF profile and employer views or their async variants (needs --client asgi).'
+        )
+        parser.add_argument('--output', help='Write results as JSON to this file.')
+        parser.add_argument('--compare', help='Print the change against a previous --output file.')
+
+    def handle(self, *args, **options):
+        if options['views'] == 'async' and options['client'] != 'asgi':
+            raise CommandError('--views async needs --client asgi.')
+        self.views = options['views']
+        with benchmark_database():
+            self.users = seed(options['users'], options['employers'])
+            self.employer_ids = list(
+                Employer.objects.filter(user=self.users[0]).values_list('id', flat=True)
+            )
+            recorder = EndpointRecorder()
+            # Every request comes from one client, which would soon exhaust its login bucket
+            try:
+                with override_settings(LOGIN_THROTTLE_IP_RATE=None, LOGIN_THROTTLE_EMAIL_RATE=None):
+                    if options['client'] == 'asgi':
+                        async_to_sync(self.run_async)(AsyncClient(), recorder, options)
+                    else:
+                        self.run(Client(), recorder, options)
+            finally:
+                recorder.close()
+            results = {'meta': self.meta(options), 'endpoints': recorder.results()}
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        self.report(results['endpoints'])
+        if options['compare']:
+            with open(options['compare']) as f:
+                self.compare(json.load(f)['endpoints'], results['endpoints'])
+
+    def scenarios(self, options):
+        """
+        Yield (name, method, path, payload, token_key) for every request,
+        where token_key names the credential the request should carry.
+        """
+        users = cycle(self.users)
+        for i in range(options['auth_requests']):
+            yield 'signup', 'post', reverse('signup'), {
+                'email': f'signup{i}@example.com',
+                'name': 'Signup User',
+                'password': BENCHMARK_PASSWORD,
+                'password2': BENCHMARK_PASSWORD,
+            }, None
+            yield 'login', 'post', reverse('login'), {
+                'email': next(users).email,
+                'password': BENCHMARK_PASSWORD,
+            }, None
+
+        employer_ids = cycle(self.employer_ids)
+        for i in range(options['requests']):
+            yield 'token_refresh', 'post', reverse('token_refresh'), 'refresh', None
+            yield 'profile', 'get', self.url('profile'), None, 'access'
+            yield 'employer_list', 'get', self.url('employer-list-create'), None, 'access'
+            yield 'employer_search', 'get', self.url('employer-list-create') + '?' + urlencode({
+                'search': f"contact {i % options['employers']}",
+            }), None, 'access'
+            yield 'employer_create', 'post', self.url('employer-list-create'), {
+                'company_name': f'Created {i}',
+                'contact_person_name': 'Contact',
+                'email': f'created{i}@example.com',
+                'phone_number': '1234567890',
+                'address': 'Address',
+            }, 'access'
+            yield 'employer_update', 'patch', self.url('employer-detail', pk=next(employer_ids)), {
+                'company_name': f'Updated {i}',
+            }, 'access'
+            yield 'employer_delete', 'delete', 'created', None, 'access'
+
+    def url(self, name, **kwargs):
+        if self.views == 'async':
+            name = ASYNC_URL_NAMES[name]
+        return reverse(name, kwargs=kwargs or None)
+
+    def login(self, response, tokens):
+        data = response.json()
+        tokens['refresh'] = data['refresh']
+        tokens['access'] = data['access']
+
+    def prepare(self, name, path, payload, tokens, created):
+        """Fill in values that depend on earlier responses"""
+        if payload == 'refresh':
+            payload = {'refresh': tokens['refresh']}
+        if path == 'created':
+            path = self.url('employer-detail', pk=created.pop())
+        return path, payload
+
+    def after(self, name, response, tokens, created):
+        if name == 'token_refresh' and response.status_code == 200:
+            tokens['refresh'] = response.json()['refresh']
+        elif name == 'employer_create' and response.status_code == 201:
+            created.append(response.json()['id'])
+
+    def run(self, client, recorder, options):
+        tokens = {}
+        created = []
+        self.login(client.post(reverse('login'), {
+            'email': self.users[0].email, 'password': BENCHMARK_PASSWORD,
+        }, content_type='application/json'), tokens)
+
+        for name, method, path, payload, token_key in self.scenarios(options):
+            path, payload = self.prepare(name, path, payload, tokens, created)
+            headers = {'Authorization': f'Bearer {tokens[token_key]}'} if token_key else {}
+            with recorder.record(name) as sample:
+                response = getattr(client, method)(
+                    path, payload, content_type='application/json', headers=headers
+                )
+                sample['status'] = response.status_code
+            self.after(name, response, tokens, created)
+
+    async def run_async(self, client, recorder, options):
+        tokens = {}
+        created = []
+        self.login(await client.post(reverse('login'), {
+            'email': self.users[0].email, 'password': BENCHMARK_PASSWORD,
+        }, content_type='application/json'), tokens)
+
+        for name, method, path, payload, token_key in self.scenarios(options):
+            path, payload = self.prepare(name, path, payload, tokens, created)
+            headers = {'Authorization': f'Bearer {tokens[token_key]}'} if token_key else {}
+            with recorder.record(name) as sample:
+                response = await getattr(client, method)(
+                    path, payload, content_type='application/json', headers=headers
+                )
+                sample['status'] = response.status_code
+            self.after(name, response, tokens, created)
+
+    def meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'timestamp': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'client': options['client'],
+            'views': options['views'],
+            'users': options['users'],
+            'employers_per_user': options['employers'],
+            'requests': options['requests'],
+            'auth_requests': options['auth_requests'],
+        }
+
+    def report(self, endpoints):
+        self.stdout.write(
+            f"{'endpoint':<16} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}  statuses"
+        )
+        for name, result in endpoints.items():
+            self.stdout.write(
+                f"{name:<16} {result['per_second']:>8} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+                f"{result['p99_ms']:>9} {result['queries_mean']:>8}  {result['statuses']}"
+            )
+
+    def compare(self, previous, current):
+        self.stdout.write('\nChange against the previous run:')
+        for name, result in current.items():
+            if name not in previous:
+                continue
+            before = previous[name]
+            self.stdout.write(
+                f"{name:<16} p50 {self.delta(before['p50_ms'], result['p50_ms'])}  "
+                f"req/s {self.delta(before['per_second'], result['per_second'])}  "
+                f"queries {before['queries_mean']} -> {result['queries_mean']}"
+            )
+
+    def delta(self, before, after):
+        if not before:
+            return 'n/a'
+        return f'{(after - before) / before * 100:+.1f}%'
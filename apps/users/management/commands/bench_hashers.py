@@ -0,0 +1,76 @@
+import json
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from apps.users.benchmarks import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password verification latency, the CPU cost of a login, "
+        "for each hasher profile in PASSWORD_HASHER_PROFILES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile', action='append', dest='profiles',
+            help='Profile to benchmark (repeatable). Defaults to every profile.'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=20,
+            help='Number of verifications per profile.'
+        )
+        parser.add_argument(
+            '--param', action='append', default=[], metavar='NAME=VALUE',
+            help='Override a cost parameter for every benchmarked profile, e.g. iterations=600000.'
+        )
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.PASSWORD_HASHER_PROFILES)
+        overrides = self.parse_params(options['param'])
+        results = {}
+
+        for name in profiles:
+            if name not in settings.PASSWORD_HASHER_PROFILES:
+                raise CommandError(f"Unknown hasher profile '{name}'")
+            hasher = import_string(settings.PASSWORD_HASHER_PROFILES[name]['hasher'])()
+            for param, value in overrides.items():
+                if hasattr(hasher, param):
+                    setattr(hasher, param, value)
+            try:
+                encoded = hasher.encode('BenchmarkPassword123!', hasher.salt())
+            except ValueError as exc:
+                # Raised when the hasher's optional library is not installed
+                self.stderr.write(f'Skipping {name}: {exc}')
+                continue
+
+            samples = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                hasher.verify('BenchmarkPassword123!', encoded)
+                samples.append(time.perf_counter() - start)
+            params = {
+                key: value for key, value in hasher.decode(encoded).items()
+                if key not in ('algorithm', 'hash', 'salt')
+            }
+            results[name] = dict(summarize(samples), algorithm=hasher.algorithm, params=params)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<8} p50 {result['p50_ms']:>9.1f} ms  p99 {result['p99_ms']:>9.1f} ms  "
+                f"{result['per_second']:>7.1f} logins/s per core  {result['params']}"
+            )
+
+    def parse_params(self, params):
+        overrides = {}
+        for param in params:
+            name, _, value = param.partition('=')
+            if not value:
+                raise CommandError(f"Invalid --param '{param}', expected NAME=VALUE")
+            overrides[name] = int(value)
+        return overrides
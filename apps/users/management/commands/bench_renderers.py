@@ -0,0 +1,81 @@
+import io
+import json
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from apps.users.benchmarks import summarize
+from apps.users.models import Employer
+from apps.users.serializers import EmployerSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JSON render and parse times of DRF's JSONRenderer/JSONParser "
+        "with FastJSONRenderer/FastJSONParser on a serialized employer list."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Employers in the rendered list.')
+        parser.add_argument('--iterations', type=int, default=20, help='Renders and parses per class.')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write('orjson is not installed, so the fast classes fall back to stdlib json.')
+
+        data = EmployerSerializer(self.employers(options['rows']), many=True).data
+        rendered = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != rendered:
+            raise CommandError('FastJSONRenderer output differs from JSONRenderer.')
+
+        results = {
+            'render': {
+                name: self.measure(lambda: renderer.render(data), options['iterations'])
+                for name, renderer in (('JSONRenderer', JSONRenderer()), ('FastJSONRenderer', FastJSONRenderer()))
+            },
+            'parse': {
+                name: self.measure(lambda: parser.parse(io.BytesIO(rendered)), options['iterations'])
+                for name, parser in (('JSONParser', JSONParser()), ('FastJSONParser', FastJSONParser()))
+            },
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{options['rows']} employers, {len(rendered)} bytes")
+        for operation, timings in results.items():
+            baseline, fast = timings.values()
+            for name, result in timings.items():
+                self.stdout.write(
+                    f"{operation:<7} {name:<17} p50 {result['p50_ms']:>9.2f} ms  p99 {result['p99_ms']:>9.2f} ms"
+                )
+            self.stdout.write(f"{operation:<7} speedup {baseline['p50_ms'] / fast['p50_ms']:.1f}x")
+
+    def employers(self, rows):
+        """Build unsaved employers shaped like real rows, with distinct timestamps"""
+        now = timezone.now()
+        return [
+            Employer(
+                id=i,
+                company_name=f'Company {i}',
+                contact_person_name=f'Contact {i}',
+                email=f'company{i}@example.com',
+                phone_number='1234567890',
+                address=f'{i} Benchmark Street, Benchmark City',
+                created_at=now - timedelta(seconds=i, microseconds=i),
+            )
+            for i in range(1, rows + 1)
+        ]
+
+    def measure(self, func, iterations):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        return summarize(samples)
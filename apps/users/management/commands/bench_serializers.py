@@ -0,0 +1,71 @@
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from apps.users.benchmarks import benchmark_database, seed, summarize
+from apps.users.models import Employer
+from apps.users.serializers import EmployerReadSerializer, EmployerSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare reading and serializing an employer list with EmployerSerializer "
+        "over model instances and with EmployerReadSerializer over .values() rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Employers in the list.')
+        parser.add_argument('--iterations', type=int, default=10, help='Runs per serializer.')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            user = seed(1, options['rows'])[0]
+            queryset = Employer.objects.filter(user_id=user.pk)
+            columns = EmployerReadSerializer.columns()
+
+            instances = list(queryset)
+            rows = list(queryset.values(*columns))
+            if JSONRenderer().render(EmployerReadSerializer(rows, many=True).data) != \
+                    JSONRenderer().render(EmployerSerializer(instances, many=True).data):
+                raise CommandError('EmployerReadSerializer output differs from EmployerSerializer.')
+
+            results = {
+                'serialize': {
+                    'EmployerSerializer': self.measure(
+                        lambda: EmployerSerializer(instances, many=True).data, options['iterations']
+                    ),
+                    'EmployerReadSerializer': self.measure(
+                        lambda: EmployerReadSerializer(rows, many=True).data, options['iterations']
+                    ),
+                },
+                'fetch+serialize': {
+                    'EmployerSerializer': self.measure(
+                        lambda: EmployerSerializer(list(queryset), many=True).data, options['iterations']
+                    ),
+                    'EmployerReadSerializer': self.measure(
+                        lambda: EmployerReadSerializer(list(queryset.values(*columns)), many=True).data,
+                        options['iterations']
+                    ),
+                },
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{options['rows']} employers")
+        for operation, timings in results.items():
+            baseline, fast = timings.values()
+            for name, result in timings.items():
+                self.stdout.write(
+                    f"{operation:<16} {name:<23} p50 {result['p50_ms']:>9.2f} ms  p99 {result['p99_ms']:>9.2f} ms"
+                )
+            self.stdout.write(f"{operation:<16} speedup {baseline['p50_ms'] / fast['p50_ms']:.1f}x")
+
+    def measure(self, func, iterations):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        return summarize(samples)
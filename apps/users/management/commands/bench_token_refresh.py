@@ -0,0 +1,89 @@
+import json
+import time
+from unittest import mock
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.benchmarks import benchmark_database, seed, summarize
+from apps.users.serializers import BloomTokenRefreshSerializer
+from apps.users.tokens import blacklist_filter, token_store
+
+
+class StatementCounter:
+    """Execute wrapper counting statements, and INSERTs separately"""
+    def __init__(self):
+        self.statements = 0
+        self.inserts = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements += 1
+        if sql.lstrip().upper().startswith('INSERT'):
+            self.inserts += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh-token storm: every user rotates their refresh token several "
+        "times in a row. Compares simplejwt's synchronous bookkeeping with "
+        "TokenStore, flushing on every write and buffered."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='Users refreshing concurrently.')
+        parser.add_argument('--rounds', type=int, default=5, help='Refreshes per user.')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON.')
+
+    def handle(self, *args, **options):
+        modes = {
+            'simplejwt': (TokenRefreshSerializer, None),
+            'synchronous': (BloomTokenRefreshSerializer, 0),
+            'buffered': (BloomTokenRefreshSerializer, token_store.flush_interval),
+        }
+        with benchmark_database():
+            users = seed(options['users'], 0)
+            results = {}
+            for name, (serializer_class, flush_interval) in modes.items():
+                blacklist_filter.reset()
+                token_store.reset()
+                with mock.patch.object(token_store, 'flush_interval', flush_interval or 0):
+                    results[name] = self.storm(users, serializer_class, options['rounds'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{options['users']} users x {options['rounds']} refreshes")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12} {result['per_second']:>8.1f} refreshes/s  p50 {result['p50_ms']:>7.3f} ms  "
+                f"p99 {result['p99_ms']:>7.3f} ms  {result['statements_per_refresh']:>5.2f} statements/refresh  "
+                f"{result['inserts_per_refresh']:>5.2f} inserts/refresh"
+            )
+
+    def storm(self, users, serializer_class, rounds):
+        # Tokens are issued outside the measurement, with their OutstandingToken written
+        tokens = [str(RefreshToken.for_user(user)) for user in users]
+        counter = StatementCounter()
+        samples = []
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for i, raw in enumerate(tokens):
+                    began = time.perf_counter()
+                    serializer = serializer_class(data={'refresh': raw})
+                    serializer.is_valid(raise_exception=True)
+                    tokens[i] = serializer.validated_data['refresh']
+                    # What request_finished does after every response
+                    token_store.flush_if_due()
+                    samples.append(time.perf_counter() - began)
+            token_store.flush()
+            elapsed = time.perf_counter() - start
+        refreshes = len(samples)
+        return dict(
+            summarize(samples),
+            per_second=round(refreshes / elapsed, 1),
+            statements_per_refresh=round(counter.statements / refreshes, 2),
+            inserts_per_refresh=round(counter.inserts / refreshes, 2),
+            flushes=token_store.stats()['flushes'],
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.views import schema_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI document served by /api/docs/ and /api/redoc/ to "
+        "OPENAPI_SCHEMA_DIR as JSON and YAML. The server generates its own "
+        "copy in each process; this one is for publishing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report whether the written document matches the API; exit 1 if not.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            if not schema_store.is_current():
+                raise CommandError(f'OpenAPI document in {schema_store.directory} is out of date.')
+            self.stdout.write(f'OpenAPI document in {schema_store.directory} is up to date.')
+            return
+
+        try:
+            schema_store.write()
+        except OSError as exc:
+            raise CommandError(f'Could not write the OpenAPI document to {schema_store.directory}: {exc}')
+        self.stdout.write(
+            f'Generated OpenAPI document in {schema_store.directory} (ETag {schema_store.get("json").etag}).'
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 21:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_remove_user_first_name_remove_user_last_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='employer_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+import apps.users.models.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+# The SQL is written out here rather than imported, so this migration keeps
+# creating the same index however the search code changes later.
+SQLITE_CREATE_SQL = [
+    "CREATE VIRTUAL TABLE users_employer_fts USING fts5("
+    "company_name, contact_person_name, email, "
+    "content='users_employer', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER users_employer_fts_ai AFTER INSERT ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+    "CREATE TRIGGER users_employer_fts_ad AFTER DELETE ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(users_employer_fts, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); END",
+    "CREATE TRIGGER users_employer_fts_au AFTER UPDATE OF company_name, contact_person_name, email "
+    "ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(users_employer_fts, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); "
+    "INSERT INTO users_employer_fts(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+    # The default FTS5 rank, with bm25() column weights in column order
+    "INSERT INTO users_employer_fts(users_employer_fts, rank) VALUES ('rank', 'bm25(2.0, 1.0, 1.0)')",
+    "INSERT INTO users_employer_fts(users_employer_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS users_employer_fts_au',
+    'DROP TRIGGER IF EXISTS users_employer_fts_ad',
+    'DROP TRIGGER IF EXISTS users_employer_fts_ai',
+    'DROP TABLE IF EXISTS users_employer_fts',
+]
+
+SEARCH_FIELDS = ('company_name', 'contact_person_name', 'email')
+
+
+def postgres_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.contrib.postgres.search import SearchVector
+    from django.db.models.functions import Upper
+    indexes = [GinIndex(SearchVector(*SEARCH_FIELDS, config='simple'), name='employer_search_vector_idx')]
+    for field in SEARCH_FIELDS:
+        indexes.append(GinIndex(
+            OpClass(Upper(field), name='gin_trgm_ops'),
+            name=f"employer_{field.split('_')[0]}_trgm_idx",
+        ))
+    return indexes
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        model = apps.get_model('users', 'Employer')
+        for index in postgres_indexes():
+            schema_editor.add_index(model, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        model = apps.get_model('users', 'Employer')
+        for index in postgres_indexes():
+            schema_editor.remove_index(model, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_employer_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+        migrations.CreateModel(
+            name='EmployerSearchIndex',
+            fields=[
+                ('employer', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='users.employer')),
+                ('document', apps.users.models.search.SearchDocumentField(db_column='users_employer_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'users_employer_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2 on 2026-10-17 21:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Altering a column makes SQLite rebuild the table, which drops the triggers
+# keeping the search index in sync, so they are recreated around it. The
+# index rows are keyed by id, which the rebuild preserves.
+SQLITE_CREATE_TRIGGERS = [
+    "CREATE TRIGGER users_employer_fts_ai AFTER INSERT ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+    "CREATE TRIGGER users_employer_fts_ad AFTER DELETE ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(users_employer_fts, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); END",
+    "CREATE TRIGGER users_employer_fts_au AFTER UPDATE OF company_name, contact_person_name, email "
+    "ON users_employer BEGIN "
+    "INSERT INTO users_employer_fts(users_employer_fts, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); "
+    "INSERT INTO users_employer_fts(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+]
+
+SQLITE_DROP_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS users_employer_fts_au',
+    'DROP TRIGGER IF EXISTS users_employer_fts_ad',
+    'DROP TRIGGER IF EXISTS users_employer_fts_ai',
+]
+
+
+def run_on_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_employer_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='employer',
+            options={'ordering': ('-created_at', 'id'), 'verbose_name': 'employer', 'verbose_name_plural': 'employers'},
+        ),
+        migrations.RemoveIndex(
+            model_name='employer',
+            name='employer_user_created_idx',
+        ),
+        migrations.RunPython(run_on_sqlite(SQLITE_DROP_TRIGGERS), run_on_sqlite(SQLITE_CREATE_TRIGGERS)),
+        migrations.AlterField(
+            model_name='employer',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='employers', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(run_on_sqlite(SQLITE_CREATE_TRIGGERS), run_on_sqlite(SQLITE_DROP_TRIGGERS)),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='employer_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['user', 'email'], name='employer_user_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['user', 'company_name'], name='employer_user_company_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2 on 2026-10-17 23:24
+
+import apps.users.models.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Trigram FTS5 table serving the admin's substring search over users on
+# SQLite, and pg_trgm indexes doing the same on PostgreSQL
+SQLITE_CREATE_SQL = [
+    "CREATE VIRTUAL TABLE users_user_fts USING fts5("
+    "email, name, content='users_user', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER users_user_fts_ai AFTER INSERT ON users_user BEGIN "
+    "INSERT INTO users_user_fts(rowid, email, name) VALUES (new.id, new.email, new.name); END",
+    "CREATE TRIGGER users_user_fts_ad AFTER DELETE ON users_user BEGIN "
+    "INSERT INTO users_user_fts(users_user_fts, rowid, email, name) "
+    "VALUES ('delete', old.id, old.email, old.name); END",
+    "CREATE TRIGGER users_user_fts_au AFTER UPDATE OF email, name ON users_user BEGIN "
+    "INSERT INTO users_user_fts(users_user_fts, rowid, email, name) "
+    "VALUES ('delete', old.id, old.email, old.name); "
+    "INSERT INTO users_user_fts(rowid, email, name) VALUES (new.id, new.email, new.name); END",
+    "INSERT INTO users_user_fts(users_user_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS users_user_fts_au',
+    'DROP TRIGGER IF EXISTS users_user_fts_ad',
+    'DROP TRIGGER IF EXISTS users_user_fts_ai',
+    'DROP TABLE IF EXISTS users_user_fts',
+]
+
+
+def postgres_indexes():
+    from django.contrib.postgres.indexes import GinIndex, OpClass
+    from django.db.models.functions import Upper
+    return [
+        GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=f'user_{field}_trgm_idx')
+        for field in ('email', 'name')
+    ]
+
+
+def forwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        model = apps.get_model('users', 'User')
+        for index in postgres_indexes():
+            schema_editor.add_index(model, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        model = apps.get_model('users', 'User')
+        for index in postgres_indexes():
+            schema_editor.remove_index(model, index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_employer_owner_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+        migrations.CreateModel(
+            name='UserSearchIndex',
+            fields=[
+                ('user', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='user_search_index', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', apps.users.models.search.SearchDocumentField(db_column='users_user_fts')),
+            ],
+            options={
+                'db_table': 'users_user_fts',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+import django.db.models.deletion
+import apps.users.models.search
+from django.db import migrations, models
+
+# Trigram FTS5 table serving the admin's substring search over employers on
+# SQLite. PostgreSQL already has pg_trgm indexes on these columns.
+SQLITE_CREATE_SQL = [
+    "CREATE VIRTUAL TABLE users_employer_trigram USING fts5("
+    "company_name, contact_person_name, email, "
+    "content='users_employer', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER users_employer_trigram_ai AFTER INSERT ON users_employer BEGIN "
+    "INSERT INTO users_employer_trigram(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+    "CREATE TRIGGER users_employer_trigram_ad AFTER DELETE ON users_employer BEGIN "
+    "INSERT INTO users_employer_trigram(users_employer_trigram, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); END",
+    "CREATE TRIGGER users_employer_trigram_au AFTER UPDATE OF company_name, contact_person_name, email "
+    "ON users_employer BEGIN "
+    "INSERT INTO users_employer_trigram(users_employer_trigram, rowid, company_name, contact_person_name, email) "
+    "VALUES ('delete', old.id, old.company_name, old.contact_person_name, old.email); "
+    "INSERT INTO users_employer_trigram(rowid, company_name, contact_person_name, email) "
+    "VALUES (new.id, new.company_name, new.contact_person_name, new.email); END",
+    "INSERT INTO users_employer_trigram(users_employer_trigram) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS users_employer_trigram_au',
+    'DROP TRIGGER IF EXISTS users_employer_trigram_ad',
+    'DROP TRIGGER IF EXISTS users_employer_trigram_ai',
+    'DROP TABLE IF EXISTS users_employer_trigram',
+]
+
+
+def run_on_sqlite(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_user_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(SQLITE_CREATE_SQL), run_on_sqlite(SQLITE_DROP_SQL)),
+        migrations.CreateModel(
+            name='EmployerTrigramIndex',
+            fields=[
+                ('employer', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='trigram_index', serialize=False, to='users.employer')),
+                ('document', apps.users.models.search.SearchDocumentField(db_column='users_employer_trigram')),
+            ],
+            options={
+                'db_table': 'users_employer_trigram',
+                'managed': False,
+            },
+        ),
+    ]
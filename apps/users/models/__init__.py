@@ -1,2 +1,3 @@
 from apps.users.models.user import User
-from apps.users.models.employer import Employer
\ No newline at end of file
+from apps.users.models.employer import Employer
+from apps.users.models.search import EmployerSearchIndex, EmployerTrigramIndex, UserSearchIndex
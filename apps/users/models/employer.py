@@ -6,12 +6,18 @@ from apps.users.models.base import BaseModel
 class Employer(BaseModel):
     """
     Model to represent an employer in the system.
+
+    On SQLite, triggers on this table keep the users_employer_fts and
+    users_employer_trigram search tables in sync. Altering a column makes
+    SQLite rebuild the table, which drops those triggers, so a migration
+    doing so must drop and recreate them around the change, as 0005 does.
     """
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.CASCADE, 
-        related_name='employers'
+        related_name='employers',
+        db_index=False  # covered by the composite indexes below
     )
     company_name = models.CharField(max_length=255)
     contact_person_name = models.CharField(max_length=255)
@@ -23,6 +29,12 @@ class Employer(BaseModel):
         app_label = 'users'
         verbose_name = 'employer'
         verbose_name_plural = 'employers'
+        ordering = ('-created_at', 'id')
+        indexes = [
+            models.Index(fields=['user', '-created_at', 'id'], name='employer_user_created_idx'),
+            models.Index(fields=['user', 'email'], name='employer_user_email_idx'),
+            models.Index(fields=['user', 'company_name'], name='employer_user_company_idx'),
+        ]
 
     def __str__(self):
         return str(self.company_name)
\ No newline at end of file
@@ -0,0 +1,86 @@
+from django.db import models
+from apps.users.models.employer import Employer
+from apps.users.models.user import User
+
+
+class SearchDocumentField(models.TextField):
+    """
+    The hidden column named after an FTS5 table, which full-text queries
+    are matched against.
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+class EmployerSearchIndex(models.Model):
+    """
+    Read-only view of the SQLite FTS5 index over employers.
+
+    The table and the triggers keeping it in sync are created by migration
+    0004. It does not exist on other databases.
+    """
+    employer = models.OneToOneField(
+        Employer,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_index'
+    )
+    document = SearchDocumentField(db_column='users_employer_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        app_label = 'users'
+        managed = False
+        db_table = 'users_employer_fts'
+
+
+class EmployerTrigramIndex(models.Model):
+    """
+    Read-only view of the SQLite FTS5 trigram index over employers, serving
+    the admin's substring search.
+
+    Created by migration 0008. It does not exist on other databases.
+    """
+    employer = models.OneToOneField(
+        Employer,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='trigram_index'
+    )
+    document = SearchDocumentField(db_column='users_employer_trigram')
+
+    class Meta:
+        app_label = 'users'
+        managed = False
+        db_table = 'users_employer_trigram'
+
+
+class UserSearchIndex(models.Model):
+    """
+    Read-only view of the SQLite FTS5 trigram index over users.
+
+    Created by migration 0007. It does not exist on other databases.
+    """
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='user_search_index'
+    )
+    document = SearchDocumentField(db_column='users_user_fts')
+
+    class Meta:
+        app_label = 'users'
+        managed = False
+        db_table = 'users_user_fts'
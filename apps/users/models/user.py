@@ -15,6 +15,19 @@ class UserManager(BaseUserManager):
         user.save(using=self._db)
         return user
 
+    async def acreate_user(self, email, name="", password=None, user_type=None):
+        """ Create and return a user, hashing the password in the hashing pool """
+        from apps.users.hashing import amake_password
+
+        if not email:
+            raise ValueError("Users must have an email address")
+        email = self.normalize_email(email)
+        user = self.model(email=email, name=name, user_type=user_type)
+        user.password = await amake_password(password)
+        user._password = password
+        await user.asave(using=self._db)
+        return user
+
     def create_superuser(self, email, name="", password=None):
         """ Create and return a superuser """
         user = self.create_user(email, name, password, user_type='Admin')
@@ -0,0 +1,38 @@
+import base64
+import json
+from rest_framework.pagination import CursorPagination
+
+
+class EmployerCursorPagination(CursorPagination):
+    """
+    Keyset pagination for employer lists.
+
+    Pages are addressed by an opaque cursor over (created_at, id) rather
+    than an offset, so fetching a deep page costs the same as the first.
+    Search results are ordered by relevance instead.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', 'id')
+        return super().get_ordering(request, queryset, view)
+
+
+def encode_keyset_cursor(value, pk):
+    """Encode a (sort value, id) position as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+
+def decode_keyset_cursor(cursor):
+    """Decode a cursor from encode_keyset_cursor(), raising ValueError if it is invalid"""
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(pk, int):
+        raise ValueError('Invalid cursor')
+    return value, pk
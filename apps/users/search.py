@@ -0,0 +1,118 @@
+"""
+Indexed, ranked search over employers, and indexed substring search over
+users and employers for the admin.
+
+PostgreSQL matches a full-text expression index over the searchable
+employer columns, plus pg_trgm indexes so substring matches (e.g. part of
+an email domain) are indexed too. SQLite matches an FTS5 table that
+triggers keep in sync with users_employer. Both annotate results with
+`search_rank`, where higher is a better match. Other backends fall back to
+unranked icontains.
+
+Admin search keeps Django's case-insensitive substring semantics: pg_trgm
+indexes serve icontains on PostgreSQL, and FTS5 trigram tables on SQLite.
+"""
+import re
+from functools import reduce
+from operator import or_
+from django.db import connections
+from django.db.models import F, Q
+
+SEARCH_FIELDS = ('company_name', 'contact_person_name', 'email')
+SEARCH_CONFIG = 'simple'
+MAX_SEARCH_TERMS = 8
+
+USER_SEARCH_FIELDS = ('email', 'name')
+# Shorter words have no trigram, so the trigram table cannot match them
+MIN_TRIGRAM_LENGTH = 3
+
+
+def search_vector():
+    """
+    The document employers are matched against on PostgreSQL. It must stay
+    the expression migration 0004 indexed, or the index goes unused.
+    """
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector(*SEARCH_FIELDS, config=SEARCH_CONFIG)
+
+
+def search_terms(query):
+    """Split a user query into at most MAX_SEARCH_TERMS lowercase words"""
+    return re.findall(r'\w+', query.lower())[:MAX_SEARCH_TERMS]
+
+
+def search_employers(queryset, query):
+    """
+    Filter an employer queryset to rows matching every word in `query`
+    (each treated as a prefix), annotated with `search_rank`.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _search_postgresql(queryset, query, terms)
+    if vendor == 'sqlite':
+        return _search_sqlite(queryset, terms)
+    return queryset.filter(_substring_match(query))
+
+
+def _substring_match(query):
+    return reduce(or_, (Q(**{f'{field}__icontains': query.strip()}) for field in SEARCH_FIELDS))
+
+
+def _search_postgresql(queryset, query, terms):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+    tsquery = SearchQuery(
+        ' & '.join(f'{term}:*' for term in terms),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
+    return queryset.annotate(
+        search_document=search_vector(),
+        search_rank=SearchRank(search_vector(), tsquery),
+    ).filter(Q(search_document=tsquery) | _substring_match(query))
+
+
+def _search_sqlite(queryset, terms):
+    # Joining the FTS table lets SQLite drive the query from the index and
+    # score every match in the same pass.
+    match = ' '.join(f'"{term}"*' for term in terms)
+    return queryset.filter(search_index__document__match=match).annotate(
+        search_rank=-F('search_index__rank'),
+    )
+
+
+def search_users(queryset, query):
+    """
+    Filter a user queryset to rows where every word of `query` occurs,
+    case-insensitively, somewhere in the email or name, as the admin's
+    icontains search does
+    """
+    return _search_substrings(queryset, query, USER_SEARCH_FIELDS, 'user_search_index')
+
+
+def search_employer_substrings(queryset, query):
+    """
+    Filter an employer queryset to rows where every word of `query` occurs,
+    case-insensitively, somewhere in a searchable column, for the admin
+    """
+    return _search_substrings(queryset, query, SEARCH_FIELDS, 'trigram_index')
+
+
+def _search_substrings(queryset, query, fields, trigram_index):
+    words = query.split()[:MAX_SEARCH_TERMS]
+    if not words:
+        return queryset
+    short = [word for word in words if len(word) < MIN_TRIGRAM_LENGTH]
+    if connections[queryset.db].vendor == 'sqlite' and len(short) < len(words):
+        # Every word is a quoted phrase, and the trigram table matches
+        # them anywhere in any column, case-insensitively
+        match = ' '.join('"{}"'.format(word.replace('"', '""')) for word in words if word not in short)
+        queryset = queryset.filter(**{f'{trigram_index}__document__match': match})
+        words = short
+    for word in words:
+        queryset = queryset.filter(
+            reduce(or_, (Q(**{f'{field}__icontains': word}) for field in fields))
+        )
+    return queryset
@@ -1,2 +1,3 @@
 from apps.users.serializers.user_serializer import UserSerializer, UserDetailSerializer
-from apps.users.serializers.employer_serializer import EmployerSerializer
\ No newline at end of file
+from apps.users.serializers.employer_serializer import EmployerSerializer, EmployerListSerializer, EmployerReadSerializer, EmployerBulkDeleteSerializer
+from apps.users.serializers.token_serializer import BloomTokenRefreshSerializer, BloomTokenBlacklistSerializer, BloomTokenVerifySerializer, TrackedTokenObtainPairSerializer
\ No newline at end of file
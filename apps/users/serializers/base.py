@@ -0,0 +1,48 @@
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
+
+
+def auto_now_fields(model):
+    """Return the names of the model's fields that save() stamps with now()"""
+    return [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+
+
+def apply_changes(instance, attrs):
+    """
+    Set every value in `attrs` that differs from the instance's, and return
+    the update_fields to save them with, or an empty list if none differed.
+    """
+    changed = []
+    for attr, value in attrs.items():
+        if getattr(instance, attr) != value:
+            setattr(instance, attr, value)
+            changed.append(attr)
+    return changed + auto_now_fields(type(instance)) if changed else []
+
+
+class ChangedFieldsUpdateMixin:
+    """
+    ModelSerializer update that saves only the columns whose value changed,
+    plus any auto_now fields, and skips the write when nothing changed.
+    """
+    def update(self, instance, validated_data):
+        raise_errors_on_nested_writes('update', self, validated_data)
+        info = model_meta.get_field_info(instance)
+
+        attrs = {}
+        m2m_fields = []
+        for attr, value in validated_data.items():
+            if attr in info.relations and info.relations[attr].to_many:
+                m2m_fields.append((attr, value))
+            else:
+                attrs[attr] = value
+
+        update_fields = apply_changes(instance, attrs)
+        if update_fields:
+            instance.save(update_fields=update_fields)
+
+        for attr, value in m2m_fields:
+            field = getattr(instance, attr)
+            field.set(value)
+
+        return instance
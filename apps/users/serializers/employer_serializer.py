@@ -1,15 +1,64 @@
+from django.utils import timezone
 from rest_framework import serializers
+from core.metrics import TimedSerializerMixin
 from apps.users.models import Employer
+from apps.users.serializers.base import ChangedFieldsUpdateMixin
+from apps.users.serializers.read import ValuesSerializer
 
 
-class EmployerSerializer(serializers.ModelSerializer):
+class EmployerListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    Writes a batch of employers with bulk_create/bulk_update instead of
+    one INSERT or UPDATE per item.
+    """
+    batch_size = 500
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        employers = [Employer(user=user, **attrs) for attrs in validated_data]
+        return Employer.objects.bulk_create(employers, batch_size=self.batch_size)
+
+    def update(self, instance, validated_data):
+        # Only employers with a changed value are written, and only the
+        # columns that changed in at least one of them
+        now = timezone.now()
+        fields = set()
+        changed = []
+        for employer, attrs in zip(instance, validated_data):
+            employer_fields = {attr for attr, value in attrs.items() if getattr(employer, attr) != value}
+            if employer_fields:
+                for attr in employer_fields:
+                    setattr(employer, attr, attrs[attr])
+                # bulk_update() bypasses auto_now, so updated_at is set explicitly
+                employer.updated_at = now
+                fields.update(employer_fields)
+                changed.append(employer)
+        if changed:
+            Employer.objects.bulk_update(changed, sorted(fields | {'updated_at'}), batch_size=self.batch_size)
+        return instance
+
+
+class EmployerSerializer(ChangedFieldsUpdateMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Employer
         fields = ('id', 'company_name', 'contact_person_name', 'email', 
                   'phone_number', 'address', 'created_at')
         read_only_fields = ('id', 'created_at')
+        list_serializer_class = EmployerListSerializer
     
     def create(self, validated_data):
         # Automatically set the user to the current authenticated user
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class EmployerReadSerializer(TimedSerializerMixin, ValuesSerializer):
+    """
+    Renders employer rows from .values() exactly as EmployerSerializer
+    renders instances, for the list and retrieve endpoints.
+    """
+    serializer_class = EmployerSerializer
+
+
+class EmployerBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
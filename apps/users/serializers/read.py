@@ -0,0 +1,97 @@
+from datetime import datetime
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# to_representation() methods that return a database value unchanged
+IDENTITY_REPRESENTATIONS = {
+    serializers.CharField.to_representation,
+    serializers.IntegerField.to_representation,
+}
+
+
+def datetime_converter(field):
+    """
+    DateTimeField.to_representation with the output format and the active
+    timezone looked up once, rather than for every value
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    to_representation = field.to_representation
+
+    def convert(value):
+        if type(value) is not datetime or value.utcoffset() is None:
+            return to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+class ValuesSerializer:
+    """
+    Read-only counterpart of a ModelSerializer for rows fetched with
+    .values(*columns()).
+
+    Fields are bound once per class rather than per row, and each one is
+    compiled into a converter when `.data` is built: None for fields that
+    would return the database value unchanged, a specialised converter for
+    datetimes, and the field's own to_representation otherwise. The output
+    equals the ModelSerializer's. Subclasses set `serializer_class`, which
+    keeps handling writes.
+    """
+    serializer_class = None
+
+    def __init__(self, instance, many=False):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def get_fields(cls):
+        """Return (name, column, field) for every readable field"""
+        fields = cls.__dict__.get('_fields')
+        if fields is None:
+            fields = []
+            for name, field in cls.serializer_class().fields.items():
+                if field.write_only:
+                    continue
+                if field.source == '*' or '.' in field.source:
+                    raise ImproperlyConfigured(
+                        f"{cls.__name__} cannot read field '{name}' with source '{field.source}' from .values()"
+                    )
+                fields.append((name, field.source, field))
+            cls._fields = fields
+        return fields
+
+    @classmethod
+    def columns(cls):
+        """The columns to pass to .values()"""
+        return [column for _, column, _ in cls.get_fields()]
+
+    def compile(self):
+        """Return (name, column, converter) for every readable field"""
+        compiled = []
+        for name, column, field in self.get_fields():
+            if type(field).to_representation in IDENTITY_REPRESENTATIONS:
+                convert = None
+            elif isinstance(field, serializers.DateTimeField):
+                convert = datetime_converter(field)
+            else:
+                convert = field.to_representation
+            compiled.append((name, column, convert))
+        return compiled
+
+    def to_representation(self, row, compiled=None):
+        return {
+            name: row[column] if convert is None or row[column] is None else convert(row[column])
+            for name, column, convert in compiled or self.compile()
+        }
+
+    @property
+    def data(self):
+        compiled = self.compile()
+        if self.many:
+            return [self.to_representation(row, compiled) for row in self.instance]
+        return self.to_representation(self.instance, compiled)
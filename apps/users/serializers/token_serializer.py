@@ -0,0 +1,43 @@
+from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+from apps.users.last_login import last_login_tracker
+from apps.users.tokens import BloomRefreshToken, is_blacklisted
+
+
+class TrackedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Records last_login through the write-behind tracker, and queues the
+    OutstandingToken through token_store, like LoginView
+    """
+    token_class = BloomRefreshToken
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        last_login_tracker.record(self.user)
+        return data
+
+
+class BloomTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = BloomRefreshToken
+
+
+class BloomTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = BloomRefreshToken
+
+
+class BloomTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        token = UntypedToken(attrs["token"])
+
+        jti = token.get(api_settings.JTI_CLAIM)
+        if api_settings.BLACKLIST_AFTER_ROTATION and jti and is_blacklisted(jti):
+            raise serializers.ValidationError("Token is blacklisted")
+
+        return {}
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from core.metrics import TimedSerializerMixin
+from apps.users.serializers.base import ChangedFieldsUpdateMixin
 
 User = get_user_model()
 
@@ -32,7 +34,7 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True, required=True)
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class UserDetailSerializer(ChangedFieldsUpdateMixin, TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'email', 'name', 'date_joined')
@@ -0,0 +1,44 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from apps.users.authentication import user_cache
+from apps.users.cache import invalidate_employer_cache
+from apps.users.last_login import last_login_tracker
+from apps.users.models import Employer, User
+from apps.users.tokens import blacklist_filter, token_store
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    """Drop the cached authentication snapshot of a changed user"""
+    user_cache.invalidate(instance.pk)
+
+
+# No post_delete receiver: any delete listener makes QuerySet.delete() fetch
+# the rows before deleting them. Code deleting employers invalidates the
+# owner's cache itself.
+@receiver(post_save, sender=Employer)
+def invalidate_employer_responses(sender, instance, **kwargs):
+    """Drop cached employer responses of the owner of a saved employer"""
+    invalidate_employer_cache(instance.user_id)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    """Record a newly blacklisted token in the in-process Bloom filter"""
+    if created:
+        blacklist_filter.add(instance.token.jti)
+
+
+@receiver(request_finished)
+def flush_last_logins(sender, **kwargs):
+    """Write queued last_login timestamps once the oldest has waited long enough"""
+    last_login_tracker.flush_if_due()
+
+
+@receiver(request_finished)
+def flush_token_store(sender, **kwargs):
+    """Insert queued token bookkeeping rows once the oldest has waited long enough"""
+    token_store.flush_if_due()
@@ -0,0 +1,207 @@
+from unittest import mock, skipUnless
+from django.contrib import admin
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.users.admin import EstimatedCountPaginator
+from apps.users.cache import get_employer_cache_version
+from apps.users.models import Employer
+
+User = get_user_model()
+
+
+class AdminTestCase(TestCase):
+    """Base test case logged in as a superuser"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email='admin@example.com',
+            name='Admin User',
+            password='TestPassword123!'
+        )
+        self.client.force_login(self.admin_user)
+
+    def create_employers(self, count, prefix='Company'):
+        users = User.objects.bulk_create([
+            User(email=f'{prefix.lower()}{i}@example.com', name=f'{prefix} Owner {i}')
+            for i in range(count)
+        ])
+        Employer.objects.bulk_create([
+            Employer(
+                user=user,
+                company_name=f'{prefix} {i}',
+                contact_person_name='Contact',
+                email=f'contact{i}@{prefix.lower()}.com',
+                phone_number='1234567890',
+                address='Address'
+            )
+            for i, user in enumerate(users)
+        ])
+
+    def count_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+
+class EmployerAdminTests(AdminTestCase):
+    """Tests for the Employer admin"""
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test that owners are joined in rather than fetched once per row"""
+        url = reverse('admin:users_employer_changelist')
+        self.create_employers(3, 'Small')
+        few = self.count_queries(url)
+        self.create_employers(30, 'Large')
+        self.assertEqual(self.count_queries(url), few)
+
+    def test_changelist_skips_full_count(self):
+        """Test that a filtered changelist counts only the filtered rows"""
+        self.create_employers(5)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:users_employer_changelist'), {'q': 'company 3'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 1)
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+
+    def test_search_matches_substrings(self):
+        """Test that employers are found by any part of a searchable column, ignoring case"""
+        self.create_employers(3)
+        Employer.objects.create(
+            user=self.admin_user,
+            company_name='Acme Company',
+            contact_person_name='Jane Doe',
+            email='jane@acme-corp.com',
+            phone_number='1234567890',
+            address='Address'
+        )
+        url = reverse('admin:users_employer_changelist')
+        for term in ('ompany', 'ACME', 'acme-corp.com', 'jane doe', 'Acme Co'):
+            response = self.client.get(url, {'q': term})
+            self.assertIn('Acme Company', [e.company_name for e in response.context['cl'].result_list], term)
+        response = self.client.get(url, {'q': 'ompany 2'})
+        self.assertEqual([e.company_name for e in response.context['cl'].result_list], ['Company 2'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'Asserts on SQLite query plans')
+    def test_search_uses_trigram_index(self):
+        """Test that changelist search is answered by the trigram index, not a table scan"""
+        self.create_employers(50)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        employer_admin = admin.site._registry[Employer]
+        queryset, _ = employer_admin.get_search_results(None, Employer.objects.all(), 'ontact1')
+        plan = queryset.explain()
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+        self.assertNotRegex(plan, r'SCAN users_employer\b')
+        self.assertEqual(queryset.count(), 11)
+
+    def test_bulk_delete_invalidates_owner_caches(self):
+        """Test that the delete action starts a new cache generation for every owner"""
+        self.create_employers(3)
+        employers = list(Employer.objects.filter(company_name__in=['Company 0', 'Company 1']))
+        versions = {e.user_id: get_employer_cache_version(e.user_id) for e in employers}
+        response = self.client.post(reverse('admin:users_employer_changelist'), {
+            'action': 'delete_selected', 'post': 'yes', '_selected_action': [e.pk for e in employers],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Employer.objects.count(), 1)
+        for user_id, version in versions.items():
+            self.assertNotEqual(get_employer_cache_version(user_id), version)
+
+    def test_change_form_uses_autocomplete(self):
+        """Test that the owner field does not render every user as an option"""
+        self.create_employers(5)
+        employer = Employer.objects.get(company_name='Company 0')
+        response = self.client.get(reverse('admin:users_employer_change', args=[employer.pk]))
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, 'company4@example.com')
+
+    def test_user_autocomplete(self):
+        """Test that the owner autocomplete searches users through the same index"""
+        self.create_employers(5)
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'users', 'model_name': 'employer', 'field_name': 'user', 'term': 'company3',
+        })
+        self.assertEqual([result['text'] for result in response.json()['results']], ['company3@example.com'])
+
+
+class UserAdminTests(AdminTestCase):
+    """Tests for the User admin"""
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test that the user changelist runs a fixed number of queries"""
+        url = reverse('admin:users_user_changelist')
+        self.create_employers(3, 'Small')
+        few = self.count_queries(url)
+        self.create_employers(30, 'Large')
+        self.assertEqual(self.count_queries(url), few)
+
+    def test_search_matches_email_and_name_substrings(self):
+        """Test that users are found by any part of their email or name, ignoring case"""
+        User.objects.create_user(email='John.Smith@Acme-Corp.com', name='John Smith', password='TestPassword123!')
+        self.create_employers(3)
+        url = reverse('admin:users_user_changelist')
+        for term in ('john', 'SMITH', 'acme-corp.com', 'john smith', 'Jo'):
+            response = self.client.get(url, {'q': term})
+            self.assertEqual(
+                [u.email for u in response.context['cl'].result_list], ['John.Smith@acme-corp.com'], term
+            )
+        response = self.client.get(url, {'q': 'Owner 2'})
+        self.assertEqual([u.email for u in response.context['cl'].result_list], ['company2@example.com'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'Asserts on SQLite query plans')
+    def test_search_uses_indexes(self):
+        """Test that user search is answered by the trigram index, not a table scan"""
+        self.create_employers(50)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        user_admin = admin.site._registry[User]
+        queryset, _ = user_admin.get_search_results(None, User.objects.all(), 'company1')
+        plan = queryset.explain()
+        self.assertIn('VIRTUAL TABLE INDEX', plan)
+        self.assertNotRegex(plan, r'SCAN users_user\b')
+        self.assertEqual(queryset.count(), 11)
+
+
+class EstimatedCountPaginatorTests(AdminTestCase):
+    """Tests for planner-estimated changelist counts"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_employers(20)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    @skipUnless(connection.vendor == 'sqlite', 'Reads SQLite planner statistics')
+    def test_unfiltered_count_is_estimated(self):
+        """Test that an unfiltered list takes its count from the statistics"""
+        Employer.objects.filter(company_name='Company 0').delete()
+        with mock.patch.object(EstimatedCountPaginator, 'estimate_threshold', 1):
+            paginator = EstimatedCountPaginator(Employer.objects.all(), 10)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(paginator.count, 20)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+    def test_small_tables_are_counted_exactly(self):
+        """Test that estimates are not used below the threshold"""
+        Employer.objects.filter(company_name='Company 0').delete()
+        self.assertEqual(EstimatedCountPaginator(Employer.objects.all(), 10).count, 19)
+
+    def test_filtered_count_is_exact(self):
+        """Test that a filtered list is always counted exactly"""
+        with mock.patch.object(EstimatedCountPaginator, 'estimate_threshold', 1):
+            paginator = EstimatedCountPaginator(Employer.objects.filter(company_name='Company 1'), 10)
+            self.assertEqual(paginator.count, 1)
+
+    def test_changelist_uses_paginator(self):
+        """Test that both changelists paginate with estimated counts"""
+        request = RequestFactory().get('/')
+        for model in (User, Employer):
+            model_admin = admin.site._registry[model]
+            paginator = model_admin.get_paginator(request, model.objects.order_by('pk'), 100)
+            self.assertIsInstance(paginator, EstimatedCountPaginator)
+            self.assertFalse(model_admin.show_full_result_count)
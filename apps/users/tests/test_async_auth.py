@@ -0,0 +1,110 @@
+import asyncio
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from apps.users.hashing import HashingPool, HashingPoolBusy, hashing_pool
+
+User = get_user_model()
+
+
+def tearDownModule():
+    hashing_pool.shutdown()
+
+
+class HashingPoolTests(TestCase):
+    """Tests for the bounded password hashing pool"""
+
+    def test_run_in_worker(self):
+        """Test that hashing runs in the pool and the queue drains"""
+        pool = HashingPool(max_workers=1, max_pending=4)
+        try:
+            encoded = asyncio.run(pool.run(make_password, 'TestPassword123!'))
+        finally:
+            pool.shutdown()
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$'))
+        self.assertEqual(pool.stats()['queue_depth'], 0)
+        self.assertEqual(pool.stats()['completed'], 1)
+
+    def test_failed_job_is_not_completed(self):
+        """Test that a job raising in the worker is counted as failed, not completed"""
+        pool = HashingPool(max_workers=1, max_pending=4)
+        try:
+            with self.assertRaises(TypeError):
+                asyncio.run(pool.run(make_password, None, None, None, None))
+        finally:
+            pool.shutdown()
+        self.assertEqual(pool.stats()['queue_depth'], 0)
+        self.assertEqual(pool.stats()['completed'], 0)
+        self.assertEqual(pool.stats()['failed'], 1)
+
+    def test_rejects_over_cap(self):
+        """Test that calls beyond max_pending are rejected before hashing"""
+        pool = HashingPool(max_workers=1, max_pending=0)
+        with self.assertRaises(HashingPoolBusy):
+            asyncio.run(pool.run(make_password, 'TestPassword123!'))
+        self.assertEqual(pool.stats()['rejected'], 1)
+
+
+class AsyncAuthViewTests(TestCase):
+    """Tests for the async signup and login endpoints"""
+
+    def setUp(self):
+        self.signup_url = reverse('async-signup')
+        self.login_url = reverse('async-login')
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+
+    def test_signup(self):
+        """Test registering a user through the async endpoint"""
+        response = self.client.post(self.signup_url, {
+            'email': 'new@example.com',
+            'name': 'New User',
+            'password': 'TestPassword123!',
+            'password2': 'TestPassword123!'
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['message'], 'User registered successfully')
+        self.assertTrue(User.objects.get(email='new@example.com').check_password('TestPassword123!'))
+
+    def test_signup_duplicate_email(self):
+        """Test that the async signup still enforces unique emails"""
+        response = self.client.post(self.signup_url, {
+            'email': 'test@example.com',
+            'name': 'Test User',
+            'password': 'TestPassword123!',
+            'password2': 'TestPassword123!'
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.json())
+
+    def test_login_valid_credentials(self):
+        """Test logging in through the async endpoint"""
+        response = self.client.post(self.login_url, {
+            'email': 'test@example.com',
+            'password': 'TestPassword123!'
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh', response.json())
+        self.assertIn('access', response.json())
+
+    def test_login_invalid_credentials(self):
+        """Test that wrong passwords are rejected"""
+        response = self.client.post(self.login_url, {
+            'email': 'test@example.com',
+            'password': 'WrongPassword123!'
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['detail'], 'Invalid Credentials')
+
+    def test_login_malformed_body(self):
+        """Test that a non-JSON body is rejected"""
+        response = self.client.post(self.login_url, 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,232 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.authentication import user_cache
+from apps.users.models import Employer
+
+User = get_user_model()
+
+
+class AsyncEmployerViewTestCase(TestCase):
+    """Base test case for the async employer and profile views"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        self.user2 = User.objects.create_user(
+            email='test2@example.com',
+            name='Test User 2',
+            password='TestPassword123!'
+        )
+        self.employer = Employer.objects.create(
+            user=self.user,
+            company_name='Test Company',
+            contact_person_name='Test Contact',
+            email='company@example.com',
+            phone_number='1234567890',
+            address='123 Test Street, Test City'
+        )
+        self.employer2 = Employer.objects.create(
+            user=self.user2,
+            company_name='Test Company 2',
+            contact_person_name='Test Contact 2',
+            email='company2@example.com',
+            phone_number='9876543210',
+            address='456 Test Avenue, Test City'
+        )
+        self.valid_employer_data = {
+            'company_name': 'New Test Company',
+            'contact_person_name': 'New Contact',
+            'email': 'new@example.com',
+            'phone_number': '5555555555',
+            'address': '789 New Street, New City'
+        }
+        self.list_url = reverse('async-employer-list-create')
+        self.detail_url = reverse('async-employer-detail', kwargs={'pk': self.employer.id})
+        self.detail2_url = reverse('async-employer-detail', kwargs={'pk': self.employer2.id})
+        self.profile_url = reverse('async-profile')
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {access_token}'}
+
+    def get(self, url, data=None):
+        return self.client.get(url, data, headers=self.headers)
+
+    def send(self, method, url, data=None):
+        return getattr(self.client, method)(url, data, content_type='application/json', headers=self.headers)
+
+
+class AsyncAuthenticationTests(AsyncEmployerViewTestCase):
+    """Tests for JWT authentication of the async views"""
+
+    def test_missing_credentials(self):
+        """Test that requests without a token are rejected like the sync views"""
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['detail'], 'Authentication credentials were not provided.')
+        self.assertIn('Bearer', response['WWW-Authenticate'])
+
+    def test_invalid_token(self):
+        """Test that an invalid token is rejected with simplejwt's error body"""
+        response = self.client.get(self.profile_url, headers={'Authorization': 'Bearer not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()['code'], 'token_not_valid')
+
+    def test_user_loaded_once(self):
+        """Test that the user is loaded asynchronously once and then served from the snapshot cache"""
+        with self.assertNumQueries(1):
+            response = self.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['email'], 'test@example.com')
+
+        with self.assertNumQueries(0):
+            self.get(self.profile_url)
+
+    def test_inactive_user_rejected(self):
+        """Test that an inactive user cannot use the async views"""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = self.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncEmployerListCreateViewTests(AsyncEmployerViewTestCase):
+    """Tests for AsyncEmployerListCreateView"""
+
+    def test_list_own_employers(self):
+        """Test that only the user's employers are listed"""
+        response = self.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.json()['results']], [self.employer.id])
+        self.assertIsNone(response.json()['next'])
+
+    def test_list_matches_sync_view(self):
+        """Test that results are serialized exactly like the sync view"""
+        sync_response = self.client.get(reverse('employer-list-create'), headers=self.headers)
+        response = self.get(self.list_url)
+        self.assertEqual(response.json()['results'], sync_response.json()['results'])
+
+    def test_pages_follow_cursor(self):
+        """Test that following next cursors walks every employer exactly once, in order"""
+        Employer.objects.bulk_create([
+            Employer(user=self.user, **dict(self.valid_employer_data, company_name=f'Company {i}'))
+            for i in range(4)
+        ])
+        seen = []
+        response = self.get(self.list_url, {'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['id'] for item in response.json()['results'])
+            if not response.json()['next']:
+                break
+            response = self.get(response.json()['next'])
+
+        expected = list(Employer.objects.filter(user=self.user).values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_search_pages_follow_cursor(self):
+        """Test that ranked search results are paged without repeats"""
+        Employer.objects.bulk_create([
+            Employer(user=self.user, **dict(self.valid_employer_data, company_name=f'Acme {i}'))
+            for i in range(5)
+        ])
+        seen = []
+        response = self.get(self.list_url, {'search': 'acme', 'page_size': 2})
+        while True:
+            seen.extend(item['id'] for item in response.json()['results'])
+            if not response.json()['next']:
+                break
+            response = self.get(response.json()['next'])
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_employer(self):
+        """Test that an employer is created for the current user"""
+        response = self.send('post', self.list_url, self.valid_employer_data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        employer = Employer.objects.get(pk=response.json()['id'])
+        self.assertEqual(employer.user, self.user)
+        self.assertEqual(employer.company_name, 'New Test Company')
+
+    def test_create_invalid_employer(self):
+        """Test that validation errors are reported per field"""
+        response = self.send('post', self.list_url, {'company_name': 'Missing fields'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.json())
+
+
+class AsyncEmployerDetailViewTests(AsyncEmployerViewTestCase):
+    """Tests for AsyncEmployerDetailView"""
+
+    def test_get_own_employer(self):
+        """Test that a user can retrieve their own employer"""
+        response = self.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['company_name'], 'Test Company')
+
+    def test_other_user_employer(self):
+        """Test that another user's employer cannot be read, updated or deleted"""
+        self.assertEqual(self.get(self.detail2_url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.send('patch', self.detail2_url, {'company_name': 'Hijacked'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.send('delete', self.detail2_url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.employer2.refresh_from_db()
+        self.assertEqual(self.employer2.company_name, 'Test Company 2')
+
+    def test_partial_update(self):
+        """Test that a PATCH updates only the given fields"""
+        self.get(self.detail_url)
+        with self.assertNumQueries(2):
+            response = self.send('patch', self.detail_url, {'company_name': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['company_name'], 'Renamed')
+        self.assertEqual(response.json()['address'], '123 Test Street, Test City')
+
+        response = self.client.get(reverse('employer-detail', kwargs={'pk': self.employer.id}), headers=self.headers)
+        self.assertEqual(response.json()['company_name'], 'Renamed')
+
+    def test_full_update_requires_all_fields(self):
+        """Test that a PUT is validated as a full update"""
+        response = self.send('put', self.detail_url, {'company_name': 'Renamed'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.send('put', self.detail_url, self.valid_employer_data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.employer.refresh_from_db()
+        self.assertEqual(self.employer.email, 'new@example.com')
+
+    def test_delete_own_employer(self):
+        """Test that a user can delete their own employer"""
+        self.get(self.detail_url)
+        with self.assertNumQueries(1):
+            response = self.send('delete', self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Employer.objects.filter(pk=self.employer.pk).exists())
+
+
+class AsyncProfileViewTests(AsyncEmployerViewTestCase):
+    """Tests for AsyncProfileView"""
+
+    def test_update_profile(self):
+        """Test that a changed name is saved and a no-op update writes nothing"""
+        self.get(self.profile_url)
+        with self.assertNumQueries(0):
+            response = self.send('patch', self.profile_url, {'name': 'Test User'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.send('patch', self.profile_url, {'name': 'Renamed User', 'email': 'ignored@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Renamed User')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Renamed User')
+        self.assertEqual(self.user.email, 'test@example.com')
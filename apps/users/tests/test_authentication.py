@@ -0,0 +1,93 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.users.authentication import UserSnapshotCache, user_cache
+
+User = get_user_model()
+
+
+class UserSnapshotCacheTests(TestCase):
+    """Tests for the in-process user snapshot cache"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = UserSnapshotCache(max_size=2, ttl=60)
+        cache.set(1, 'one')
+        cache.set(2, 'two')
+        cache.get(1)
+        cache.set(3, 'three')
+
+        self.assertEqual(cache.get(1), 'one')
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.get(3), 'three')
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned"""
+        cache = UserSnapshotCache(max_size=2, ttl=0)
+        cache.set(1, 'one')
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(len(cache), 0)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Tests for authenticating requests from cached user snapshots"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.profile_url = reverse('profile')
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        access_token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+
+    def test_repeat_requests_skip_user_query(self):
+        """Test that only the first authenticated request loads the user"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'test@example.com')
+
+    def test_save_invalidates_snapshot(self):
+        """Test that saving the user drops the cached snapshot"""
+        self.client.get(self.profile_url)
+        self.user.name = 'Renamed User'
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['name'], 'Renamed User')
+
+    def test_inactive_user_rejected(self):
+        """Test that a deactivated user is rejected after invalidation"""
+        self.client.get(self.profile_url)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_writes_only_changes(self):
+        """Test that a no-op profile PATCH makes no queries and a real one a single UPDATE"""
+        self.client.get(self.profile_url)
+
+        with self.assertNumQueries(0):
+            response = self.client.patch(self.profile_url, {'name': 'Test User'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            response = self.client.patch(self.profile_url, {'name': 'Renamed User'}, format='json')
+        self.assertEqual(response.data['name'], 'Renamed User')
+
+        response = self.client.get(self.profile_url)
+        self.assertEqual(response.data['name'], 'Renamed User')
@@ -0,0 +1,22 @@
+from django.test import SimpleTestCase
+from apps.users.benchmarks import percentile, summarize
+
+
+class BenchmarkHelperTests(SimpleTestCase):
+    """Tests for the helpers shared by the bench_* commands"""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles"""
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile(samples, 100), 100)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize_in_milliseconds(self):
+        """Test that summaries report milliseconds and throughput"""
+        summary = summarize([0.01, 0.02, 0.03, 0.04])
+        self.assertEqual(summary['count'], 4)
+        self.assertEqual(summary['p50_ms'], 20.0)
+        self.assertEqual(summary['p99_ms'], 40.0)
+        self.assertEqual(summary['per_second'], 40.0)
@@ -1,4 +1,10 @@
+import csv
+import io
+import json
+from unittest import mock
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -65,6 +71,7 @@ class EmployerViewTestCase(TestCase):
         self.employer_list_url = reverse('employer-list-create')
         self.employer_detail_url = reverse('employer-detail', kwargs={'pk': self.employer.id})
         self.employer2_detail_url = reverse('employer-detail', kwargs={'pk': self.employer2.id})
+        self.employer_export_url = reverse('employer-export')
 
 
 class EmployerListCreateViewTests(EmployerViewTestCase):
@@ -77,8 +84,8 @@ class EmployerListCreateViewTests(EmployerViewTestCase):
         response = self.client.get(self.employer_list_url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # User should only see their own employer
-        self.assertEqual(response.data[0]['company_name'], 'Test Company')
+        self.assertEqual(len(response.data['results']), 1)  # User should only see their own employer
+        self.assertEqual(response.data['results'][0]['company_name'], 'Test Company')
     
     def test_list_employers_unauthenticated(self):
         """Test that unauthenticated users cannot list employers"""
@@ -114,6 +121,157 @@ class EmployerListCreateViewTests(EmployerViewTestCase):
         self.assertEqual(Employer.objects.count(), 2)
 
 
+class EmployerPaginationTests(EmployerViewTestCase):
+    """
+    Test cases for cursor pagination of the employer list
+    """
+    def setUp(self):
+        super().setUp()
+        Employer.objects.bulk_create([
+            Employer(
+                user=self.user,
+                company_name=f'Company {i}',
+                contact_person_name='Contact',
+                email=f'company{i}@example.com',
+                phone_number='1234567890',
+                address='Address'
+            )
+            for i in range(4)
+        ])
+    
+    def test_pages_follow_cursor(self):
+        """Test that following next cursors walks every employer exactly once"""
+        self.client.force_authenticate(user=self.user)
+        seen = []
+        url = f'{self.employer_list_url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        
+        expected = list(
+            Employer.objects.filter(user=self.user)
+            .order_by('-created_at', 'id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+    
+    def test_previous_cursor(self):
+        """Test that the previous cursor returns to the first page"""
+        self.client.force_authenticate(user=self.user)
+        first = self.client.get(f'{self.employer_list_url}?page_size=2')
+        second = self.client.get(first.data['next'])
+        self.assertIsNone(first.data['previous'])
+        
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in back.data['results']],
+            [item['id'] for item in first.data['results']]
+        )
+    
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f'{self.employer_list_url}?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EmployerSearchTests(EmployerViewTestCase):
+    """
+    Test cases for ?search= on the employer list
+    """
+    def setUp(self):
+        super().setUp()
+        self.acme = Employer.objects.create(
+            user=self.user,
+            company_name='Acme Logistics',
+            contact_person_name='Jane Doe',
+            email='jane@acme.example',
+            phone_number='1234567890',
+            address='Address'
+        )
+        self.globex = Employer.objects.create(
+            user=self.user,
+            company_name='Globex',
+            contact_person_name='Acme Liaison',
+            email='liaison@globex.example',
+            phone_number='1234567890',
+            address='Address'
+        )
+        self.client.force_authenticate(user=self.user)
+    
+    def search(self, query, **params):
+        response = self.client.get(self.employer_list_url, {'search': query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+    
+    def test_search_matches_word_prefixes(self):
+        """Test that every word of the query matches as a prefix"""
+        self.assertEqual(self.search('acm log'), [self.acme.id])
+        self.assertEqual(self.search('jan'), [self.acme.id])
+        self.assertEqual(self.search('globex'), [self.globex.id])
+    
+    def test_search_ranks_company_name_first(self):
+        """Test that a company name match ranks above a contact name match"""
+        self.assertEqual(self.search('acme'), [self.acme.id, self.globex.id])
+    
+    def test_search_only_returns_own_employers(self):
+        """Test that another user's employers never match"""
+        self.assertEqual(self.search('company'), [self.employer.id])
+    
+    def test_search_without_words_lists_everything(self):
+        """Test that a blank or punctuation-only query does not filter"""
+        self.assertEqual(len(self.search('  ')), 3)
+        self.assertEqual(len(self.search('"*')), 3)
+    
+    def test_search_follows_writes(self):
+        """Test that updates, bulk updates and deletes are reflected in results"""
+        self.client.patch(
+            reverse('employer-detail', kwargs={'pk': self.globex.id}),
+            {'company_name': 'Initech'},
+            format='json'
+        )
+        self.assertEqual(self.search('initech'), [self.globex.id])
+        
+        self.client.patch(
+            reverse('employer-bulk'),
+            [{'id': self.globex.id, 'company_name': 'Hooli'}],
+            format='json'
+        )
+        self.assertEqual(self.search('initech'), [])
+        self.assertEqual(self.search('hooli'), [self.globex.id])
+        
+        Employer.objects.filter(pk=self.acme.pk).delete()
+        self.assertEqual(self.search('acme'), [self.globex.id])
+    
+    def test_search_results_paginate(self):
+        """Test that cursors walk ranked results without repeats"""
+        Employer.objects.bulk_create([
+            Employer(
+                user=self.user,
+                company_name=f'Acme {i}',
+                contact_person_name='Contact',
+                email=f'acme{i}@example.com',
+                phone_number='1234567890',
+                address='Address'
+            )
+            for i in range(5)
+        ])
+        seen = []
+        response = self.client.get(self.employer_list_url, {'search': 'acme', 'page_size': 2})
+        while True:
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+        self.assertEqual(seen[-1], self.globex.id)
+
+
 class EmployerDetailViewTests(EmployerViewTestCase):
     """
     Test cases for EmployerDetailView (retrieve, update, delete specific employers)
@@ -187,6 +345,92 @@ class EmployerDetailViewTests(EmployerViewTestCase):
         self.assertEqual(Employer.objects.filter(id=self.employer.id).count(), 0)
         self.assertEqual(Employer.objects.count(), 1)
     
+    def test_update_other_user_employer(self):
+        """Test that a user cannot update or delete another user's employer"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(self.employer2_detail_url, {'company_name': 'Hijacked'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        response = self.client.delete(self.employer2_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        self.employer2.refresh_from_db()
+        self.assertEqual(self.employer2.company_name, 'Test Company 2')
+    
+    def test_retrieve_query_count(self):
+        """Test that a retrieve is one owner-scoped SELECT, with no User fetch"""
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.employer_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_update_query_count(self):
+        """Test that an update is the owner-scoped read plus one conditional UPDATE"""
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):
+            response = self.client.patch(self.employer_detail_url, {'company_name': 'Renamed'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.employer.id)
+        self.assertEqual(response.data['company_name'], 'Renamed')
+        self.assertEqual(response.data['address'], '123 Test Street, Test City')
+        
+        previous = self.employer.updated_at
+        self.employer.refresh_from_db()
+        self.assertGreater(self.employer.updated_at, previous)
+    
+    def test_update_without_changes_does_not_write(self):
+        """Test that re-sending the current values leaves the row untouched"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(
+            self.employer_detail_url,
+            {'company_name': 'Test Company', 'email': 'company@example.com'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['company_name'], 'Test Company')
+        
+        previous = self.employer.updated_at
+        self.employer.refresh_from_db()
+        self.assertEqual(self.employer.updated_at, previous)
+        
+        with self.assertNumQueries(1):
+            response = self.client.patch(self.employer_detail_url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_put_writes_only_changed_columns(self):
+        """Test that a PUT changing one field writes only that column and updated_at"""
+        self.client.force_authenticate(user=self.user)
+        payload = EmployerSerializer(self.employer).data
+        payload['company_name'] = 'Renamed'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(self.employer_detail_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"company_name"', updates[0])
+        self.assertNotIn('"address"', updates[0])
+        self.assertNotIn('"email"', updates[0])
+    
+    def test_delete_query_count(self):
+        """Test that a delete is a single conditional DELETE"""
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(1):
+            response = self.client.delete(self.employer_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+    
+    def test_writes_invalidate_cached_reads(self):
+        """Test that a cached retrieve is not served after an update or delete"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.employer_detail_url)
+        self.client.patch(self.employer_detail_url, {'company_name': 'Renamed'}, format='json')
+        response = self.client.get(self.employer_detail_url)
+        self.assertEqual(response.data['company_name'], 'Renamed')
+        
+        self.client.delete(self.employer_detail_url)
+        response = self.client.get(self.employer_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_unauthorized_operations(self):
         """Test that unauthenticated users cannot perform any operations"""
         # GET
@@ -212,4 +456,145 @@ class EmployerDetailViewTests(EmployerViewTestCase):
         # DELETE
         response = self.client.delete(self.employer_detail_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        self.assertEqual(Employer.objects.count(), 2)
\ No newline at end of file
+        self.assertEqual(Employer.objects.count(), 2)
+
+
+class EmployerExportViewTests(EmployerViewTestCase):
+    """
+    Test cases for EmployerExportView (streaming exports)
+    """
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+    
+    def test_export_ndjson(self):
+        """Test that NDJSON export matches the serializer output for own employers"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.employer_export_url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(rows, [EmployerSerializer(self.employer).data])
+    
+    def test_export_csv(self):
+        """Test that CSV export has a header row and one row per employer"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.employer_export_url, {'export_format': 'csv'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['company_name'], 'Test Company')
+        self.assertEqual(rows[0]['created_at'], EmployerSerializer(self.employer).data['created_at'])
+    
+    def test_export_invalid_format(self):
+        """Test that an unknown export format is rejected"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.employer_export_url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_export_unauthenticated(self):
+        """Test that unauthenticated users cannot export employers"""
+        response = self.client.get(self.employer_export_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+class EmployerBulkViewTests(EmployerViewTestCase):
+    """
+    Test cases for EmployerBulkView (batch create, update and delete)
+    """
+    def setUp(self):
+        super().setUp()
+        self.employer_bulk_url = reverse('employer-bulk')
+        self.client.force_authenticate(user=self.user)
+    
+    def test_bulk_create(self):
+        """Test that a batch of employers is created with a fixed number of queries"""
+        payload = [dict(self.valid_employer_data, company_name=f'Bulk {i}') for i in range(20)]
+        with self.assertNumQueries(3):  # SAVEPOINT, INSERT, RELEASE
+            response = self.client.post(self.employer_bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertTrue(all(item['id'] for item in response.data))
+        self.assertEqual(Employer.objects.filter(user=self.user).count(), 21)
+    
+    def test_bulk_create_reports_errors_per_item(self):
+        """Test that one invalid item rejects the batch and is reported by position"""
+        payload = [self.valid_employer_data, {'company_name': 'Missing fields'}]
+        response = self.client.post(self.employer_bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('email', response.data[1])
+        self.assertEqual(Employer.objects.count(), 2)
+    
+    def test_bulk_partial_update(self):
+        """Test that a batch of partial updates is applied"""
+        other = Employer.objects.create(user=self.user, **self.valid_employer_data)
+        payload = [
+            {'id': self.employer.id, 'company_name': 'Renamed 1'},
+            {'id': other.id, 'phone_number': '0000000000'},
+        ]
+        response = self.client.patch(self.employer_bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.employer.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.employer.company_name, 'Renamed 1')
+        self.assertEqual(other.phone_number, '0000000000')
+        self.assertEqual(other.company_name, 'New Test Company')
+    
+    def test_bulk_update_skips_unchanged_employers(self):
+        """Test that items whose values did not change are not written"""
+        other = Employer.objects.create(user=self.user, **self.valid_employer_data)
+        payload = [
+            {'id': self.employer.id, 'company_name': 'Test Company'},
+            {'id': other.id, 'company_name': 'Renamed'},
+        ]
+        response = self.client.patch(self.employer_bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        previous = self.employer.updated_at, other.updated_at
+        self.employer.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.employer.updated_at, previous[0])
+        self.assertGreater(other.updated_at, previous[1])
+        self.assertEqual(other.company_name, 'Renamed')
+    
+    def test_bulk_update_other_user_employer(self):
+        """Test that employers of another user cannot be updated in a batch"""
+        payload = [
+            {'id': self.employer.id, 'company_name': 'Renamed'},
+            {'id': self.employer2.id, 'company_name': 'Hijacked'},
+        ]
+        response = self.client.patch(self.employer_bulk_url, payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('id', response.data[1])
+        self.employer.refresh_from_db()
+        self.assertEqual(self.employer.company_name, 'Test Company')
+    
+    def test_bulk_delete(self):
+        """Test that only the user's own employers are deleted"""
+        response = self.client.delete(
+            self.employer_bulk_url,
+            {'ids': [self.employer.id, self.employer2.id]},
+            format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertFalse(Employer.objects.filter(id=self.employer.id).exists())
+        self.assertTrue(Employer.objects.filter(id=self.employer2.id).exists())
+    
+    def test_bulk_delete_query_count(self):
+        """Test that a bulk delete is a single DELETE that invalidates the cache once"""
+        Employer.objects.create(user=self.user, company_name='Second', email='second@example.com')
+        ids = list(Employer.objects.filter(user=self.user).values_list('id', flat=True))
+        with mock.patch('apps.users.views.employer.invalidate_employer_cache') as invalidate:
+            with self.assertNumQueries(1):
+                response = self.client.delete(self.employer_bulk_url, {'ids': ids}, format='json')
+        self.assertEqual(response.data['deleted'], 2)
+        invalidate.assert_called_once_with(self.user.pk)
@@ -0,0 +1,144 @@
+import tempfile
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.users.cache import get_employer_cache_version
+from apps.users.models import Employer
+
+User = get_user_model()
+
+
+class EmployerConditionalGetTests(TestCase):
+    """Tests for ETag / Last-Modified handling on employer reads"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        self.employer = Employer.objects.create(
+            user=self.user,
+            company_name='Test Company',
+            contact_person_name='Test Contact',
+            email='company@example.com',
+            phone_number='1234567890',
+            address='123 Test Street, Test City'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.employer_list_url = reverse('employer-list-create')
+        self.employer_detail_url = reverse('employer-detail', kwargs={'pk': self.employer.id})
+
+    def test_list_sets_validators(self):
+        """Test that the list response carries an ETag but no Last-Modified"""
+        response = self.client.get(self.employer_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'])
+        self.assertNotIn('Last-Modified', response)
+
+    def test_list_delete_is_not_hidden_by_if_modified_since(self):
+        """Test that deleting a row that is not the newest still changes the list"""
+        Employer.objects.create(user=self.user, company_name='Newer', email='newer@example.com')
+        etag = self.client.get(self.employer_list_url)['ETag']
+        self.client.delete(self.employer_detail_url)
+
+        # Any date at or after the newest updated_at used to answer 304
+        since = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        response = self.client.get(self.employer_list_url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(self.employer_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_repeat_poll_is_served_from_cache(self):
+        """Test that an unchanged repeat poll returns 304 without touching the DB"""
+        etag = self.client.get(self.employer_list_url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.employer_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_cold_cache_poll_runs_only_aggregate(self):
+        """Test that a 304 on a cold cache costs a single aggregate query"""
+        etag = self.client.get(self.employer_list_url)['ETag']
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.employer_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_change_invalidates_list(self):
+        """Test that updating an employer changes the list ETag and payload"""
+        etag = self.client.get(self.employer_list_url)['ETag']
+        self.client.patch(self.employer_detail_url, {'company_name': 'Renamed'}, format='json')
+
+        response = self.client.get(self.employer_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['company_name'], 'Renamed')
+
+    def test_bulk_write_invalidates_list(self):
+        """Test that bulk writes, which skip model signals, still invalidate"""
+        etag = self.client.get(self.employer_list_url)['ETag']
+        payload = [{
+            'company_name': 'Bulk Company',
+            'contact_person_name': 'Contact',
+            'email': 'bulk@example.com',
+            'phone_number': '5555555555',
+            'address': 'Address'
+        }]
+        self.client.post(reverse('employer-bulk'), payload, format='json')
+
+        response = self.client.get(self.employer_list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_detail_not_modified(self):
+        """Test that the detail endpoint honours If-None-Match"""
+        etag = self.client.get(self.employer_detail_url)['ETag']
+
+        response = self.client.get(self.employer_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_delete_invalidates_detail(self):
+        """Test that an employer deleted in the admin is not served from the cache"""
+        self.client.get(self.employer_detail_url)
+        admin_client = Client()
+        admin_client.force_login(User.objects.create_superuser(
+            email='admin@example.com', name='Admin', password='TestPassword123!'
+        ))
+        admin_client.post(reverse('admin:users_employer_delete', args=[self.employer.pk]), {'post': 'yes'})
+
+        response = self.client.get(self.employer_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_is_per_user(self):
+        """Test that cached payloads are never shared between users"""
+        self.client.get(self.employer_list_url)
+        other = User.objects.create_user(email='other@example.com', name='Other', password='TestPassword123!')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(self.employer_list_url)
+        self.assertEqual(response.data['results'], [])
+
+    def test_default_shared_tier_reaches_other_processes(self):
+        """Test that a write in one process invalidates the responses another process cached"""
+        self.assertEqual(settings.CACHE_BACKEND, 'file')
+        with tempfile.TemporaryDirectory() as location:
+            shared = {'BACKEND': settings.SHARED_CACHE_BACKENDS['file'][0], 'LOCATION': location}
+            with override_settings(CACHES={**settings.CACHES, 'shared': shared}):
+                version = get_employer_cache_version(self.user.pk)
+                # A second backend instance on the same directory stands in for another worker
+                other_process = FileBasedCache(location, {})
+                self.assertEqual(other_process.get(f'employers:{self.user.pk}:version'), version)
+
+                self.client.patch(self.employer_detail_url, {'company_name': 'Renamed'}, format='json')
+                self.assertNotEqual(other_process.get(f'employers:{self.user.pk}:version'), version)
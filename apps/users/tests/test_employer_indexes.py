@@ -0,0 +1,74 @@
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from apps.users.models import Employer
+from apps.users.pagination import EmployerCursorPagination
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Asserts on SQLite query plans')
+class EmployerIndexTests(TestCase):
+    """Tests that owner-scoped employer queries are answered from an index"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        other = User.objects.create_user(
+            email='other@example.com',
+            name='Other User',
+            password='TestPassword123!'
+        )
+        Employer.objects.bulk_create([
+            Employer(
+                user=user,
+                company_name=f'Company {i}',
+                contact_person_name='Contact',
+                email=f'company{i}@example.com',
+                phone_number='1234567890',
+                address='Address'
+            )
+            for user in (cls.user, other)
+            for i in range(50)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertIndexUsed(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index}', plan)
+        self.assertNotIn('SCAN users_employer', plan)
+        return plan
+
+    def test_list_uses_owner_created_index(self):
+        """Test that a list page is read in index order with no sort step"""
+        queryset = Employer.objects.filter(user=self.user).order_by(*EmployerCursorPagination.ordering)[:51]
+        plan = self.assertIndexUsed(queryset, 'employer_user_created_idx')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_default_ordering_uses_owner_created_index(self):
+        """Test that the model's default ordering matches the index"""
+        plan = self.assertIndexUsed(Employer.objects.filter(user=self.user), 'employer_user_created_idx')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_lookup_by_email_uses_index(self):
+        """Test that an owner-scoped email lookup uses the (user, email) index"""
+        queryset = Employer.objects.filter(user=self.user, email='company7@example.com')
+        self.assertIndexUsed(queryset, 'employer_user_email_idx')
+
+    def test_lookup_by_company_name_uses_index(self):
+        """Test that an owner-scoped company lookup uses the (user, company_name) index"""
+        queryset = Employer.objects.filter(user=self.user, company_name='Company 7')
+        self.assertIndexUsed(queryset, 'employer_user_company_idx')
+
+    def test_lookup_by_pk_uses_primary_key(self):
+        """Test that the detail lookup is a primary key search"""
+        employer = Employer.objects.filter(user=self.user).first()
+        plan = Employer.objects.filter(user=self.user, pk=employer.pk).explain()
+        self.assertIn('INTEGER PRIMARY KEY', plan)
+        self.assertNotIn('SCAN users_employer', plan)
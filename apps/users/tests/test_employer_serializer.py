@@ -1,8 +1,17 @@
+import zoneinfo
+from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIRequestFactory
 from django.contrib.auth import get_user_model
 from apps.users.models.employer import Employer
-from apps.users.serializers.employer_serializer import EmployerSerializer
+from apps.users.serializers.employer_serializer import EmployerReadSerializer, EmployerSerializer
+from apps.users.serializers.read import ValuesSerializer
 
 User = get_user_model()
 
@@ -73,4 +82,106 @@ class EmployerSerializerTests(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('contact_person_name', serializer.errors)
         self.assertIn('phone_number', serializer.errors)
-        self.assertIn('address', serializer.errors)
\ No newline at end of file
+        self.assertIn('address', serializer.errors)
+    
+    def test_employer_serializer_update_writes_changed_columns(self):
+        """Test that an update writes only the changed columns plus updated_at"""
+        serializer = EmployerSerializer(
+            instance=self.employer,
+            data={'company_name': 'Renamed Company', 'email': self.employer.email},
+            partial=True
+        )
+        self.assertTrue(serializer.is_valid())
+        
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertIn('"company_name"', sql)
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"address"', sql)
+        self.assertNotIn('"email"', sql)
+        self.employer.refresh_from_db()
+        self.assertEqual(self.employer.company_name, 'Renamed Company')
+    
+    def test_employer_serializer_update_skips_unchanged(self):
+        """Test that an update with no changed values does not write"""
+        serializer = EmployerSerializer(instance=self.employer, data={
+            'company_name': self.employer.company_name,
+            'contact_person_name': self.employer.contact_person_name,
+            'email': self.employer.email,
+            'phone_number': self.employer.phone_number,
+            'address': self.employer.address,
+        })
+        self.assertTrue(serializer.is_valid())
+        
+        with self.assertNumQueries(0):
+            serializer.save()
+
+
+class EmployerReadSerializerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        Employer.objects.bulk_create([
+            Employer(
+                user=self.user,
+                company_name=name,
+                contact_person_name='Jane Smith',
+                email=f'contact{i}@example.com',
+                phone_number='0987654321',
+                address='456 Existing Street\nExisting City',
+                created_at=timezone.now() - timedelta(days=i, microseconds=i * 1001),
+            )
+            for i, name in enumerate(['Plain Company', 'Café Ünïcode', 'Quote " Back\\slash', '中文公司'])
+        ])
+        self.queryset = Employer.objects.filter(user=self.user)
+
+    def render_both(self, queryset, many=True):
+        rows = queryset.values(*EmployerReadSerializer.columns())
+        if not many:
+            rows, queryset = rows.get(), queryset.get()
+        return (
+            JSONRenderer().render(EmployerReadSerializer(rows, many=many).data),
+            JSONRenderer().render(EmployerSerializer(queryset, many=many).data),
+        )
+
+    def test_columns_match_serializer_fields(self):
+        """Test that the read serializer selects exactly EmployerSerializer's readable fields"""
+        self.assertEqual(EmployerReadSerializer.columns(), list(EmployerSerializer.Meta.fields))
+
+    def test_list_output_identical(self):
+        """Test that a list renders to the same bytes as EmployerSerializer"""
+        fast, baseline = self.render_both(self.queryset)
+        self.assertEqual(fast, baseline)
+
+    def test_single_output_identical(self):
+        """Test that a single row renders to the same bytes as EmployerSerializer"""
+        for employer in self.queryset:
+            fast, baseline = self.render_both(self.queryset.filter(pk=employer.pk), many=False)
+            self.assertEqual(fast, baseline)
+
+    def test_output_identical_in_other_timezone(self):
+        """Test that timestamps follow the active timezone like DateTimeField"""
+        with timezone.override(zoneinfo.ZoneInfo('Asia/Kolkata')):
+            fast, baseline = self.render_both(self.queryset)
+        self.assertEqual(fast, baseline)
+        self.assertIn(b'+05:30', fast)
+
+    def test_nested_source_rejected(self):
+        """Test that fields which cannot be read from .values() are refused"""
+        class NestedSerializer(EmployerSerializer):
+            owner = serializers.CharField(source='user.email')
+
+            class Meta(EmployerSerializer.Meta):
+                fields = EmployerSerializer.Meta.fields + ('owner',)
+
+        class NestedReadSerializer(ValuesSerializer):
+            serializer_class = NestedSerializer
+
+        with self.assertRaises(ImproperlyConfigured):
+            NestedReadSerializer.columns()
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from apps.users.hashing import verify_password
+
+User = get_user_model()
+
+LOW_COST_PROFILES = dict(
+    settings.PASSWORD_HASHER_PROFILES,
+    pbkdf2={
+        'hasher': 'apps.users.hashers.TunablePBKDF2PasswordHasher',
+        'params': {'iterations': 1000},
+    },
+)
+
+
+class PasswordUpgradeTests(TestCase):
+    """Tests for re-hashing outdated password hashes on login"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+
+    def iterations(self, encoded):
+        return identify_hasher(encoded).decode(encoded)['iterations']
+
+    @override_settings(PASSWORD_HASHER_PROFILES=LOW_COST_PROFILES)
+    def test_login_upgrades_outdated_hash(self):
+        """Test that logging in re-hashes with the current profile's cost"""
+        # Changing PASSWORD_HASHERS rebuilds the hasher instances
+        with self.settings(PASSWORD_HASHERS=list(settings.PASSWORD_HASHERS)):
+            response = self.client.post(reverse('login'), {
+                'email': 'test@example.com',
+                'password': 'TestPassword123!'
+            }, format='json')
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.user.refresh_from_db()
+            self.assertEqual(self.iterations(self.user.password), 1000)
+            self.assertTrue(self.user.check_password('TestPassword123!'))
+
+    def test_login_keeps_current_hash(self):
+        """Test that an up-to-date hash is not rewritten"""
+        encoded = self.user.password
+        self.client.post(reverse('login'), {
+            'email': 'test@example.com',
+            'password': 'TestPassword123!'
+        }, format='json')
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, encoded)
+
+    @override_settings(PASSWORD_HASHER_PROFILES=LOW_COST_PROFILES)
+    def test_verify_password_returns_upgraded_hash(self):
+        """Test the helper used by the async login path"""
+        with self.settings(PASSWORD_HASHERS=list(settings.PASSWORD_HASHERS)):
+            is_correct, upgraded = verify_password('TestPassword123!', self.user.password)
+            self.assertTrue(is_correct)
+            self.assertEqual(self.iterations(upgraded), 1000)
+
+            is_correct, upgraded = verify_password('WrongPassword123!', self.user.password)
+            self.assertFalse(is_correct)
+            self.assertIsNone(upgraded)
@@ -0,0 +1,205 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.users.authentication import user_cache
+from apps.users.flushing import BackgroundFlusher
+from apps.users.last_login import LastLoginTracker, last_login_tracker
+
+User = get_user_model()
+
+
+class LastLoginTrackerTests(TestCase):
+    """Tests for write-behind last_login updates"""
+
+    def setUp(self):
+        self.tracker = LastLoginTracker(resolution=60, flush_interval=5, batch_size=2)
+        self.addCleanup(self.tracker.flusher.stop)
+        self.users = [
+            User.objects.create_user(email=f'user{i}@example.com', name=f'User {i}', password='TestPassword123!')
+            for i in range(3)
+        ]
+        self.now = timezone.now()
+
+    def test_recent_login_is_skipped(self):
+        """Test that a login close to the stored last_login is not written"""
+        user = self.users[0]
+        User.objects.filter(pk=user.pk).update(last_login=self.now - timedelta(seconds=30))
+        user.refresh_from_db()
+        self.tracker.record(user, self.now)
+        self.assertEqual(self.tracker.flush(), 0)
+        self.assertEqual(self.tracker.stats()['writes_avoided'], 1)
+
+    def test_flush_batches_pending_logins(self):
+        """Test that queued logins are written together with bulk_update"""
+        for user in self.users:
+            self.tracker.record(user, self.now)
+        self.assertIsNone(User.objects.get(pk=self.users[0].pk).last_login)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.tracker.flush(), 3)
+        updates = [query for query in queries if query['sql'].startswith('UPDATE')]
+        # Two batches of batch_size=2
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(User.objects.filter(last_login=self.now).count(), 3)
+
+    def test_logins_of_one_user_coalesce(self):
+        """Test that several logins of one user before a flush become one write"""
+        user = self.users[0]
+        self.tracker.record(user, self.now)
+        self.tracker.record(user, self.now + timedelta(seconds=10))
+        self.tracker.record(user, self.now + timedelta(minutes=2))
+        self.assertEqual(self.tracker.flush(), 1)
+        user.refresh_from_db()
+        self.assertEqual(user.last_login, self.now + timedelta(minutes=2))
+        stats = self.tracker.stats()
+        self.assertEqual((stats['skipped'], stats['coalesced'], stats['written']), (1, 1, 1))
+
+    def test_flush_invalidates_user_snapshot(self):
+        """Test that a written last_login is not hidden by a cached snapshot"""
+        user = self.users[0]
+        user_cache.set(user.pk, ('default', (), ()))
+        self.tracker.record(user, self.now)
+        self.tracker.flush()
+        self.assertIsNone(user_cache.get(user.pk))
+
+    def test_flush_when_due(self):
+        """Test that pending logins are flushed only once the oldest has waited flush_interval"""
+        clock = [100.0]
+        with mock.patch('apps.users.last_login.time.monotonic', lambda: clock[0]):
+            self.tracker.record(self.users[0], self.now)
+            clock[0] += 4
+            self.tracker.flush_if_due()
+            self.assertEqual(self.tracker.stats()['pending'], 1)
+            clock[0] += 1
+            self.tracker.flush_if_due()
+        self.assertEqual(self.tracker.stats()['pending'], 0)
+        self.assertEqual(User.objects.get(pk=self.users[0].pk).last_login, self.now)
+
+    def test_synchronous_mode(self):
+        """Test that flush_interval <= 0 writes every login immediately"""
+        tracker = LastLoginTracker(flush_interval=0)
+        tracker.record(self.users[0], self.now)
+        self.assertEqual(User.objects.get(pk=self.users[0].pk).last_login, self.now)
+        self.assertIsNone(tracker.flusher._thread)
+
+    def test_reads_settings_on_use(self):
+        """Test that options not passed in follow the settings, including overrides"""
+        tracker = LastLoginTracker(batch_size=2)
+        with override_settings(LAST_LOGIN_FLUSH_INTERVAL=7, LAST_LOGIN_BATCH_SIZE=9):
+            self.assertEqual(tracker.flush_interval, 7)
+            self.assertEqual(tracker.batch_size, 2)
+            self.assertEqual(last_login_tracker.flush_interval, 7)
+
+    def test_record_starts_background_flusher(self):
+        """Test that queueing a login starts the flush thread"""
+        with mock.patch.object(self.tracker.flusher, 'ensure_started') as ensure_started:
+            self.tracker.record(self.users[0], self.now)
+        ensure_started.assert_called_once_with()
+
+
+class FakeBuffer:
+    """Counts flushes, optionally failing them"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.flushes = 0
+        self.flushed = threading.Event()
+
+    def flush(self):
+        self.flushes += 1
+        self.flushed.set()
+        if self.error:
+            raise self.error
+
+
+class BackgroundFlusherTests(SimpleTestCase):
+    """Tests for the flush thread behind the write-behind buffers"""
+
+    def test_flushes_periodically(self):
+        """Test that the thread flushes without any request finishing"""
+        buffer = FakeBuffer()
+        flusher = BackgroundFlusher(buffer, 0.01)
+        self.addCleanup(flusher.stop)
+        flusher.ensure_started()
+        flusher.ensure_started()
+        self.assertTrue(buffer.flushed.wait(5))
+        self.assertEqual(len([t for t in threading.enumerate() if t.name == 'FakeBuffer-flusher']), 1)
+
+    def test_errors_do_not_stop_the_thread(self):
+        """Test that a failed flush is retried on the next tick"""
+        buffer = FakeBuffer(DatabaseError('locked'))
+        flusher = BackgroundFlusher(buffer, 0.01)
+        self.addCleanup(flusher.stop)
+        flusher.ensure_started()
+        self.assertTrue(buffer.flushed.wait(5))
+        buffer.flushed.clear()
+        self.assertTrue(buffer.flushed.wait(5))
+
+    def test_flush_at_exit(self):
+        """Test that the exit handler flushes what is still queued and stops the thread"""
+        buffer = FakeBuffer()
+        flusher = BackgroundFlusher(buffer, 60)
+        self.addCleanup(flusher.stop)
+        with mock.patch('apps.users.flushing.atexit.register') as register:
+            flusher.ensure_started()
+        register.assert_called_once_with(flusher.flush_at_exit)
+        flusher.flush_at_exit()
+        self.assertEqual(buffer.flushes, 1)
+        self.assertTrue(flusher._stopped.is_set())
+
+
+@override_settings(LAST_LOGIN_FLUSH_INTERVAL=5)
+class LastLoginViewTests(TestCase):
+    """Tests for last_login on both login paths"""
+
+    def setUp(self):
+        # The tests flush explicitly, without the background thread
+        patcher = mock.patch.object(last_login_tracker.flusher, 'ensure_started')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(last_login_tracker.reset)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        self.credentials = {'email': 'test@example.com', 'password': 'TestPassword123!'}
+
+    def test_login_paths_record_last_login(self):
+        """Test that LoginView and /api/token/ both queue last_login, without an UPDATE"""
+        for url in (reverse('login'), reverse('token_obtain_pair')):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, self.credentials, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(any(
+                query['sql'].startswith('UPDATE') and 'last_login' in query['sql'] for query in queries
+            ))
+        # The second login is within LAST_LOGIN_RESOLUTION of the first
+        self.assertEqual(last_login_tracker.stats()['skipped'], 1)
+
+        last_login_tracker.flush()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    def test_async_login_records_last_login(self):
+        """Test that the async login queues last_login too"""
+        response = self.client.post(reverse('async-login'), self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(last_login_tracker.stats()['pending'], 1)
+
+    def test_request_finished_flushes_due_logins(self):
+        """Test that a request finishing after flush_interval writes the queue"""
+        last_login_tracker.record(self.user)
+        with mock.patch.object(last_login_tracker, 'flush_interval', 0):
+            self.client.get(reverse('login'))
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
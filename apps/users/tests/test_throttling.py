@@ -0,0 +1,195 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from apps.users.throttling import LoginLimiter, login_limiter, parse_rate
+
+User = get_user_model()
+
+
+class CountingCache:
+    """Wraps a cache and counts calls per method"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.calls = []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return getattr(self.cache, name)
+
+
+@override_settings(LOGIN_THROTTLE_CACHE='default')
+class LoginLimiterTests(TestCase):
+    """Tests for the token buckets and lockout of LoginLimiter"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+        patcher = mock.patch('apps.users.throttling.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_parse_rate(self):
+        """Test that DRF-style rates are parsed into (capacity, seconds)"""
+        self.assertEqual(parse_rate('10/min'), (10, 60))
+        self.assertEqual(parse_rate('100/hour'), (100, 3600))
+        self.assertIsNone(parse_rate(None))
+
+    def test_ip_bucket_empties_and_refills(self):
+        """Test that an IP gets `capacity` attempts, then one per refill interval"""
+        limiter = LoginLimiter(ip_rate='3/min', email_rate=None)
+        for i in range(3):
+            self.assertTrue(limiter.check('10.0.0.1', f'user{i}@example.com').allowed)
+
+        attempt = limiter.check('10.0.0.1', 'other@example.com')
+        self.assertFalse(attempt.allowed)
+        self.assertAlmostEqual(attempt.wait, 20)
+        self.assertTrue(limiter.check('10.0.0.2', 'other@example.com').allowed)
+
+        self.now += 20
+        self.assertTrue(limiter.check('10.0.0.1', 'other@example.com').allowed)
+        self.assertFalse(limiter.check('10.0.0.1', 'other@example.com').allowed)
+
+    def test_email_bucket_is_shared_across_ips(self):
+        """Test that spreading attempts on one email over many IPs does not help"""
+        limiter = LoginLimiter(ip_rate='100/min', email_rate='2/min')
+        self.assertTrue(limiter.check('10.0.0.1', 'test@example.com').allowed)
+        self.assertTrue(limiter.check('10.0.0.2', 'test@example.com').allowed)
+        self.assertFalse(limiter.check('10.0.0.3', 'test@example.com').allowed)
+
+    def test_lockout_backs_off_exponentially(self):
+        """Test that consecutive failures lock the email for 1, 2, 4... seconds"""
+        limiter = LoginLimiter(ip_rate=None, email_rate=None, lockout_threshold=3, lockout_base=1)
+        for _ in range(2):
+            limiter.check('10.0.0.1', 'test@example.com').failed()
+        attempt = limiter.check('10.0.0.1', 'test@example.com')
+        self.assertTrue(attempt.allowed)
+        attempt.failed()
+
+        self.assertAlmostEqual(limiter.check('10.0.0.1', 'test@example.com').wait, 1)
+        self.now += 1
+        limiter.check('10.0.0.1', 'test@example.com').failed()
+        self.assertAlmostEqual(limiter.check('10.0.0.1', 'test@example.com').wait, 2)
+        self.assertTrue(limiter.check('10.0.0.1', 'other@example.com').allowed)
+
+    def test_lockout_is_capped(self):
+        """Test that the lockout never exceeds lockout_max"""
+        limiter = LoginLimiter(ip_rate=None, email_rate=None, lockout_threshold=1, lockout_max=60)
+        for _ in range(20):
+            self.now += 60
+            limiter.check('10.0.0.1', 'test@example.com').failed()
+        self.assertAlmostEqual(limiter.check('10.0.0.1', 'test@example.com').wait, 60)
+
+    def test_success_clears_failures(self):
+        """Test that a correct password resets the failure count"""
+        limiter = LoginLimiter(ip_rate=None, email_rate=None, lockout_threshold=2)
+        limiter.check('10.0.0.1', 'test@example.com').failed()
+        limiter.check('10.0.0.1', 'test@example.com').succeeded()
+        limiter.check('10.0.0.1', 'test@example.com').failed()
+        self.assertTrue(limiter.check('10.0.0.1', 'test@example.com').allowed)
+
+    def test_constant_cache_operations(self):
+        """Test that a check is one get_many and at most one set_many"""
+        limiter = LoginLimiter()
+        cache = CountingCache(limiter.cache)
+        with mock.patch.object(LoginLimiter, 'cache', cache):
+            limiter.check('10.0.0.1', 'test@example.com').failed()
+            self.assertEqual(cache.calls, ['get_many', 'set_many', 'set_many'])
+
+    def test_rejections_count_saved_hashes(self):
+        """Test that throttled and locked-out attempts are counted as saved hashes"""
+        limiter = LoginLimiter(ip_rate='1/min', email_rate=None, lockout_threshold=1)
+        limiter.check('10.0.0.1', 'test@example.com').failed()
+        limiter.check('10.0.0.1', 'test@example.com')
+        limiter.check('10.0.0.1', 'other@example.com')
+        self.assertEqual(limiter.stats(), {'allowed': 1, 'throttled': 1, 'locked_out': 1, 'hashes_saved': 2})
+
+
+@override_settings(LOGIN_THROTTLE_CACHE='default')
+class LoginThrottleViewTests(TestCase):
+    """Tests for throttling the login endpoints"""
+
+    def setUp(self):
+        login_limiter.cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+        self.wrong_password = {'email': 'test@example.com', 'password': 'WrongPassword123!'}
+
+    def test_lockout_skips_password_check(self):
+        """Test that a locked-out email is rejected with 429 before the password is hashed"""
+        for _ in range(login_limiter.lockout_threshold):
+            response = self.client.post(reverse('login'), self.wrong_password, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with mock.patch.object(User, 'check_password') as check_password:
+            response = self.client.post(reverse('login'), {
+                'email': 'TEST@example.com', 'password': 'TestPassword123!'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        check_password.assert_not_called()
+
+    def test_token_obtain_pair_throttled(self):
+        """Test that /api/token/ shares the login lockout"""
+        for _ in range(login_limiter.lockout_threshold):
+            response = self.client.post(reverse('token_obtain_pair'), self.wrong_password, format='json')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.post(reverse('login'), self.wrong_password, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_async_login_throttled(self):
+        """Test that the async login is rejected before reaching the hashing pool"""
+        for _ in range(login_limiter.lockout_threshold):
+            self.client.post(reverse('async-login'), self.wrong_password, format='json')
+
+        with mock.patch('apps.users.views.async_auth.averify_password') as averify_password:
+            response = self.client.post(reverse('async-login'), self.wrong_password, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.json()['detail'], 'Request was throttled. Expected available in 1 second.')
+        averify_password.assert_not_called()
+
+    @override_settings(LOGIN_THROTTLE_IP_RATE='2/min', LOGIN_THROTTLE_EMAIL_RATE=None)
+    def test_forwarded_for_is_not_trusted(self):
+        """Test that a new X-Forwarded-For value on each attempt does not give a new IP bucket"""
+        for i in range(2):
+            response = self.client.post(
+                reverse('login'), self.wrong_password, format='json', HTTP_X_FORWARDED_FOR=f'203.0.113.{i}'
+            )
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(
+            reverse('login'), self.wrong_password, format='json', HTTP_X_FORWARDED_FOR='203.0.113.99'
+        )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(LOGIN_THROTTLE_IP_RATE='1/min', LOGIN_THROTTLE_EMAIL_RATE=None)
+    def test_forwarded_for_behind_trusted_proxy(self):
+        """Test that with NUM_PROXIES set the client address comes from X-Forwarded-For"""
+        with mock.patch('apps.users.throttling.api_settings.NUM_PROXIES', 1):
+            for ip in ('203.0.113.1', '203.0.113.2'):
+                response = self.client.post(
+                    reverse('login'), self.wrong_password, format='json', HTTP_X_FORWARDED_FOR=ip
+                )
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_successful_login_not_throttled(self):
+        """Test that logging in successfully resets the failures that lead to a lockout"""
+        with override_settings(LOGIN_THROTTLE_IP_RATE=None, LOGIN_THROTTLE_EMAIL_RATE=None):
+            for _ in range(login_limiter.lockout_threshold - 1):
+                self.client.post(reverse('login'), self.wrong_password, format='json')
+            response = self.client.post(reverse('login'), {
+                'email': 'test@example.com', 'password': 'TestPassword123!'
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            for _ in range(login_limiter.lockout_threshold):
+                response = self.client.post(reverse('login'), self.wrong_password, format='json')
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,270 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from apps.users.bloom import BloomFilter
+from apps.users.tokens import BlacklistFilter, BloomRefreshToken, TokenStore, blacklist_filter, token_store
+
+User = get_user_model()
+
+
+class BloomFilterTests(TestCase):
+    """Tests for the Bloom filter"""
+
+    def test_no_false_negatives(self):
+        """Test that every added item is reported as present"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate(self):
+        """Test that the false positive rate stays near the configured rate"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class BlacklistFilterTests(TestCase):
+    """Tests for blacklist checks answered by the Bloom filter"""
+
+    def setUp(self):
+        blacklist_filter.reset()
+        self.client = APIClient()
+        self.refresh_url = reverse('token_refresh')
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+
+    def test_unknown_token_skips_database(self):
+        """Test that a token that was never blacklisted needs no blacklist query"""
+        refresh = BloomRefreshToken.for_user(self.user)
+        blacklist_filter.sync()
+
+        with self.assertNumQueries(0):
+            BloomRefreshToken(str(refresh))
+
+    def test_refresh_rotation_rejects_reuse(self):
+        """Test that a rotated refresh token cannot be used again"""
+        refresh = str(BloomRefreshToken.for_user(self.user))
+
+        response = self.client.post(self.refresh_url, {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh', response.data)
+
+        response = self.client.post(self.refresh_url, {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_verify_rejects_blacklisted_token(self):
+        """Test that token verification sees blacklisted tokens"""
+        refresh = BloomRefreshToken.for_user(self.user)
+        refresh.blacklist()
+
+        response = self.client.post(reverse('token_verify'), {'token': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_sync_rereads_late_commits(self):
+        """Test that a row committed after a higher id was synced still reaches the filter"""
+        bloom_filter = BlacklistFilter(sync_interval=0, sync_overlap=60)
+        early = OutstandingToken.objects.create(jti='early', token='early', expires_at=timezone.now())
+        late = OutstandingToken.objects.create(jti='late', token='late', expires_at=timezone.now())
+        BlacklistedToken.objects.create(id=1001, token=late)
+        bloom_filter.sync()
+        # Another process commits a lower id only now
+        BlacklistedToken.objects.create(id=1000, token=early)
+
+        self.assertTrue(bloom_filter.might_contain('early'))
+
+    def test_sync_skips_rows_before_the_overlap(self):
+        """Test that rows blacklisted before the overlap window are not read again"""
+        bloom_filter = BlacklistFilter(sync_interval=0, sync_overlap=60)
+        token = OutstandingToken.objects.create(jti='old', token='old', expires_at=timezone.now())
+        blacklisted = BlacklistedToken.objects.create(token=token)
+        BlacklistedToken.objects.filter(pk=blacklisted.pk).update(blacklisted_at=timezone.now() - timedelta(minutes=5))
+        bloom_filter.sync()
+        self.assertEqual(bloom_filter.overlap_floor(), blacklisted.pk)
+
+
+@override_settings(TOKEN_STORE_FLUSH_INTERVAL=1)
+class TokenStoreTests(TestCase):
+    """Tests for buffered token bookkeeping writes"""
+
+    def setUp(self):
+        blacklist_filter.reset()
+        # The tests flush explicitly, without the background thread
+        patcher = mock.patch.object(token_store.flusher, 'ensure_started')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(token_store.reset)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            name='Test User',
+            password='TestPassword123!'
+        )
+
+    def inserts(self, queries):
+        return [query for query in queries if query['sql'].startswith('INSERT')]
+
+    def test_rotation_writes_nothing_until_flush(self):
+        """Test that a refresh rotation queues its rows and rejects reuse before they are written"""
+        refresh = BloomRefreshToken.for_user(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('token_refresh'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.inserts(queries), [])
+        self.assertFalse(OutstandingToken.objects.exists())
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.assertEqual(token_store.flush(), 2)
+        self.assertEqual(OutstandingToken.objects.get(jti=refresh['jti']).user, self.user)
+        self.assertTrue(BlacklistedToken.objects.filter(token__jti=refresh['jti']).exists())
+        # Once written, the token leaves the in-memory set; the shared marker and the database still reject it
+        self.assertEqual(token_store.stats()['revoked'], 0)
+        with self.assertRaises(TokenError):
+            BloomRefreshToken(str(refresh))
+
+    def test_token_obtain_pair_queues_outstanding_token(self):
+        """Test that /api/token/ issues its refresh token through the store"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('token_obtain_pair'), {
+                'email': 'test@example.com', 'password': 'TestPassword123!'
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.inserts(queries), [])
+        self.assertEqual(token_store.stats()['pending'], 1)
+
+        token_store.flush()
+        refresh = BloomRefreshToken(response.data['refresh'])
+        self.assertEqual(OutstandingToken.objects.get(jti=refresh['jti']).user, self.user)
+
+    def test_revocation_reaches_processes_sharing_the_cache(self):
+        """Test that a store with its own memory but the same cache rejects the token before any flush"""
+        other_process = TokenStore()
+        token = BloomRefreshToken.for_user(self.user)
+        token.blacklist()
+
+        self.assertTrue(other_process.is_revoked(token['jti']))
+        self.assertFalse(other_process.blacklist(token))
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_logout_revokes_before_flush(self):
+        """Test that a logged-out token cannot be refreshed while its row is still queued"""
+        token = BloomRefreshToken.for_user(self.user)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('logout'), {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(token)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(token_store.stats()['pending'], 2)
+
+    def test_flush_batches_inserts(self):
+        """Test that queued rows are inserted with bulk_create in batch_size batches"""
+        tokens = [BloomRefreshToken.for_user(self.user) for _ in range(4)]
+        for token in tokens:
+            token.blacklist()
+        with mock.patch.object(token_store, 'batch_size', 2):
+            with CaptureQueriesContext(connection) as queries:
+                token_store.flush()
+        # Two OutstandingToken batches and two BlacklistedToken batches
+        self.assertEqual(len(self.inserts(queries)), 4)
+        self.assertEqual(BlacklistedToken.objects.count(), 4)
+
+    def test_concurrent_rotation_rejected(self):
+        """Test that two requests presenting the same token cannot both rotate it"""
+        raw = str(BloomRefreshToken.for_user(self.user))
+        first, second = BloomRefreshToken(raw), BloomRefreshToken(raw)
+        first.blacklist()
+        with self.assertRaises(TokenError):
+            second.blacklist()
+        self.assertEqual(token_store.stats()['reuse_rejected'], 1)
+
+    def test_blacklisting_flushed_token(self):
+        """Test that blacklisting a token issued in an earlier flush reuses its row"""
+        token = BloomRefreshToken.for_user(self.user)
+        token_store.flush()
+        token.blacklist()
+        token_store.flush()
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.get().token.jti, token['jti'])
+
+    def test_deleted_user(self):
+        """Test that tokens of a user deleted before the flush are written without a user"""
+        token = BloomRefreshToken.for_user(self.user)
+        self.user.delete()
+        token_store.flush()
+        self.assertIsNone(OutstandingToken.objects.get(jti=token['jti']).user)
+
+    def test_failed_flush_requeues(self):
+        """Test that rows are kept, and stay revoked, when a flush fails"""
+        token = BloomRefreshToken.for_user(self.user)
+        token.blacklist()
+        with mock.patch.object(OutstandingToken.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                token_store.flush()
+        self.assertEqual(token_store.stats()['pending'], 2)
+        self.assertTrue(token_store.is_revoked(token['jti']))
+        token_store.flush()
+        self.assertTrue(BlacklistedToken.objects.exists())
+
+    def test_issue_starts_background_flusher(self):
+        """Test that queueing a row starts the flush thread, and that no thread exists in synchronous mode"""
+        for flush_interval, calls in ((0, 0), (1, 1)):
+            store = TokenStore(flush_interval=flush_interval)
+            with mock.patch.object(store.flusher, 'ensure_started') as ensure_started:
+                store.issue(BloomRefreshToken.for_user(self.user), self.user)
+            self.assertEqual(ensure_started.call_count, calls)
+
+    def test_synchronous_mode(self):
+        """Test that flush_interval <= 0 writes every row immediately"""
+        with mock.patch.object(token_store, 'flush_interval', 0):
+            token = BloomRefreshToken.for_user(self.user)
+        self.assertTrue(OutstandingToken.objects.filter(jti=token['jti']).exists())
+
+    def test_request_finished_flushes_due_rows(self):
+        """Test that a request finishing after flush_interval writes the queue"""
+        BloomRefreshToken.for_user(self.user)
+        with mock.patch.object(token_store, 'flush_interval', 0):
+            self.client.get(reverse('login'))
+        self.assertTrue(OutstandingToken.objects.exists())
+
+
+class PruneTokensCommandTests(TestCase):
+    """Tests for the prune_tokens management command"""
+
+    def test_prunes_only_expired_tokens(self):
+        """Test that expired tokens and their blacklist entries are deleted in batches"""
+        user = User.objects.create_user(email='test@example.com', name='Test User', password='TestPassword123!')
+        now = timezone.now()
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                user=user, jti=f'expired-{i}', token='token', expires_at=now - timedelta(days=1)
+            )
+            BlacklistedToken.objects.create(token=token)
+        OutstandingToken.objects.create(user=user, jti='live', token='token', expires_at=now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=out)
+
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+        self.assertIn('Deleted 5 expired outstanding tokens and 5 blacklist entries', out.getvalue())
@@ -61,4 +61,18 @@ class UserSerializerTests(TestCase):
         
         self.assertEqual(set(data.keys()), {'id', 'email', 'name', 'date_joined'})
         self.assertEqual(data['email'], self.user.email)
-        self.assertEqual(data['name'], self.user.name)
\ No newline at end of file
+        self.assertEqual(data['name'], self.user.name)
+    
+    def test_user_detail_serializer_update(self):
+        """Test that UserDetailSerializer saves only a changed name, and skips no-op updates"""
+        serializer = UserDetailSerializer(instance=self.user, data={'name': 'Renamed User'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        with self.assertNumQueries(1):
+            serializer.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Renamed User')
+        
+        serializer = UserDetailSerializer(instance=self.user, data={'name': 'Renamed User'}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        with self.assertNumQueries(0):
+            serializer.save()
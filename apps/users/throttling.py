@@ -0,0 +1,222 @@
+"""
+Login throttling that runs before any password hashing.
+
+Each attempt draws from two token buckets, one keyed by client IP and one
+by email, and consecutive failures for an email lock it out for an
+exponentially growing period. State lives in Django's cache framework
+(LOGIN_THROTTLE_CACHE, by default the `shared` tier), so limits apply
+across every process that shares that cache.
+
+A check is one get_many() plus one set_many(), and recording the outcome
+is at most one more set_many(). Writes are last-writer-wins rather than
+atomic, so concurrent attempts can occasionally get one extra token
+through; they can never lock out a client early.
+"""
+import hashlib
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from apps.users.conf import UNSET, Setting, configure
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Turn a DRF-style rate such as '10/min' into (capacity, seconds), or
+    None if the rate is None
+    """
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class LoginAttempt:
+    """
+    Outcome of LoginLimiter.check(). `wait` is None when the attempt may
+    go on to check the password, and otherwise the seconds until a retry
+    can succeed.
+    """
+    def __init__(self, limiter, email_key, email_state, wait=None):
+        self.limiter = limiter
+        self.email_key = email_key
+        self.email_state = email_state
+        self.wait = wait
+
+    @property
+    def allowed(self):
+        return self.wait is None
+
+    def failed(self):
+        """Count a wrong password against the email and lock it out past the threshold"""
+        if self.email_key is not None:
+            self.limiter.record_failure(self.email_key, self.email_state)
+
+    def succeeded(self):
+        """Clear the email's failure count"""
+        if self.email_key is not None and self.email_state[2]:
+            self.limiter.record_success(self.email_key, self.email_state)
+
+
+class LoginLimiter:
+    """
+    Token buckets per IP and per email, with a per-email lockout.
+
+    A bucket holds up to `capacity` attempts and refills at capacity per
+    `seconds`. After `lockout_threshold` consecutive failures an email is
+    locked for lockout_base * 2 ** (failures - threshold) seconds, capped
+    at lockout_max. Attempts rejected here never reach the password hasher,
+    and are counted in `hashes_saved`.
+
+    Options not passed in are read from the LOGIN_THROTTLE_* and
+    LOGIN_LOCKOUT_* settings on use.
+    """
+    key_prefix = 'login-throttle'
+    cache_alias = Setting('LOGIN_THROTTLE_CACHE', 'default')
+    ip_rate = Setting('LOGIN_THROTTLE_IP_RATE', '20/min')
+    email_rate = Setting('LOGIN_THROTTLE_EMAIL_RATE', '5/min')
+    lockout_threshold = Setting('LOGIN_LOCKOUT_THRESHOLD', 5)
+    lockout_base = Setting('LOGIN_LOCKOUT_BASE', 1)
+    lockout_max = Setting('LOGIN_LOCKOUT_MAX', 900)
+
+    def __init__(self, cache_alias=UNSET, ip_rate=UNSET, email_rate=UNSET,
+                 lockout_threshold=UNSET, lockout_base=UNSET, lockout_max=UNSET):
+        configure(
+            self, cache_alias=cache_alias, ip_rate=ip_rate, email_rate=email_rate,
+            lockout_threshold=lockout_threshold, lockout_base=lockout_base, lockout_max=lockout_max,
+        )
+        self.allowed = 0
+        self.throttled = 0
+        self.locked_out = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rates(self):
+        return {'ip': parse_rate(self.ip_rate), 'email': parse_rate(self.email_rate)}
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @property
+    def timeout(self):
+        """How long idle state is kept: long enough to refill and to outlast a lockout"""
+        return max([seconds for _, seconds in filter(None, self.rates.values())] + [self.lockout_max])
+
+    def get_key(self, scope, value):
+        # Emails are hashed so keys stay short and safe for memcached
+        return f'{self.key_prefix}:{scope}:{hashlib.md5(value.encode()).hexdigest()}'
+
+    def check(self, ip, email=None):
+        """Take a token from each bucket, or return the wait if any is empty or locked"""
+        now = time.time()
+        keys = {}
+        if ip and self.rates['ip']:
+            keys['ip'] = self.get_key('ip', ip)
+        if email:
+            keys['email'] = self.get_key('email', email)
+        states = self.cache.get_many(keys.values())
+
+        wait = 0
+        locked = False
+        updates = {}
+        for scope, key in keys.items():
+            rate = self.rates[scope]
+            capacity, seconds = rate or (0, 0)
+            tokens, updated, failures, locked_until = states.get(key) or (capacity, now, 0, 0)
+            if locked_until > now:
+                wait = max(wait, locked_until - now)
+                locked = True
+            elif rate:
+                tokens = min(capacity, tokens + (now - updated) * capacity / seconds)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) * seconds / capacity)
+                else:
+                    tokens -= 1
+            states[key] = (tokens, now, failures, locked_until)
+            updates[key] = states[key]
+
+        email_key = keys.get('email')
+        email_state = states.get(email_key)
+        if wait:
+            with self._lock:
+                if locked:
+                    self.locked_out += 1
+                else:
+                    self.throttled += 1
+            return LoginAttempt(self, email_key, email_state, wait)
+
+        if updates:
+            self.cache.set_many(updates, self.timeout)
+        with self._lock:
+            self.allowed += 1
+        return LoginAttempt(self, email_key, email_state)
+
+    def record_failure(self, key, state):
+        tokens, updated, failures, _ = state
+        failures += 1
+        locked_until = lockout = 0
+        if failures >= self.lockout_threshold:
+            lockout = min(self.lockout_base * 2 ** min(failures - self.lockout_threshold, 32), self.lockout_max)
+            locked_until = time.time() + lockout
+        # Failures are remembered for a full timeout after the lockout ends
+        self.cache.set_many({key: (tokens, updated, failures, locked_until)}, self.timeout + lockout)
+
+    def record_success(self, key, state):
+        tokens, updated, _, _ = state
+        self.cache.set_many({key: (tokens, updated, 0, 0)}, self.timeout)
+
+    def stats(self):
+        return {
+            'allowed': self.allowed,
+            'throttled': self.throttled,
+            'locked_out': self.locked_out,
+            'hashes_saved': self.throttled + self.locked_out,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.allowed = self.throttled = self.locked_out = 0
+
+
+login_limiter = LoginLimiter()
+
+
+def get_login_email(data):
+    """The normalized login email from request data, or None"""
+    try:
+        email = data.get(get_user_model().USERNAME_FIELD)
+    except AttributeError:
+        return None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+class LoginThrottle(BaseThrottle):
+    """
+    DRF throttle around login_limiter. The attempt is kept on the request
+    as `login_attempt` so the view can report the outcome.
+    """
+    limiter = login_limiter
+
+    def allow_request(self, request, view):
+        attempt = self.limiter.check(self.get_ident(request), get_login_email(request.data))
+        request.login_attempt = attempt
+        self.attempt = attempt
+        return attempt.allowed
+
+    def wait(self):
+        return self.attempt.wait
+
+    def get_ident(self, request):
+        """
+        The client address for the IP bucket. X-Forwarded-For is only read
+        when NUM_PROXIES says how many trusted proxies append to it;
+        otherwise a client could pick a fresh bucket for every attempt.
+        """
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get('REMOTE_ADDR')
+        return super().get_ident(request)
@@ -0,0 +1,356 @@
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+from apps.users.bloom import BloomFilter
+from apps.users.conf import UNSET, Setting, configure
+from apps.users.flushing import BackgroundFlusher
+
+
+class BlacklistFilter:
+    """
+    In-process Bloom filter of blacklisted token JTIs.
+
+    The filter is built from BlacklistedToken on first use. Tokens blacklisted
+    in this process are added as they are inserted. Tokens blacklisted by other
+    processes are picked up by an incremental sync every `sync_interval`
+    seconds, which bounds how stale a negative answer can be. The whole filter
+    is rebuilt every `rebuild_interval` seconds, or once it outgrows its
+    capacity, so that pruned tokens stop producing false positives.
+
+    Ids are not committed in order: a transaction can commit a lower id after
+    a higher one was synced. Each sync therefore re-reads every row
+    blacklisted in the last `sync_overlap` seconds as well as the rows above
+    the highest id seen. Only a row whose transaction stays open longer than
+    that waits for the next rebuild.
+    """
+    def __init__(self, capacity=100000, error_rate=0.001, sync_interval=5, rebuild_interval=3600, sync_overlap=60):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.sync_overlap = sync_overlap
+        self._bloom = None
+        self._last_id = 0
+        self._synced_at = 0
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    def might_contain(self, jti):
+        self.sync()
+        return jti in self._bloom
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def sync(self):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._bloom is not None and now - self._synced_at < self.sync_interval:
+                return
+            if (
+                self._bloom is None
+                or now - self._built_at >= self.rebuild_interval
+                or self._bloom.count > self._bloom.capacity
+            ):
+                self._rebuild()
+            else:
+                self._load(BlacklistedToken.objects.filter(id__gt=self.overlap_floor()), self._bloom)
+            self._synced_at = now
+
+    def overlap_floor(self):
+        """
+        Return the id to re-read from: the newest id blacklisted before the
+        overlap window, found by walking the primary key back from the top
+        """
+        cutoff = timezone.now() - timedelta(seconds=self.sync_overlap)
+        floor = (
+            BlacklistedToken.objects.filter(id__lte=self._last_id, blacklisted_at__lt=cutoff)
+            .order_by('-id').values_list('id', flat=True).first()
+        )
+        return floor or 0
+
+    def _rebuild(self):
+        blacklisted = BlacklistedToken.objects.all()
+        bloom = BloomFilter(max(self.capacity, 2 * blacklisted.count()), self.error_rate)
+        self._last_id = 0
+        self._load(blacklisted, bloom)
+        self._bloom = bloom
+        self._built_at = time.monotonic()
+
+    def _load(self, queryset, bloom):
+        for token_id, jti in queryset.order_by('id').values_list('id', 'token__jti').iterator(chunk_size=5000):
+            bloom.add(jti)
+            self._last_id = max(self._last_id, token_id)
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            self._last_id = 0
+
+
+blacklist_filter = BlacklistFilter(
+    capacity=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_CAPACITY', 100000),
+    error_rate=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001),
+    sync_interval=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_SYNC_INTERVAL', 5),
+    rebuild_interval=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL', 3600),
+    sync_overlap=getattr(settings, 'TOKEN_BLACKLIST_BLOOM_SYNC_OVERLAP', 60),
+)
+
+
+class TokenStore:
+    """
+    Write-behind store for the OutstandingToken and BlacklistedToken rows
+    written on login, refresh-token rotation and logout.
+
+    Issued tokens queue an OutstandingToken. A blacklisted token is revoked
+    at once, in an in-memory set and by a marker added to the
+    `cache_alias` cache for `marker_timeout` seconds, and its
+    BlacklistedToken is queued. Queued rows
+    are inserted with bulk_create in batches of `batch_size`, in one
+    transaction. A flush runs once the oldest entry is `flush_interval`
+    seconds old, checked on request_finished (see apps.users.signals) and
+    by a BackgroundFlusher thread, as soon as `max_pending` rows are
+    waiting, and at interpreter exit. With flush_interval <= 0 every write
+    is immediate and no thread is started.
+
+    Guarantees:
+    - Every process sharing the cache rejects a revoked token from the
+      moment it is revoked, and by the time the marker expires the row is
+      flushed and in every blacklist_filter. Of two concurrent refreshes with one token,
+      only the first succeeds: within a process the in-memory set decides,
+      across processes cache.add(). add() is atomic on the db, redis and
+      memcached backends; the file backend checks and writes separately,
+      so processes racing within that window can both succeed.
+    - Processes that do not share the cache reject it once it is flushed
+      and their blacklist_filter has synced, so within flush_interval plus
+      TOKEN_BLACKLIST_BLOOM_SYNC_INTERVAL seconds.
+    - A process killed without running its exit handlers loses at most
+      `flush_interval` seconds of queued rows. Its revoked tokens stay
+      rejected while their markers last, and are accepted again afterwards
+      until they expire. Its issued tokens get their OutstandingToken when
+      they are blacklisted, as simplejwt does for rotated tokens.
+    - BlacklistedToken.blacklisted_at is the flush time.
+
+    Options not passed in are read from the TOKEN_STORE_* settings on use.
+    """
+    key_prefix = 'token-revoked'
+    cache_alias = Setting('TOKEN_STORE_CACHE', 'shared')
+    marker_timeout = Setting('TOKEN_STORE_MARKER_TIMEOUT', 300)
+    flush_interval = Setting('TOKEN_STORE_FLUSH_INTERVAL', 1)
+    batch_size = Setting('TOKEN_STORE_BATCH_SIZE', 500)
+    max_pending = Setting('TOKEN_STORE_MAX_PENDING', 5000)
+
+    def __init__(self, cache_alias=UNSET, marker_timeout=UNSET, flush_interval=UNSET, batch_size=UNSET,
+                 max_pending=UNSET):
+        configure(
+            self, cache_alias=cache_alias, marker_timeout=marker_timeout, flush_interval=flush_interval,
+            batch_size=batch_size, max_pending=max_pending,
+        )
+        self.flusher = BackgroundFlusher(self)
+        # jti -> unsaved OutstandingToken
+        self._outstanding = {}
+        self._blacklisted = {}
+        self._revoked = set()
+        self._pending_since = None
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(
+            ('issued', 'blacklisted', 'reuse_rejected', 'outstanding_flushed', 'blacklisted_flushed', 'flushes'), 0
+        )
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get_key(self, jti):
+        return f'{self.key_prefix}:{jti}'
+
+    def issue(self, token, user):
+        """Queue the OutstandingToken of a newly issued refresh token"""
+        jti = token[api_settings.JTI_CLAIM]
+        row = OutstandingToken(
+            user_id=user.pk,
+            jti=jti,
+            token=str(token),
+            created_at=token.current_time,
+            expires_at=datetime_from_epoch(token['exp']),
+        )
+        with self._lock:
+            self._outstanding[jti] = row
+            self.counters['issued'] += 1
+            self.mark_pending()
+        self.queued()
+
+    def blacklist(self, token):
+        """Revoke `token` now and queue its BlacklistedToken; False if it was already revoked"""
+        jti = token[api_settings.JTI_CLAIM]
+        with self._lock:
+            if jti in self._revoked:
+                self.counters['reuse_rejected'] += 1
+                return False
+            self._revoked.add(jti)
+        timeout = max(min(self.marker_timeout, token['exp'] - int(time.time())), 1)
+        if not self.cache.add(self.get_key(jti), 1, timeout):
+            with self._lock:
+                self._revoked.discard(jti)
+                self.counters['reuse_rejected'] += 1
+            return False
+        with self._lock:
+            self._blacklisted[jti] = OutstandingToken(
+                jti=jti, token=str(token), expires_at=datetime_from_epoch(token['exp'])
+            )
+            self.counters['blacklisted'] += 1
+            self.mark_pending()
+        self.queued()
+        return True
+
+    def is_revoked(self, jti):
+        return jti in self._revoked or self.cache.has_key(self.get_key(jti))
+
+    def mark_pending(self):
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+
+    def queued(self):
+        if self.flush_interval <= 0 or len(self._outstanding) + len(self._blacklisted) >= self.max_pending:
+            self.flush()
+        else:
+            self.flusher.ensure_started()
+
+    def flush_if_due(self):
+        """Flush if the oldest queued row has waited flush_interval; errors are retried next time"""
+        since = self._pending_since
+        if since is not None and time.monotonic() - since >= self.flush_interval:
+            try:
+                self.flush()
+            except DatabaseError:
+                pass
+
+    def flush(self):
+        """Insert every queued row now; returns the number of rows queued"""
+        with self._lock:
+            outstanding, self._outstanding = self._outstanding, {}
+            blacklisted, self._blacklisted = self._blacklisted, {}
+            self._pending_since = None
+        if not outstanding and not blacklisted:
+            return 0
+
+        try:
+            with transaction.atomic():
+                self.write(outstanding, blacklisted)
+        except DatabaseError:
+            self.requeue(outstanding, blacklisted)
+            raise
+
+        # bulk_create sends no post_save, so feed the Bloom filter before forgetting the jtis
+        for jti in blacklisted:
+            blacklist_filter.add(jti)
+        with self._lock:
+            self._revoked.difference_update(blacklisted)
+            self.counters['outstanding_flushed'] += len(outstanding)
+            self.counters['blacklisted_flushed'] += len(blacklisted)
+            self.counters['flushes'] += 1
+        return len(outstanding) + len(blacklisted)
+
+    def write(self, outstanding, blacklisted):
+        rows = list(outstanding.values())
+        rows.extend(row for jti, row in blacklisted.items() if jti not in outstanding)
+        user_ids = {row.user_id for row in rows if row.user_id is not None}
+        if user_ids:
+            # Users deleted since their token was issued are set null, as the foreign key would
+            existing = set(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+            for row in rows:
+                if row.user_id not in existing:
+                    row.user_id = None
+        # Tokens blacklisted after an earlier flush already have their row
+        OutstandingToken.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+
+        jtis = list(blacklisted)
+        token_ids = []
+        for offset in range(0, len(jtis), self.batch_size):
+            token_ids.extend(
+                OutstandingToken.objects.filter(jti__in=jtis[offset:offset + self.batch_size]).values_list('id', flat=True)
+            )
+        BlacklistedToken.objects.bulk_create(
+            [BlacklistedToken(token_id=token_id) for token_id in token_ids],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+    def requeue(self, outstanding, blacklisted):
+        with self._lock:
+            for jti, row in outstanding.items():
+                self._outstanding.setdefault(jti, row)
+            for jti, row in blacklisted.items():
+                self._blacklisted.setdefault(jti, row)
+            self.mark_pending()
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self.counters,
+                pending=len(self._outstanding) + len(self._blacklisted),
+                revoked=len(self._revoked),
+            )
+
+    def reset(self):
+        with self._lock:
+            self._outstanding.clear()
+            self._blacklisted.clear()
+            self._revoked.clear()
+            self._pending_since = None
+            for name in self.counters:
+                self.counters[name] = 0
+
+
+token_store = TokenStore()
+
+
+def is_blacklisted(jti):
+    """
+    Check tokens revoked through token_store, then the Bloom filter, and
+    only query the database on a possible hit
+    """
+    return token_store.is_revoked(jti) or (
+        blacklist_filter.might_contain(jti) and BlacklistedToken.objects.filter(token__jti=jti).exists()
+    )
+
+
+class BloomRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check is answered by the in-process
+    Bloom filter whenever the token is definitely not blacklisted, and
+    whose OutstandingToken and BlacklistedToken rows go through
+    token_store.
+    """
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+
+        if is_blacklisted(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        """Revoke the token now; its BlacklistedToken is written by the next flush"""
+        if not token_store.blacklist(self):
+            raise TokenError(_("Token is blacklisted"))
+
+    @classmethod
+    def for_user(cls, user):
+        # Token.for_user, without BlacklistMixin's immediate OutstandingToken insert
+        token = super(BlacklistMixin, cls).for_user(user)
+        token_store.issue(token, user)
+        return token
@@ -1,2 +1,4 @@
-from apps.users.views.employer import EmployerListCreateView, EmployerDetailView, IsOwner
-from apps.users.views.auth import SignUpView, LoginView, LogoutView, ProfileView
\ No newline at end of file
+from apps.users.views.employer import EmployerListCreateView, EmployerDetailView, EmployerExportView, EmployerBulkView, IsOwner
+from apps.users.views.auth import SignUpView, LoginView, LogoutView, ProfileView, ThrottledTokenObtainPairView
+from apps.users.views.async_auth import AsyncSignUpView, AsyncLoginView
+from apps.users.views.async_employer import AsyncEmployerListCreateView, AsyncEmployerDetailView, AsyncProfileView
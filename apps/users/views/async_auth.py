@@ -0,0 +1,99 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.exceptions import Throttled
+from apps.users.hashing import HashingPoolBusy, averify_password
+from apps.users.last_login import last_login_tracker
+from apps.users.serializers.user_serializer import UserSerializer, LoginSerializer
+from apps.users.throttling import LoginThrottle, get_login_email, login_limiter
+from apps.users.tokens import BloomRefreshToken
+from apps.users.views.async_base import AsyncAPIView
+
+User = get_user_model()
+
+
+class AsyncHashingView(AsyncAPIView):
+    """
+    Async view whose password hashing runs in the hashing pool
+    """
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except HashingPoolBusy:
+            return self.respond(
+                {"detail": "Too many concurrent authentication requests, please retry."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"}
+            )
+
+
+class AsyncSignUpView(AsyncHashingView):
+    """
+    Async user registration
+    Endpoint: POST /api/async/auth/signup/
+    """
+    async def post(self, request, *args, **kwargs):
+        data = self.parse_json(request)
+        if data is None:
+            return self.parse_error()
+
+        serializer = UserSerializer(data=data)
+        # Validation checks email uniqueness against the database
+        if not await sync_to_async(serializer.is_valid)():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        validated_data = dict(serializer.validated_data)
+        validated_data.pop('password2')
+        await User.objects.acreate_user(**validated_data)
+        return self.respond({
+            "message": "User registered successfully"
+        }, status=status.HTTP_201_CREATED)
+
+
+class AsyncLoginView(AsyncHashingView):
+    """
+    Async user login
+    Endpoint: POST /api/async/auth/login/
+
+    Throttled like LoginView, before any work is sent to the hashing pool.
+    """
+    async def post(self, request, *args, **kwargs):
+        data = self.parse_json(request)
+        if data is None:
+            return self.parse_error()
+
+        attempt = await sync_to_async(login_limiter.check)(LoginThrottle().get_ident(request), get_login_email(data))
+        if not attempt.allowed:
+            throttled = Throttled(attempt.wait)
+            return self.respond(
+                {"detail": throttled.detail},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": '%d' % throttled.wait}
+            )
+
+        serializer = LoginSerializer(data=data)
+        if not serializer.is_valid():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        email = serializer.validated_data.get("email")
+        password = serializer.validated_data.get("password")
+        user = await User.objects.filter(email=email).afirst()
+        is_correct = False
+        if user:
+            is_correct, upgraded = await averify_password(password, user.password)
+            if upgraded:
+                # Re-hash with the current hasher profile, like Django's login does
+                user.password = upgraded
+                await user.asave(update_fields=['password'])
+
+        if is_correct:
+            await sync_to_async(attempt.succeeded)()
+            await sync_to_async(last_login_tracker.record)(user)
+            refresh = await sync_to_async(BloomRefreshToken.for_user)(user)
+            return self.respond({
+                "refresh": str(refresh),
+                "access": str(refresh.access_token)
+            }, status=status.HTTP_200_OK)
+
+        await sync_to_async(attempt.failed)()
+        return self.respond({"detail": "Invalid Credentials"}, status=status.HTTP_401_UNAUTHORIZED)
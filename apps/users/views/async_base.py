@@ -0,0 +1,75 @@
+import io
+from django.http import HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, ParseError
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from apps.users.authentication import CachedJWTAuthentication
+
+
+class AsyncAPIView(View):
+    """
+    Base for async JSON endpoints served natively under ASGI.
+
+    These views use JWTs rather than sessions, so they are CSRF exempt just
+    like DRF's APIView.
+    """
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def parse_json(self, request):
+        """Return the decoded JSON body, or None if it is not a JSON object"""
+        try:
+            data = FastJSONParser().parse(io.BytesIO(request.body or b'{}'))
+        except ParseError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def respond(self, data, status=200, headers=None):
+        """Return `data` as JSON, encoded exactly as the DRF views encode it"""
+        return HttpResponse(
+            FastJSONRenderer().render(data),
+            status=status,
+            headers=headers,
+            content_type=FastJSONRenderer.media_type
+        )
+
+    def parse_error(self):
+        return self.respond({"detail": "JSON parse error"}, status=400)
+
+
+class AsyncAuthenticatedAPIView(AsyncAPIView):
+    """
+    Async view that requires a valid JWT access token, like DRF's
+    IsAuthenticated. The user is loaded with the async ORM, or taken from
+    the same snapshot cache as the sync views.
+    """
+    authentication_class = CachedJWTAuthentication
+
+    async def dispatch(self, request, *args, **kwargs):
+        authenticator = self.authentication_class()
+        try:
+            result = await authenticator.aauthenticate(request)
+        except AuthenticationFailed as exc:
+            # Shaped like DRF's exception handler output
+            detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return self.unauthorized(authenticator, detail)
+        if result is None:
+            return self.unauthorized(authenticator, {"detail": "Authentication credentials were not provided."})
+
+        request.user, request.auth = result
+        return await super().dispatch(request, *args, **kwargs)
+
+    def unauthorized(self, authenticator, data):
+        return self.respond(
+            data,
+            status=status.HTTP_401_UNAUTHORIZED,
+            headers={"WWW-Authenticate": authenticator.authenticate_header(None)}
+        )
+
+    def not_found(self):
+        return self.respond({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
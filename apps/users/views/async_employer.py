@@ -0,0 +1,174 @@
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.utils.urls import replace_query_param
+from apps.users.cache import invalidate_employer_cache
+from apps.users.models import Employer
+from apps.users.pagination import EmployerCursorPagination, decode_keyset_cursor, encode_keyset_cursor
+from apps.users.search import search_employers
+from apps.users.serializers.base import apply_changes
+from apps.users.serializers.employer_serializer import EmployerReadSerializer, EmployerSerializer
+from apps.users.serializers.user_serializer import UserDetailSerializer
+from apps.users.views.async_base import AsyncAuthenticatedAPIView
+
+
+class AsyncEmployerListCreateView(AsyncAuthenticatedAPIView):
+    """
+    Async listing and creation of the user's employers
+    Endpoint: GET/POST /api/async/employers/
+
+    Lists are paged forward with a keyset cursor over (created_at, id), or
+    (search_rank, id) when searching, in the same order as the sync view.
+    """
+    page_size = EmployerCursorPagination.page_size
+    max_page_size = EmployerCursorPagination.max_page_size
+
+    def get_queryset(self, request):
+        """Return only employers that belong to the current user"""
+        return Employer.objects.filter(user_id=request.user.pk)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET['page_size'])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    async def get(self, request, *args, **kwargs):
+        queryset = search_employers(self.get_queryset(request), request.GET.get('search', ''))
+        key = 'search_rank' if 'search_rank' in queryset.query.annotations else 'created_at'
+
+        if 'cursor' in request.GET:
+            try:
+                value, pk = decode_keyset_cursor(request.GET['cursor'])
+                if key == 'created_at':
+                    value = parse_datetime(value)
+                    if value is None:
+                        raise ValueError('Invalid cursor')
+                elif not isinstance(value, (int, float)):
+                    raise ValueError('Invalid cursor')
+            except (TypeError, ValueError):
+                return self.respond({"detail": "Invalid cursor"}, status=status.HTTP_404_NOT_FOUND)
+            queryset = queryset.filter(Q(**{f'{key}__lt': value}) | Q(**{key: value, 'id__gt': pk}))
+
+        page_size = self.get_page_size(request)
+        columns = EmployerReadSerializer.columns()
+        if key not in columns:
+            columns.append(key)
+        queryset = queryset.order_by(f'-{key}', 'id').values(*columns)
+        rows = [row async for row in queryset[:page_size + 1]]
+
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            value = rows[-1][key]
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            next_url = replace_query_param(
+                request.build_absolute_uri(), 'cursor', encode_keyset_cursor(value, rows[-1]['id'])
+            )
+
+        return self.respond({
+            "next": next_url,
+            "results": EmployerReadSerializer(rows, many=True).data
+        })
+
+    async def post(self, request, *args, **kwargs):
+        data = self.parse_json(request)
+        if data is None:
+            return self.parse_error()
+
+        serializer = EmployerSerializer(data=data)
+        if not serializer.is_valid():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        employer = await Employer.objects.acreate(user_id=request.user.pk, **serializer.validated_data)
+        return self.respond(EmployerSerializer(employer).data, status=status.HTTP_201_CREATED)
+
+
+class AsyncEmployerDetailView(AsyncAuthenticatedAPIView):
+    """
+    Async retrieval, update and deletion of one of the user's employers
+    Endpoint: GET/PUT/PATCH/DELETE /api/async/employers/<id>/
+
+    Writes are single statements conditioned on id and user_id, as in
+    EmployerDetailView.
+    """
+    def get_owned(self, request, pk):
+        """Return a queryset matching only the requested employer, if owned"""
+        return Employer.objects.filter(pk=pk, user_id=request.user.pk)
+
+    async def get(self, request, pk, *args, **kwargs):
+        row = await self.get_owned(request, pk).values(*EmployerReadSerializer.columns()).afirst()
+        if row is None:
+            return self.not_found()
+        return self.respond(EmployerReadSerializer(row).data)
+
+    async def put(self, request, pk, *args, **kwargs):
+        return await self.update(request, pk, partial=False)
+
+    async def patch(self, request, pk, *args, **kwargs):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial):
+        data = self.parse_json(request)
+        if data is None:
+            return self.parse_error()
+
+        serializer = EmployerSerializer(data=data, partial=partial)
+        if not serializer.is_valid():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.get_owned(request, pk)
+        employer = await queryset.afirst()
+        if employer is None:
+            return self.not_found()
+        update_fields = apply_changes(employer, serializer.validated_data)
+        if update_fields:
+            employer.updated_at = timezone.now()
+            if not await queryset.aupdate(**{name: getattr(employer, name) for name in update_fields}):
+                return self.not_found()
+            # QuerySet.aupdate() sends no signals, so invalidate here
+            await sync_to_async(invalidate_employer_cache)(request.user.pk)
+        return self.respond(EmployerSerializer(employer).data)
+
+    async def delete(self, request, pk, *args, **kwargs):
+        deleted, _ = await self.get_owned(request, pk).adelete()
+        if not deleted:
+            return self.not_found()
+        await sync_to_async(invalidate_employer_cache)(request.user.pk)
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncProfileView(AsyncAuthenticatedAPIView):
+    """
+    Async retrieval and update of the user's profile
+    Endpoint: GET/PUT/PATCH /api/async/auth/profile/
+    """
+    async def get(self, request, *args, **kwargs):
+        return self.respond(UserDetailSerializer(request.user).data)
+
+    async def put(self, request, *args, **kwargs):
+        return await self.update(request, partial=False)
+
+    async def patch(self, request, *args, **kwargs):
+        return await self.update(request, partial=True)
+
+    async def update(self, request, partial):
+        data = self.parse_json(request)
+        if data is None:
+            return self.parse_error()
+
+        user = request.user
+        serializer = UserDetailSerializer(user, data=data, partial=partial)
+        if not serializer.is_valid():
+            return self.respond(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        update_fields = apply_changes(user, serializer.validated_data)
+        if update_fields:
+            await user.asave(update_fields=update_fields)
+        return self.respond(UserDetailSerializer(user).data)
@@ -4,11 +4,14 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.conf import settings
 from datetime import datetime, timedelta
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.tokens import TokenError
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password
+from apps.users.last_login import last_login_tracker
 from apps.users.serializers.user_serializer import UserSerializer, UserDetailSerializer, LoginSerializer
+from apps.users.throttling import LoginThrottle
+from apps.users.tokens import BloomRefreshToken
 
 User = get_user_model()
 
@@ -80,9 +83,13 @@ class LoginView(generics.GenericAPIView):
     """ 
     User Login View
     Endpoint: POST /api/auth/login/
+
+    Throttled per IP and per email before the password is checked
+    (see apps.users.throttling).
     """
     serializer_class = LoginSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -92,16 +99,37 @@ class LoginView(generics.GenericAPIView):
         password = serializer.validated_data.get("password")
         user = User.objects.filter(email=email).first()
 
-        if user and check_password(password, user.password):
-            refresh = RefreshToken.for_user(user)
+        # user.check_password() re-hashes outdated hashes with the current profile
+        if user and user.check_password(password):
+            request.login_attempt.succeeded()
+            last_login_tracker.record(user)
+            refresh = BloomRefreshToken.for_user(user)
             return Response({
                 "refresh": str(refresh),
                 "access": str(refresh.access_token)
             }, status=status.HTTP_200_OK)
 
+        request.login_attempt.failed()
         return Response({"detail": "Invalid Credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
 
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    simplejwt's token obtain view with the same throttling as LoginView
+    Endpoint: POST /api/token/
+    """
+    throttle_classes = [LoginThrottle]
+
+    def post(self, request, *args, **kwargs):
+        try:
+            response = super().post(request, *args, **kwargs)
+        except AuthenticationFailed:
+            request.login_attempt.failed()
+            raise
+        request.login_attempt.succeeded()
+        return response
+
+
 class LogoutView(APIView):
     """
     Logout View - Blacklist the refresh token
@@ -115,7 +143,7 @@ class LogoutView(APIView):
             if not refresh_token:
                 return Response({"detail": "Refresh token is required."}, status=status.HTTP_400_BAD_REQUEST)
                 
-            token = RefreshToken(refresh_token)
+            token = BloomRefreshToken(refresh_token)
             token.blacklist()
             return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
         except TokenError:
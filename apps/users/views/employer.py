@@ -1,28 +1,277 @@
-from rest_framework import permissions, generics
+import csv
+import json
+from rest_framework import permissions, generics, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from apps.users.cache import ConditionalCacheMixin, invalidate_employer_cache, make_etag
 from apps.users.models import Employer
-from apps.users.serializers import EmployerSerializer
+from apps.users.serializers import EmployerSerializer, EmployerReadSerializer, EmployerBulkDeleteSerializer
+from apps.users.serializers.base import apply_changes
+from apps.users.pagination import EmployerCursorPagination
+from apps.users.filters import EmployerSearchFilter
 
 class IsOwner(permissions.BasePermission):
     """
     Custom permission to only allow owners of an object to access it.
     """
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        # Compare ids so the owner is never fetched just to be compared.
+        # Rows read with .values() are dicts.
+        owner_id = obj['user_id'] if isinstance(obj, dict) else obj.user_id
+        return owner_id == request.user.pk
 
-class EmployerListCreateView(generics.ListCreateAPIView):
+class EmployerListCreateView(ConditionalCacheMixin, generics.ListCreateAPIView):
     """View for listing all employers of a user and creating new ones"""
     serializer_class = EmployerSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = EmployerCursorPagination
+    filter_backends = [EmployerSearchFilter]
     
     def get_queryset(self):
         """Return only employers that belong to the current user"""
         return Employer.objects.filter(user=self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request)
+    
+    def get_validators(self):
+        """
+        Derive the list ETag from a single aggregate query. The list sends
+        no Last-Modified: Max('updated_at') does not move when a row is
+        deleted, and whole seconds would hide changes within one second.
+        """
+        stats = self.get_queryset().aggregate(count=Count('id'), last_modified=Max('updated_at'))
+        etag = make_etag(self.request.get_full_path(), stats['count'], stats['last_modified'])
+        return etag, None
+    
+    def get_payload(self):
+        """Serialize the page from .values() rows, skipping model instances"""
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = EmployerReadSerializer.columns()
+        if 'search_rank' in queryset.query.annotations:
+            # The paginator reads its position from the row
+            columns.append('search_rank')
+        page = self.paginate_queryset(queryset.values(*columns))
+        return self.get_paginated_response(EmployerReadSerializer(page, many=True).data).data
 
-class EmployerDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EmployerDetailView(ConditionalCacheMixin, generics.RetrieveUpdateDestroyAPIView):
     """View for retrieving, updating and deleting specific employers"""
     serializer_class = EmployerSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
     
     def get_queryset(self):
         """Return only employers that belong to the current user"""
-        return Employer.objects.filter(user=self.request.user)
\ No newline at end of file
+        if getattr(self, 'swagger_fake_view', False):
+            # Schema generation introspects the view without a request
+            return Employer.objects.none()
+        return Employer.objects.filter(user_id=self.request.user.pk)
+    
+    def get_owned(self):
+        """Return a queryset matching only the requested employer, if owned"""
+        return self.get_queryset().filter(pk=self.kwargs[self.lookup_field])
+    
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request)
+    
+    def update(self, request, *args, **kwargs):
+        """
+        Read the owned row, then write only the columns that changed with
+        a single UPDATE ... WHERE id=? AND user_id=?, so ownership is still
+        enforced by the write itself
+        """
+        partial = kwargs.pop('partial', False)
+        serializer = self.get_serializer(data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        queryset = self.get_owned()
+        instance = queryset.first()
+        if instance is None:
+            raise NotFound()
+        update_fields = apply_changes(instance, serializer.validated_data)
+        if update_fields:
+            instance.updated_at = timezone.now()
+            if not queryset.update(**{name: getattr(instance, name) for name in update_fields}):
+                raise NotFound()
+            # QuerySet.update() sends no signals, so invalidate here
+            invalidate_employer_cache(request.user.pk)
+        return Response(self.get_serializer(instance).data)
+    
+    def destroy(self, request, *args, **kwargs):
+        """
+        Delete with a single DELETE ... WHERE id=? AND user_id=?
+        """
+        # Nothing cascades from an employer and no delete signal is
+        # connected, so delete() runs a single DELETE
+        deleted, _ = self.get_owned().delete()
+        if not deleted:
+            raise NotFound()
+        invalidate_employer_cache(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    def get_validators(self):
+        queryset = self.get_queryset().values(*EmployerReadSerializer.columns(), 'user_id', 'updated_at')
+        self.object = get_object_or_404(queryset, pk=self.kwargs[self.lookup_field])
+        self.check_object_permissions(self.request, self.object)
+        return make_etag(self.object['id'], self.object['updated_at']), self.object['updated_at']
+    
+    def get_payload(self):
+        return EmployerReadSerializer(self.object).data
+
+class EmployerBulkView(generics.GenericAPIView):
+    """
+    View for creating, updating and deleting employers in batches
+    Endpoint: POST/PUT/PATCH/DELETE /api/employers/bulk/
+    """
+    serializer_class = EmployerSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    max_batch_size = 1000
+    
+    def get_queryset(self):
+        """Return only employers that belong to the current user"""
+        return Employer.objects.filter(user=self.request.user)
+    
+    def post(self, request, *args, **kwargs):
+        """
+        Create every employer in the payload, or none of them
+        """
+        serializer = self.get_serializer(data=request.data, many=True, max_length=self.max_batch_size)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        invalidate_employer_cache(request.user.pk)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    def put(self, request, *args, **kwargs):
+        return self.update(request, partial=False)
+    
+    def patch(self, request, *args, **kwargs):
+        return self.update(request, partial=True)
+    
+    def update(self, request, partial):
+        """
+        Update every employer in the payload, matched to the user's
+        employers by the "id" of each item
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        if len(items) > self.max_batch_size:
+            raise ValidationError({'non_field_errors': [f'Ensure this field has no more than {self.max_batch_size} elements.']})
+        
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        employers = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+        errors = []
+        seen = set()
+        for pk in ids:
+            if pk not in employers:
+                errors.append({'id': ['Employer not found.']})
+            elif pk in seen:
+                errors.append({'id': ['Duplicate id in batch.']})
+            else:
+                errors.append({})
+            seen.add(pk)
+        if any(errors):
+            raise ValidationError(errors)
+        
+        serializer = self.get_serializer(
+            [employers[pk] for pk in ids],
+            data=items,
+            many=True,
+            partial=partial
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        invalidate_employer_cache(request.user.pk)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+    
+    def delete(self, request, *args, **kwargs):
+        """
+        Delete the user's employers with the given ids
+        """
+        serializer = EmployerBulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        if len(ids) > self.max_batch_size:
+            raise ValidationError({'ids': [f'Ensure this field has no more than {self.max_batch_size} elements.']})
+        
+        # A single DELETE ... WHERE user_id=? AND id IN (...)
+        deleted, _ = self.get_queryset().filter(id__in=ids).delete()
+        if deleted:
+            invalidate_employer_cache(request.user.pk)
+        return Response({'deleted': deleted}, status=status.HTTP_200_OK)
+
+class _Echo:
+    """File-like object whose write() hands back the value, for csv.writer"""
+    def write(self, value):
+        return value
+
+class EmployerExportView(generics.GenericAPIView):
+    """
+    View for streaming every employer of a user as NDJSON or CSV
+    Endpoint: GET /api/employers/export/?export_format=ndjson|csv
+    """
+    serializer_class = EmployerSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    chunk_size = 2000
+    content_types = {
+        'ndjson': 'application/x-ndjson',
+        'csv': 'text/csv',
+    }
+    
+    def get_queryset(self):
+        """Return only employers that belong to the current user"""
+        return Employer.objects.filter(user=self.request.user)
+    
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in self.content_types:
+            raise ValidationError({'export_format': f'Must be one of: {", ".join(self.content_types)}.'})
+        
+        field_names = self.get_serializer_class().Meta.fields
+        fields = self.get_serializer().fields
+        converters = [fields[name].to_representation for name in field_names]
+        rows = (
+            self.get_queryset()
+            .order_by('id')
+            .values_list(*field_names)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        
+        if export_format == 'csv':
+            content = self.stream_csv(rows, field_names, converters)
+        else:
+            content = self.stream_ndjson(rows, field_names, converters)
+        
+        response = StreamingHttpResponse(content, content_type=self.content_types[export_format])
+        response['Content-Disposition'] = f'attachment; filename="employers.{export_format}"'
+        return response
+    
+    def represent(self, row, converters):
+        """Convert a values_list row the same way EmployerSerializer would"""
+        return [None if value is None else convert(value) for value, convert in zip(row, converters)]
+    
+    def stream_ndjson(self, rows, field_names, converters):
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(dict(zip(field_names, self.represent(row, converters)))) + '\n')
+            if len(lines) >= self.chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
+    
+    def stream_csv(self, rows, field_names, converters):
+        writer = csv.writer(_Echo())
+        lines = [writer.writerow(field_names)]
+        for row in rows:
+            lines.append(writer.writerow(self.represent(row, converters)))
+            if len(lines) >= self.chunk_size:
+                yield ''.join(lines)
+                lines = []
+        if lines:
+            yield ''.join(lines)
@@ -3,6 +3,10 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving through ASGI lets the async endpoints under /api/async/ run natively
+on the event loop; their password hashing is handed to a bounded process
+pool, which is started here so the first logins don't pay for spawning it.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +18,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+from apps.users.hashing import hashing_pool  # noqa: E402
+
+hashing_pool.start()
@@ -0,0 +1,148 @@
+"""
+In-process request metrics: per-endpoint histograms of wall time, SQL query
+count, SQL time, serializer time and response size.
+
+api.middleware.MetricsMiddleware opens a per-request accumulator in a
+context variable. The query wrapper installed on every database connection
+and TimedSerializerMixin add to it, which works the same whether the view
+runs on the request thread, in a sync_to_async thread or as a coroutine.
+The module lives in core so that domain apps can time their serializers
+without depending on the api app.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    'request_seconds': ('Wall time of the request', LATENCY_BUCKETS),
+    'db_queries': ('SQL queries issued by the request', COUNT_BUCKETS),
+    'db_seconds': ('Time spent executing SQL', LATENCY_BUCKETS),
+    'serializer_seconds': ('Time spent producing serializer data', LATENCY_BUCKETS),
+    'response_bytes': ('Size of the response body', SIZE_BUCKETS),
+}
+
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = self.count
+        return {'count': self.count, 'sum': round(self.sum, 6), 'buckets': buckets}
+
+
+class MetricsRegistry:
+    """Thread-safe store of histograms keyed by (endpoint, metric)"""
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, values):
+        with self._lock:
+            histograms = self._endpoints.get(endpoint)
+            if histograms is None:
+                histograms = self._endpoints[endpoint] = {
+                    name: Histogram(buckets) for name, (_, buckets) in METRICS.items()
+                }
+            for name, value in values.items():
+                if value is not None:
+                    histograms[name].observe(value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                endpoint: {name: histogram.snapshot() for name, histogram in histograms.items()}
+                for endpoint, histograms in sorted(self._endpoints.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
+
+
+def start_request():
+    """Open a per-request accumulator and return the token to close it"""
+    return _request_stats.set({'db_queries': 0, 'db_seconds': 0.0, 'serializer_seconds': 0.0})
+
+
+def finish_request(token):
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    return stats
+
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper that adds SQL time to the current request, if sampled"""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats['db_queries'] += 1
+        stats['db_seconds'] += time.perf_counter() - start
+
+
+def install_query_counter(sender=None, connection=None, **kwargs):
+    """connection_created receiver that adds count_queries to a connection"""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def record_serializer_time(seconds):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats['serializer_seconds'] += seconds
+
+
+class TimedSerializerMixin:
+    """Serializer mixin that reports the time taken to build `.data`"""
+    @property
+    def data(self):
+        start = time.perf_counter()
+        data = super().data
+        record_serializer_time(time.perf_counter() - start)
+        return data
+
+
+def render_prometheus(snapshot, prefix='ems'):
+    """Render a registry snapshot in the Prometheus text exposition format"""
+    lines = []
+    for name, (help_text, _) in METRICS.items():
+        metric = f'{prefix}_{name}'
+        lines.append(f'# HELP {metric} {help_text}')
+        lines.append(f'# TYPE {metric} histogram')
+        for endpoint, histograms in snapshot.items():
+            histogram = histograms[name]
+            label = endpoint.replace('\\', '\\\\').replace('"', '\\"')
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{metric}_bucket{{endpoint="{label}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{endpoint="{label}"}} {histogram["sum"]}')
+            lines.append(f'{metric}_count{{endpoint="{label}"}} {histogram["count"]}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that keeps the process-wide login throttle and write-behind
+    buffers from carrying state from one test to the next: the throttle's
+    cache stores nothing, and last_login and token rows are written
+    immediately. Tests of those features turn them back on with
+    override_settings. The shared cache tier is kept in memory.
+    """
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_settings = override_settings(
+            CACHES={
+                **settings.CACHES,
+                # Per process, so tests never read or clear the file cache of a running server
+                'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared'},
+                'login-throttle': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+            },
+            LOGIN_THROTTLE_CACHE='login-throttle',
+            LAST_LOGIN_FLUSH_INTERVAL=0,
+            TOKEN_STORE_FLUSH_INTERVAL=0,
+        )
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -38,6 +38,9 @@ CORS_ALLOWED_ORIGINS = [
 # Allow credentials in CORS requests
 CORS_ALLOW_CREDENTIALS = True
 
+# Let browsers cache preflight responses, which CorsMiddleware answers before any other middleware
+CORS_PREFLIGHT_MAX_AGE = int(os.environ.get('CORS_PREFLIGHT_MAX_AGE', 86400))
+
 AUTH_USER_MODEL = 'users.User'
 
 INSTALLED_APPS = [
@@ -58,15 +61,28 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.PathDispatchMiddleware',
 ]
 
+# Middleware run by PathDispatchMiddleware for the longest matching path prefix.
+# The API authenticates with JWTs only, so it skips sessions, CSRF and messages.
+PATH_MIDDLEWARE = {
+    '/api/': [],
+    '/': [
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ],
+}
+
+# The admin's session, auth and messages middleware live in PATH_MIDDLEWARE['/']
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -90,12 +106,87 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgresql selects PostgreSQL (requires psycopg[pool]); anything
+# else falls back to the local SQLite database.
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'ems'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DB_POOL', 'True').lower() == 'true':
+        # psycopg's connection pool; connections go back to the pool at the
+        # end of each request, so Django's persistent connections stay off.
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+    else:
+        DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                # WAL lets readers run alongside a writer; writers wait up to
+                # `timeout` seconds for the lock instead of failing with
+                # "database is locked", and IMMEDIATE transactions take the
+                # write lock up front so that wait actually applies.
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+                'timeout': int(os.environ.get('DB_BUSY_TIMEOUT', 20)),
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
     }
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# 'default' is a two-tier cache (see api.cache): a bounded in-process LRU in
+# front of the 'shared' cache. CACHE_BACKEND picks the shared tier: file
+# (shared by the processes of one host, the default), db (run
+# `manage.py createcachetable`), redis (requires redis-py; CACHE_LOCATION is
+# the redis:// URL) or locmem, which is per process and so only suits a
+# single-process server: other processes would not see invalidations.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+SHARED_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'shared'),
+    'file': ('api.cache.FileCache', os.path.join(BASE_DIR, '.cache')),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'cache_table'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://localhost:6379/1'),
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'api.cache.TwoTierCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'MAX_ENTRIES': int(os.environ.get('CACHE_LOCAL_MAX_ENTRIES', 1000)),
+            'LOCAL_TIMEOUT': int(os.environ.get('CACHE_LOCAL_TIMEOUT', 5)),
+            'LOCK_TIMEOUT': int(os.environ.get('CACHE_LOCK_TIMEOUT', 10)),
+        },
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', SHARED_CACHE_BACKENDS[CACHE_BACKEND][1]),
+    },
 }
+if CACHE_BACKEND != 'redis':
+    # Redis evicts by its own maxmemory policy and rejects this option
+    CACHES['shared']['OPTIONS'] = {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000))}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -115,6 +206,35 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing cost profiles (see apps.users.hashers)
+# The selected profile's hasher is used for new hashes; the others stay
+# available so existing hashes still verify and get upgraded on login.
+# The argon2 profile requires the optional argon2-cffi package.
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': {
+        'hasher': 'apps.users.hashers.TunablePBKDF2PasswordHasher',
+        'params': {'iterations': 1_000_000},
+    },
+    'argon2': {
+        'hasher': 'apps.users.hashers.TunableArgon2PasswordHasher',
+        'params': {'time_cost': 2, 'memory_cost': 102400, 'parallelism': 8},
+    },
+    'scrypt': {
+        'hasher': 'apps.users.hashers.TunableScryptPasswordHasher',
+        'params': {'work_factor': 2 ** 14, 'block_size': 8, 'parallelism': 1},
+    },
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE', 'pbkdf2')
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]['hasher']] + [
+    profile['hasher']
+    for name, profile in PASSWORD_HASHER_PROFILES.items()
+    if name != PASSWORD_HASHER_PROFILE
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -137,11 +257,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed JSON when it is installed, stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Reverse proxies in front of the app; X-Forwarded-For is ignored unless this is set
+    'NUM_PROXIES': int(os.environ['NUM_PROXIES']) if os.environ.get('NUM_PROXIES') else None,
 }
 
 # Simple JWT Settings
@@ -150,14 +282,68 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),      
     'ROTATE_REFRESH_TOKENS': True,                    
     'BLACKLIST_AFTER_ROTATION': True,                 
-    'UPDATE_LAST_LOGIN': True,                        
+    # last_login is written behind by apps.users.last_login instead
+    'UPDATE_LAST_LOGIN': False,
     'ALGORITHM': 'HS256',                             
     'SIGNING_KEY': SECRET_KEY,                        
     'AUTH_HEADER_TYPES': ('Bearer',),                 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'apps.users.serializers.token_serializer.TrackedTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.users.serializers.token_serializer.BloomTokenRefreshSerializer',
+    'TOKEN_BLACKLIST_SERIALIZER': 'apps.users.serializers.token_serializer.BloomTokenBlacklistSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'apps.users.serializers.token_serializer.BloomTokenVerifySerializer',
 }
 
+# Bloom filter in front of the token blacklist (see apps.users.tokens)
+TOKEN_BLACKLIST_BLOOM_CAPACITY = int(os.environ.get('TOKEN_BLACKLIST_BLOOM_CAPACITY', 100000))
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = float(os.environ.get('TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001))
+TOKEN_BLACKLIST_BLOOM_SYNC_INTERVAL = int(os.environ.get('TOKEN_BLACKLIST_BLOOM_SYNC_INTERVAL', 5))
+TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL = int(os.environ.get('TOKEN_BLACKLIST_BLOOM_REBUILD_INTERVAL', 3600))
+TOKEN_BLACKLIST_BLOOM_SYNC_OVERLAP = int(os.environ.get('TOKEN_BLACKLIST_BLOOM_SYNC_OVERLAP', 60))
+
+# Write-behind last_login updates for every login path (see apps.users.last_login)
+LAST_LOGIN_RESOLUTION = int(os.environ.get('LAST_LOGIN_RESOLUTION', 60))
+LAST_LOGIN_FLUSH_INTERVAL = float(os.environ.get('LAST_LOGIN_FLUSH_INTERVAL', 5))
+LAST_LOGIN_BATCH_SIZE = int(os.environ.get('LAST_LOGIN_BATCH_SIZE', 500))
+
+# Buffered OutstandingToken/BlacklistedToken inserts (see apps.users.tokens.TokenStore)
+TOKEN_STORE_FLUSH_INTERVAL = float(os.environ.get('TOKEN_STORE_FLUSH_INTERVAL', 1))
+TOKEN_STORE_BATCH_SIZE = int(os.environ.get('TOKEN_STORE_BATCH_SIZE', 500))
+TOKEN_STORE_MAX_PENDING = int(os.environ.get('TOKEN_STORE_MAX_PENDING', 5000))
+# Cache alias of the revocation markers every process checks; share it between workers.
+# Markers must outlast TOKEN_STORE_FLUSH_INTERVAL + TOKEN_BLACKLIST_BLOOM_SYNC_INTERVAL.
+TOKEN_STORE_CACHE = os.environ.get('TOKEN_STORE_CACHE', 'shared')
+TOKEN_STORE_MARKER_TIMEOUT = int(os.environ.get('TOKEN_STORE_MARKER_TIMEOUT', 300))
+
+# Authenticated user snapshot cache (see apps.users.authentication)
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', 60))
+AUTH_USER_CACHE_MAX_SIZE = int(os.environ.get('AUTH_USER_CACHE_MAX_SIZE', 10000))
+
+# Per-user employer response cache timeout in seconds (see apps.users.cache)
+EMPLOYER_CACHE_TIMEOUT = int(os.environ.get('EMPLOYER_CACHE_TIMEOUT', 300))
+
+# Process pool used by the async signup/login views (see apps.users.hashing)
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get('PASSWORD_HASHING_MAX_PENDING', 64))
+
+# Login throttling and lockout, checked before password hashing (see apps.users.throttling)
+LOGIN_THROTTLE_CACHE = os.environ.get('LOGIN_THROTTLE_CACHE', 'shared')
+LOGIN_THROTTLE_IP_RATE = os.environ.get('LOGIN_THROTTLE_IP_RATE', '20/min')
+LOGIN_THROTTLE_EMAIL_RATE = os.environ.get('LOGIN_THROTTLE_EMAIL_RATE', '5/min')
+LOGIN_LOCKOUT_THRESHOLD = int(os.environ.get('LOGIN_LOCKOUT_THRESHOLD', 5))
+LOGIN_LOCKOUT_BASE = int(os.environ.get('LOGIN_LOCKOUT_BASE', 1))
+LOGIN_LOCKOUT_MAX = int(os.environ.get('LOGIN_LOCKOUT_MAX', 900))
+
+# Fraction of requests measured by api.middleware.MetricsMiddleware (0 disables)
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', 0.1))
+
+# Where `manage.py generate_openapi` writes the OpenAPI document (see api.schema)
+OPENAPI_SCHEMA_DIR = os.environ.get('OPENAPI_SCHEMA_DIR', os.path.join(BASE_DIR, 'openapi'))
+
+# Keeps process-wide throttle and buffer state out of tests (see core.runner)
+TEST_RUNNER = 'core.runner.TestRunner'
+
 # Swagger settings for JWT authentication
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {